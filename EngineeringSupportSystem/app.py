@@ -2,6 +2,7 @@
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
+from ui.async_store import flush_stores
 from ui.login_window import LoginWindow
 from ui.theme import APP_QSS, ASSETS
 
@@ -11,7 +12,9 @@ def main():
     app.setStyleSheet(APP_QSS)
     win = LoginWindow()
     win.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    flush_stores()  # queued saves and write-behind changes
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,24 @@
 # auth.py
 from typing import Optional, Dict, Any
-from data_store import load_users
+from data_store import get_user, set_password
+from passwords import hash_password, needs_rehash, verify_password
+
+_dummy_hash = None
+
+def _unknown_user_check(password: str):
+    # same work as for a real account, so response time does not reveal valid usernames
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("")
+    verify_password(_dummy_hash, password)
 
 def authenticate(username: str, password: str) -> Optional[Dict[str, Any]]:
-    users = load_users()
-    for u in users:
-        if u.get("username") == username and u.get("password") == password:
-            return u
-    return None
+    u = get_user(username)
+    if u is None:
+        _unknown_user_check(password)
+        return None
+    if not verify_password(u.get("password"), password):
+        return None
+    if needs_rehash(u.get("password")):
+        set_password(username, password)  # plaintext / old cost -> current hash
+    return {k: v for k, v in u.items() if k != "password"}
@@ -1,42 +1,64 @@
 # base_store.py
-import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+import config
+from json_collection import JsonCollection
 
 DATA_DIR = Path(__file__).parent / "data"
 BASES_FILE = DATA_DIR / "airbases.json"
 AIRCRAFT_FILE = DATA_DIR / "aircraft.json"
 
-def _load(path, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return default
+_bases = JsonCollection(BASES_FILE, key="id")
+_aircraft = JsonCollection(AIRCRAFT_FILE, key="tail")
+
+class _FleetIndex:
+    """
+    base -> aircraft index on top of the two fleet collections (which index
+    by base id and by tail). Rebuilt when either file changes on disk.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gen = None
+        self.by_base: Dict[str, List[Dict[str, Any]]] = {}
+
+    def fresh(self) -> "_FleetIndex":
+        gen = (_bases.refresh(), _aircraft.refresh())
+        with self._lock:
+            if gen != self._gen:
+                self.by_base = {}
+                for a in _aircraft.all():
+                    self.by_base.setdefault(a.get("base_id"), []).append(a)
+                self._gen = gen
+        return self
+
+_fleet = _FleetIndex()
 
 def load_bases() -> List[Dict[str, Any]]:
-    return _load(BASES_FILE, [])
+    return list(_bases.all())
 
 def load_aircraft() -> List[Dict[str, Any]]:
-    return _load(AIRCRAFT_FILE, [])
+    return list(_aircraft.all())
 
 def list_base_ids() -> List[str]:
-    return [b["id"] for b in load_bases()]
+    return [b["id"] for b in _bases.all()]
 
 def base_name(base_id: str) -> str:
-    for b in load_bases():
-        if b["id"] == base_id:
-            return b.get("name", base_id)
-    return base_id
+    b = _bases.get(base_id)
+    return b.get("name", base_id) if b else base_id
 
 def aircraft_by_base(base_id: str) -> List[Dict[str, Any]]:
-    return [a for a in load_aircraft() if a.get("base_id") == base_id]
+    return list(_fleet.fresh().by_base.get(base_id, []))
 
 def tails_by_base(base_id: str) -> List[str]:
-    return [a["tail"] for a in aircraft_by_base(base_id)]
+    return [a["tail"] for a in _fleet.fresh().by_base.get(base_id, [])]
 
 def find_aircraft(tail: str) -> Optional[Dict[str, Any]]:
-    for a in load_aircraft():
-        if a.get("tail") == tail:
-            return a
-    return None
+    return _aircraft.get(tail)
+
+# ---- SQLite backend (ESS_STORAGE_BACKEND=sqlite) ----
+if config.STORAGE_BACKEND == "sqlite":
+    from sqlite_store import (  # noqa: F811
+        load_bases, load_aircraft, list_base_ids, base_name,
+        aircraft_by_base, tails_by_base, find_aircraft,
+    )
@@ -0,0 +1,59 @@
+# benchmarks/bench_formats.py
+# Load/save time and file size of each storage format for synthetic task lists.
+#
+#   python benchmarks/bench_formats.py                  # 10k, 100k and 1M tasks
+#   python benchmarks/bench_formats.py --sizes 10000
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from storage_formats import FORMATS, iter_records, load_file, save_file  # noqa: E402
+
+STATUSES = ["pending", "in_progress", "completed", "in_review", "approved", "rejected"]
+
+def make_tasks(n: int):
+    rnd = random.Random(n)
+    return [{
+        "id": i,
+        "title": f"Inspect panel {rnd.randint(1, 400)} ({rnd.choice(['hydraulic', 'fuel', 'avionics', 'repair'])})",
+        "details": "Check torque, seals and annotations per AMM task card " + str(rnd.randint(10000, 99999)),
+        "assigned_to": rnd.choice([None, "engineer1", "technician1", "qc1"]),
+        "status": rnd.choice(STATUSES),
+        "base_id": rnd.choice(["OOMS", "OOBR", "OERK"]),
+        "aircraft_tail": rnd.choice(["A6-ABC", "A6-DEF", "HZ-GHI", "A4O-XY"]),
+        "created_at": "2025-09-01T08:00:00+00:00",
+        "updated_at": "2025-09-02T10:30:00+00:00",
+    } for i in range(1, n + 1)]
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare load/save time and file size of the storage formats.")
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    args = ap.parse_args(argv)
+
+    print(f"{'tasks':>9} {'format':<8} {'size MB':>9} {'save s':>8} {'load s':>8} {'stream s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(s) for s in args.sizes.split(",")):
+            tasks = make_tasks(n)
+            for fmt in FORMATS:
+                path = Path(tmp) / f"tasks-{fmt}.dat"
+                save_s = _timed(lambda: save_file(path, tasks, fmt))
+                load_s = _timed(lambda: load_file(path, []))
+                stream_s = _timed(lambda: sum(1 for _ in iter_records(path)))
+                size_mb = path.stat().st_size / 1e6
+                print(f"{n:>9,} {fmt:<8} {size_mb:>9.2f} {save_s:>8.3f} {load_s:>8.3f} {stream_s:>9.3f}")
+                path.unlink()
+            del tasks
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# benchmarks/bench_login.py
+# Sign-in latency (user lookup + password check) per PBKDF2 cost, to pick
+# ESS_PASSWORD_ITERATIONS against a target sign-in time.
+#
+#   python benchmarks/bench_login.py                          # 5000 users, default costs
+#   python benchmarks/bench_login.py --users 20000 --iterations 100000,600000 --target-ms 300
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from json_collection import JsonCollection  # noqa: E402
+from passwords import hash_password, verify_password  # noqa: E402
+
+def _login(users: JsonCollection, username: str, password: str) -> bool:
+    u = users.get(username)
+    return u is not None and verify_password(u["password"], password)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure sign-in latency per password hash cost.")
+    ap.add_argument("--users", type=int, default=5000)
+    ap.add_argument("--iterations", default="100000,200000,400000,600000,1000000")
+    ap.add_argument("--rounds", type=int, default=5, help="logins timed per cost")
+    ap.add_argument("--target-ms", type=float, default=250.0)
+    args = ap.parse_args(argv)
+
+    costs = [int(x) for x in args.iterations.split(",")]
+    best = None
+    print(f"{args.users} users, {args.rounds} logins per cost, target {args.target_ms:.0f} ms")
+    print(f"{'iterations':>10} {'hash ms':>9} {'login ms':>9} {'lookup us':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cost in costs:
+            # one real hash reused for every account: only the lookup depends on the directory size
+            stored = hash_password("secret", cost)
+            path = Path(tmp) / f"users-{cost}.json"
+            users = JsonCollection(path, key="username")
+            users.replace_all([{"username": f"user{i}", "password": stored, "role": "technician"}
+                               for i in range(args.users)])
+            users.invalidate()
+            users.get("user0")  # first read parses the file; logins after that hit the cache
+
+            t0 = time.perf_counter()
+            hash_password("secret", cost)
+            hash_ms = (time.perf_counter() - t0) * 1000
+
+            logins, lookups = [], []
+            for r in range(args.rounds):
+                name = f"user{(r * 7919) % args.users}"
+                t0 = time.perf_counter()
+                users.get(name)
+                lookups.append((time.perf_counter() - t0) * 1e6)
+                t0 = time.perf_counter()
+                assert _login(users, name, "secret")
+                logins.append((time.perf_counter() - t0) * 1000)
+            login_ms = statistics.median(logins)
+            print(f"{cost:>10} {hash_ms:>9.1f} {login_ms:>9.1f} {statistics.median(lookups):>10.1f}")
+            if login_ms <= args.target_ms:
+                best = cost
+    if best:
+        print(f"Highest cost within target: ESS_PASSWORD_ITERATIONS={best}")
+    else:
+        print("No tested cost meets the target; try lower --iterations values.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# benchmarks/bench_panels.py
+# Memory held by each kept dashboard panel, and switching cost between the
+# approval / inventory / training panels: building a new panel on every
+# switch (the old _swap_body) vs. the PanelPool. Reads the stores under data/.
+#
+#   python benchmarks/bench_panels.py                       # 300 switches, offscreen
+#   python benchmarks/bench_panels.py --switches 1000 --keep 1 --samples 50
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QThreadPool  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget  # noqa: E402
+
+def rss_kb() -> int:
+    """Current resident set size; peak RSS where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def settle(app: QApplication):
+    """Let the panels' store loads finish and their results arrive; run pending deleteLater()s."""
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    app.processEvents()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure dashboard panel memory and switching cost.")
+    ap.add_argument("--switches", type=int, default=300)
+    ap.add_argument("--keep", type=int, default=2, help="PanelPool idle panels kept")
+    ap.add_argument("--samples", type=int, default=20, help="panels built per type for the memory figure")
+    args = ap.parse_args(argv)
+
+    app = QApplication(sys.argv)
+    from ui.approval_panel import ApprovalPanel
+    from ui.inventory_panel import InventoryPanel
+    from ui.training_panel import TrainingPanel
+    from ui.widgets.panel_pool import PanelPool
+
+    factories = [
+        (ApprovalPanel, lambda: ApprovalPanel()),
+        (InventoryPanel, lambda: InventoryPanel(current_user="bench")),
+        (TrainingPanel, lambda: TrainingPanel(current_user="bench", role="admin")),
+    ]
+
+    def host():
+        w = QWidget()
+        w.resize(1000, 700)
+        w.show()
+        return w, QVBoxLayout(w)
+
+    # warm up imports, stores and Qt styles so they are not charged to the first panel
+    w, layout = host()
+    for _, make in factories:
+        p = make()
+        layout.addWidget(p)
+        settle(app)
+        p.setParent(None)
+    del p
+    w.close()
+    gc.collect()
+    settle(app)
+
+    # RSS moves in pages and allocator arenas: average over several live panels
+    print(f"memory per kept panel (average of {args.samples})")
+    w, layout = host()
+    for cls, make in factories:
+        gc.collect()
+        before, kept = rss_kb(), []
+        for _ in range(args.samples):
+            kept.append(make())
+            layout.addWidget(kept[-1])
+            settle(app)
+        print(f"  {cls.__name__:<16} {(rss_kb() - before) / args.samples:>8.0f} KB")
+        for p in kept:
+            p.setParent(None)
+        del kept
+    w.close()
+
+    results = {}
+    for mode in ("rebuild", "pool"):
+        w, layout = host()
+        pool = PanelPool(keep=args.keep)
+        layout.addWidget(pool)
+        current = None
+        gc.collect()
+        before, times = rss_kb(), []
+        for i in range(args.switches):
+            cls, make = factories[i % len(factories)]
+            t0 = time.perf_counter()
+            if mode == "pool":
+                pool.show_panel(cls, make)
+            else:
+                new = make()
+                if current is not None:
+                    current.setParent(None)
+                layout.addWidget(new)
+                current = new
+            settle(app)
+            times.append((time.perf_counter() - t0) * 1000)
+        gc.collect()
+        settle(app)
+        results[mode] = (statistics.median(times), max(times), rss_kb() - before, pool.stats())
+        w.close()
+
+    print(f"\n{args.switches} switches   {'median ms':>10} {'max ms':>8} {'RSS growth KB':>14}")
+    for mode, (median, worst, growth, stats) in results.items():
+        print(f"  {mode:<10} {median:>10.2f} {worst:>8.2f} {growth:>14}")
+    print("pool:", ", ".join(f"{k}={v}" for k, v in results["pool"][3].items()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# benchmarks/bench_startup.py
+# Cold-start time to a visible login window, with a per-module import
+# breakdown from `python -X importtime`. Each run is a fresh interpreter.
+#
+#   python benchmarks/bench_startup.py                 # 5 runs, offscreen
+#   python benchmarks/bench_startup.py --runs 10 --top 25 --max-ms 800
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+# what app.main() does up to the first event loop turn
+STARTUP = """
+import time
+t0 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from ui.theme import APP_QSS
+app = QApplication([])
+app.setStyleSheet(APP_QSS)
+from ui.login_window import LoginWindow
+win = LoginWindow()
+win.show()
+app.processEvents()
+print("STARTUP_MS", (time.perf_counter() - t0) * 1000)
+"""
+
+# never wanted before sign-in; reported if startup pulls them in
+LATE_MODULES = ("ui.dashboards", "ui.task_editor", "ui.manage_users", "ui.approval_panel",
+                "ui.inventory_panel", "ui.training_panel", "ui.assign_task")
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def run_once(platform: str):
+    """(startup ms, {module: cumulative import us}) for one cold start."""
+    env = dict(os.environ, QT_QPA_PLATFORM=platform, PYTHONPATH=str(APP_DIR))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP], cwd=APP_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+    startup_ms = next(float(line.split()[1]) for line in proc.stdout.splitlines() if line.startswith("STARTUP_MS"))
+    imports = {}
+    for line in proc.stderr.splitlines():
+        m = _IMPORT_LINE.match(line)
+        if m:
+            imports[m.group(4)] = int(m.group(2))
+    return startup_ms, imports
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure cold-start time to the login window.")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15, help="slowest application modules to list")
+    ap.add_argument("--platform", default="offscreen", help="QT_QPA_PLATFORM for the runs")
+    ap.add_argument("--max-ms", type=float, default=None, help="exit 1 if the median startup is slower")
+    args = ap.parse_args(argv)
+
+    runs = [run_once(args.platform) for _ in range(args.runs)]
+    times = [ms for ms, _ in runs]
+    median = statistics.median(times)
+    print(f"startup to login window: median {median:.0f} ms, min {min(times):.0f} ms over {args.runs} runs")
+
+    imports = runs[-1][1]
+    own = {name: us for name, us in imports.items()
+           if (APP_DIR / (name.replace(".", "/") + ".py")).exists()}
+    print(f"{len(imports)} modules imported, {len(own)} of them from the application")
+    print(f"{'cumulative ms':>14}  module")
+    for name, us in sorted(own.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{us / 1000:>14.1f}  {name}")
+
+    late = [name for name in LATE_MODULES if name in imports]
+    if late:
+        print("imported before sign-in:", ", ".join(late))
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median {median:.0f} ms is over --max-ms {args.max_ms:.0f}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
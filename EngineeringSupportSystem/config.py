@@ -0,0 +1,49 @@
+# config.py
+# Runtime settings. Each one can be overridden with an ESS_* environment variable.
+import os
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+def _env(name: str, default: str) -> str:
+    return os.environ.get(f"ESS_{name}", default).strip()
+
+# "json"   - the JSON files under data/ (default)
+# "sqlite" - one SQLite database for all stores, filled from the JSON files on first use
+STORAGE_BACKEND = _env("STORAGE_BACKEND", "json").lower()
+# how the JSON backend writes files: pretty | compact | jsonl | binary
+# (reading auto-detects, see storage_formats.py)
+STORAGE_FORMAT = _env("STORAGE_FORMAT", "pretty").lower()
+SQLITE_PATH = Path(_env("SQLITE_PATH", str(DATA_DIR / "ess.sqlite3")))
+
+# "json"    - every task change rewrites tasks.json
+# "journal" - task changes are appended to tasks.journal and folded into
+#             tasks.json in the background once the journal grows too big
+TASK_STORAGE = _env("TASK_STORAGE", "json").lower()
+JOURNAL_COMPACT_BYTES = int(_env("JOURNAL_COMPACT_BYTES", str(256 * 1024)))
+
+# "single"  - all tasks in data/tasks.json
+# "sharded" - one file per airbase under data/tasks/ (see shard_tasks.py)
+TASK_LAYOUT = _env("TASK_LAYOUT", "single").lower()
+
+# Approved/rejected tasks unchanged for this many days can be moved to
+# data/archive/ by task_archive.py; segments are compressed with gzip or lzma
+ARCHIVE_MIN_AGE_DAYS = int(_env("ARCHIVE_MIN_AGE_DAYS", "90"))
+ARCHIVE_COMPRESSION = _env("ARCHIVE_COMPRESSION", "gzip").lower()
+
+# Delay writes of the JSON stores until no change has happened for this many
+# milliseconds, so bursts of edits cost one write (0 = write immediately)
+WRITE_DEBOUNCE_MS = int(_env("WRITE_DEBOUNCE_MS", "0"))
+# ...but never hold a change back longer than this (0 = no limit)
+WRITE_MAX_DELAY_MS = int(_env("WRITE_MAX_DELAY_MS", "2000"))
+
+# Stock quantity changes go to data/stock.ledger; stock.json is rewritten as a
+# checkpoint after this many of them
+STOCK_CHECKPOINT_EVERY = int(_env("STOCK_CHECKPOINT_EVERY", "100"))
+
+# Dashboard panels (approvals, inventory, training) are kept when the user
+# switches away; at most this many idle ones, least recently used go first
+PANEL_POOL_SIZE = int(_env("PANEL_POOL_SIZE", "2"))
+
+# PBKDF2-SHA256 iterations for password hashes; tune with benchmarks/bench_login.py
+PASSWORD_ITERATIONS = int(_env("PASSWORD_ITERATIONS", "600000"))
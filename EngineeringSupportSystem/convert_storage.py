@@ -0,0 +1,42 @@
+# convert_storage.py
+# Rewrite data files in another storage format (see storage_formats.py).
+#
+#   python convert_storage.py compact                    # every file under data/
+#   python convert_storage.py jsonl data/tasks.json      # just these files
+#
+# Loaders auto-detect the format, so files can be converted one at a time.
+import argparse
+import sys
+from pathlib import Path
+
+from config import DATA_DIR
+from json_collection import write_atomic
+from storage_formats import FORMATS, load_file, save_file
+
+_MISSING = object()
+
+def data_files():
+    return sorted(DATA_DIR.glob("*.json")) + sorted((DATA_DIR / "tasks").glob("*.json"))
+
+def convert(path: Path, fmt: str) -> tuple:
+    data = load_file(path, _MISSING)
+    if data is _MISSING:
+        raise ValueError(f"{path} could not be read")
+    before = path.stat().st_size
+    # a crash halfway leaves the old file in place, not a truncated one
+    write_atomic(path, data, lambda p, d: save_file(p, d, fmt))
+    return before, path.stat().st_size
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert data files to another storage format.")
+    ap.add_argument("format", choices=FORMATS)
+    ap.add_argument("files", nargs="*", type=Path, help="default: every .json file under data/")
+    args = ap.parse_args(argv)
+
+    for path in args.files or data_files():
+        before, after = convert(path, args.format)
+        print(f"{path.name:<20} {before:>12,} -> {after:>12,} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
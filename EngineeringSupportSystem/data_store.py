@@ -1,84 +1,167 @@
 # data_store.py
-import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import config
+from json_collection import JsonCollection
+from passwords import hash_password
+from task_repository import TaskRepository, TaskTransaction
+from task_archive import next_id_floor
+from task_journal import TaskJournal
+from task_shards import ShardedTaskStore
+from storage_formats import iter_records
 
 DATA_DIR = Path(__file__).parent / "data"
 USERS_FILE = DATA_DIR / "users.json"
 TASKS_FILE = DATA_DIR / "tasks.json"
+TASKS_DIR = DATA_DIR / "tasks"
 
-def load_json(path, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return default
-    except json.JSONDecodeError:
-        return default
-
-def save_json(path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+_debounce = config.WRITE_DEBOUNCE_MS / 1000
+_max_delay = config.WRITE_MAX_DELAY_MS / 1000
+_users = JsonCollection(USERS_FILE, key="username", debounce=_debounce, max_delay=_max_delay, topic="users")
 
 def load_users():
-    return load_json(USERS_FILE, [])
+    return [dict(u) for u in _users]
 
 def save_users(users):
-    save_json(USERS_FILE, users)
+    _users.replace_all(users)
+
+def _journal_for(path):
+    return TaskJournal(path, config.JOURNAL_COMPACT_BYTES) if config.TASK_STORAGE == "journal" else None
+
+def open_task_store():
+    """The JSON task store for the configured layout and storage (journal replayed, shards merged)."""
+    if config.TASK_LAYOUT == "sharded":
+        return ShardedTaskStore(TASKS_DIR, journal_factory=_journal_for, stream=iter_records,
+                                debounce=_debounce, max_delay=_max_delay)
+    return TaskRepository(TASKS_FILE, journal=_journal_for(TASKS_FILE), stream=iter_records,
+                          debounce=_debounce, max_delay=_max_delay)
+
+# Parsed once, re-read only when the task file(s) change on disk
+_tasks = open_task_store()
 
 def load_tasks():
-    return load_json(TASKS_FILE, [])
+    # copies, so callers can edit and hand the list back to save_tasks()
+    return [dict(t) for t in _tasks.all()]
+
+def iter_tasks(predicate: Callable[[Dict[str, Any]], bool] = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream tasks one at a time without loading the whole history (constant
+    memory with the jsonl/binary formats). Stops after `limit` matches.
+    """
+    for t in _tasks.iter(predicate, limit):
+        yield dict(t)
 
 def save_tasks(tasks):
-    save_json(TASKS_FILE, tasks)
+    _tasks.replace_all(tasks)
+
+def task_cache_stats() -> Dict[str, int]:
+    return _tasks.stats()
     
+def get_task(task_id: int) -> Optional[Dict[str, Any]]:
+    t = _tasks.get(task_id)
+    return dict(t) if t is not None else None
+
 def next_task_id() -> int:
-    tasks = load_tasks()
-    return (max((t.get("id", 0) for t in tasks), default=0) + 1)
+    return max(_tasks.next_id(), next_id_floor())
+
+@contextmanager
+def task_transaction():
+    """
+    with task_transaction() as tx:
+        tx.add({...}); tx.update(7, {"status": "approved"})
+    Everything is written at once when the block exits; an exception drops the batch.
+    """
+    # ids start above the archive's highest id, so archived ids are never reused
+    tx = TaskTransaction(_tasks.get, lambda adds, updates: _tasks.apply(adds, updates, id_floor=next_id_floor()))
+    yield tx
+    tx.commit()
 
 def add_task(task: Dict[str, Any]) -> Dict[str, Any]:
-    tasks = load_tasks()
-    task["id"] = next_task_id()
-    tasks.append(task)
-    save_tasks(tasks)
+    with task_transaction() as tx:
+        tx.add(task)
     return task
 
 def update_task(task_id: int, updates: Dict[str, Any]) -> bool:
-    tasks = load_tasks()
-    for t in tasks:
-        if t.get("id") == task_id:
-            t.update(updates)
-            save_tasks(tasks)
-            return True
-    return False
+    with task_transaction() as tx:
+        return tx.update(task_id, updates)
+
+def delete_tasks(task_ids) -> int:
+    ids = set(task_ids)
+    tasks = [t for t in _tasks.all() if t.get("id") not in ids]
+    removed = len(_tasks.all()) - len(tasks)
+    if removed:
+        _tasks.replace_all(tasks)
+    return removed
 
 def get_usernames_by_role(role: str) -> List[str]:
-    return [u["username"] for u in load_users() if u.get("role") == role]
+    return [u["username"] for u in _users if u.get("role") == role]
 
 def list_usernames() -> List[str]:
-    return [u["username"] for u in load_users()]
+    return [u["username"] for u in _users]
+
+def get_user(username: str) -> Optional[Dict[str, Any]]:
+    """O(1) lookup in the cached user directory (reloaded when users.json changes)."""
+    u = _users.get(username)
+    return dict(u) if u is not None else None
 
 def add_user(username: str, password: str, role: str) -> bool:
-    users = load_users()
-    if any(u["username"] == username for u in users):
+    if _users.get(username) is not None:
         return False
-    users.append({"username": username, "password": password, "role": role})
-    save_users(users)
+    _users.put({"username": username, "password": hash_password(password), "role": role})
     return True
 
+def set_password(username: str, password: str) -> bool:
+    return _users.update(username, {"password": hash_password(password)})
+
 def delete_user(username: str) -> bool:
-    users = load_users()
-    new_users = [u for u in users if u["username"] != username]
-    if len(new_users) == len(users):
-        return False
-    save_users(new_users)
-    return True
+    return _users.delete(username) is not None
+
+def _criteria(base_id=None, aircraft_tail=None, assigned_to=None, status=None) -> Dict[str, Any]:
+    where = {"base_id": base_id, "aircraft_tail": aircraft_tail, "assigned_to": assigned_to, "status": status}
+    return {k: v for k, v in where.items() if v}
+
+def query_tasks(base_id: str = None, aircraft_tail: str = None,
+                assigned_to: str = None, status=None) -> List[Dict[str, Any]]:
+    """Indexed lookup; `status` may be one status or a collection of them."""
+    return [dict(t) for t in _tasks.query(**_criteria(base_id, aircraft_tail, assigned_to, status))]
+
+def count_tasks(base_id: str = None, aircraft_tail: str = None,
+                assigned_to: str = None, status=None) -> int:
+    return len(_tasks.query(**_criteria(base_id, aircraft_tail, assigned_to, status)))
+
+def page_tasks(base_id: str = None, aircraft_tail: str = None, assigned_to: str = None, status=None,
+               predicate: Callable[[Dict[str, Any]], bool] = None, after: int = None,
+               limit: int = 100, search: str = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    One page of matching tasks in id order: (tasks, cursor). Pass `cursor` back
+    as `after` for the next page; it is None when there are no more.
+    `search` is a word query over title and details, e.g. "pump hyd* OR valve"
+    (see task_search); it is answered from an index, not by scanning.
+    """
+    found, cursor = _tasks.page(_criteria(base_id, aircraft_tail, assigned_to, status), predicate, after, limit,
+                                search)
+    return [dict(t) for t in found], cursor
+
+def get_tasks(ids) -> List[Dict[str, Any]]:
+    """Copies of the tasks with these ids, in the same order; unknown ids are skipped."""
+    return [dict(t) for t in _tasks.get_many(ids)]
+
+def filter_tasks(base_id: str = None, aircraft_tail: str = None, limit: int = None):
+    if limit is None:
+        return query_tasks(base_id=base_id, aircraft_tail=aircraft_tail)
+    # first `limit` matches only: scan lazily instead of building the full list
+    return list(iter_tasks(
+        lambda t: (not base_id or t.get("base_id") == base_id)
+        and (not aircraft_tail or t.get("aircraft_tail") == aircraft_tail),
+        limit,
+    ))
 
-def filter_tasks(base_id: str = None, aircraft_tail: str = None):
-    tasks = load_tasks()
-    if base_id:
-        tasks = [t for t in tasks if t.get("base_id") == base_id]
-    if aircraft_tail:
-        tasks = [t for t in tasks if t.get("aircraft_tail") == aircraft_tail]
-    return tasks
+# ---- SQLite backend (ESS_STORAGE_BACKEND=sqlite) ----
+if config.STORAGE_BACKEND == "sqlite":
+    from sqlite_store import (  # noqa: F811
+        load_users, save_users, get_user, set_password, load_tasks, save_tasks, get_task, next_task_id,
+        task_transaction, add_task, update_task, delete_tasks, get_usernames_by_role, list_usernames,
+        add_user, delete_user, filter_tasks, query_tasks, count_tasks, iter_tasks, get_tasks,
+        page_tasks,
+    )
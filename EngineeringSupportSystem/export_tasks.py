@@ -0,0 +1,45 @@
+# export_tasks.py
+# Export tasks to CSV. Tasks are streamed one at a time (data_store.iter_tasks),
+# so memory use does not grow with the size of the task history.
+#
+#   python export_tasks.py out.csv [--base OOMS] [--status approved] [--limit 500]
+#   python export_tasks.py - --status pending                # write to stdout
+import argparse
+import csv
+import sys
+
+from data_store import iter_tasks
+
+COLUMNS = ["id", "title", "base_id", "aircraft_tail", "assigned_to", "status",
+           "created_at", "updated_at", "details"]
+
+def export(out, base_id: str = None, statuses=None, limit: int = None) -> int:
+    def wanted(t):
+        return (not base_id or t.get("base_id") == base_id) and (not statuses or t.get("status") in statuses)
+    writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for t in iter_tasks(wanted, limit):
+        writer.writerow(t)
+        count += 1
+    return count
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export tasks to CSV.")
+    ap.add_argument("output", help="CSV file to write, or - for stdout")
+    ap.add_argument("--base", help="only tasks of this airbase")
+    ap.add_argument("--status", action="append", help="only tasks with this status (repeatable)")
+    ap.add_argument("--limit", type=int, help="stop after this many tasks")
+    args = ap.parse_args(argv)
+
+    statuses = set(args.status) if args.status else None
+    if args.output == "-":
+        count = export(sys.stdout, args.base, statuses, args.limit)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            count = export(f, args.base, statuses, args.limit)
+    print(f"Exported {count} task(s)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
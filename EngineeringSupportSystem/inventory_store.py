@@ -1,52 +1,66 @@
 # inventory_store.py
-import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import config
+import store_events
+from stock_ledger import StockLedger, StockView
 
 DATA_DIR = Path(__file__).parent / "data"
 STOCK_FILE = DATA_DIR / "stock.json"
+STOCK_LEDGER_FILE = DATA_DIR / "stock.ledger"
 
-def _load_json(path, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return default
+def _publish_low(part_no: str, below: bool, item):
+    store_events.publish("low_stock", part_no, below, item)
 
-def _save_json(path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+_stock = StockView(STOCK_FILE, StockLedger(STOCK_LEDGER_FILE), config.STOCK_CHECKPOINT_EVERY,
+                   debounce=config.WRITE_DEBOUNCE_MS / 1000, max_delay=config.WRITE_MAX_DELAY_MS / 1000,
+                   on_low=_publish_low, topic="stock")
 
 def load_stock() -> List[Dict[str, Any]]:
-    return _load_json(STOCK_FILE, [])
+    return [dict(it) for it in _stock]
+
+def get_item(part_no: str) -> Optional[Dict[str, Any]]:
+    it = _stock.get(part_no)
+    return dict(it) if it is not None else None
+
+def get_items(part_nos) -> List[Dict[str, Any]]:
+    """Copies of the items with these part numbers, in the same order; unknown ones are skipped."""
+    return [dict(it) for it in _stock.get_many(part_nos)]
 
 def save_stock(items: List[Dict[str, Any]]):
-    _save_json(STOCK_FILE, items)
-
-def upsert_item(part_no: str, name: str, qty: int, min_qty: int) -> None:
-    items = load_stock()
-    for it in items:
-        if it["part_no"] == part_no:
-            it.update({"name": name, "qty": qty, "min_qty": min_qty})
-            save_stock(items); return
-    items.append({"part_no": part_no, "name": name, "qty": qty, "min_qty": min_qty})
-    save_stock(items)
-
-def adjust_qty(part_no: str, delta: int) -> bool:
-    items = load_stock()
-    for it in items:
-        if it["part_no"] == part_no:
-            it["qty"] = max(0, int(it.get("qty", 0)) + int(delta))
-            save_stock(items); return True
-    return False
+    _stock.replace_all(items)
+
+def upsert_item(part_no: str, name: str, qty: int, min_qty: int, user: str = None) -> None:
+    _stock.upsert(part_no, {"name": name, "qty": qty, "min_qty": min_qty}, "count", user)
+
+def adjust_qty(part_no: str, delta: int, reason: str = "adjust", user: str = None, task_id: int = None) -> bool:
+    return _stock.move(part_no, delta, reason, user, task_id) is not None
 
 def delete_item(part_no: str) -> bool:
-    items = load_stock()
-    new_items = [x for x in items if x["part_no"] != part_no]
-    if len(new_items) == len(items):
-        return False
-    save_stock(new_items); return True
+    return _stock.delete(part_no) is not None
 
 def low_stock() -> List[Dict[str, Any]]:
-    return [x for x in load_stock() if x.get("qty", 0) < x.get("min_qty", 0)]
+    """Parts below min_qty. The set is maintained on every change, not scanned for."""
+    return [dict(x) for x in _stock.low_items()]
+
+def low_stock_count() -> int:
+    return _stock.low_count()
+
+def stock_history(part_no: str = None, since: str = None) -> List[Dict[str, Any]]:
+    """Ledger records, oldest first; `since` is an ISO date/timestamp."""
+    return _stock.history(part_no, since)
+
+def consumption(since: str = None) -> Dict[str, int]:
+    """Units taken out of stock per part_no since `since` - input for reorder planning."""
+    used: Dict[str, int] = {}
+    for rec in stock_history(since=since):
+        if rec.get("delta", 0) < 0:
+            used[rec["part_no"]] = used.get(rec["part_no"], 0) - rec["delta"]
+    return used
+
+# ---- SQLite backend (ESS_STORAGE_BACKEND=sqlite) ----
+if config.STORAGE_BACKEND == "sqlite":
+    from sqlite_store import (  # noqa: F811
+        load_stock, get_item, get_items, save_stock, upsert_item, adjust_qty, delete_item, low_stock, low_stock_count,
+        stock_history, consumption,
+    )
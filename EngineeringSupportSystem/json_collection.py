@@ -0,0 +1,336 @@
+# json_collection.py
+# The storage engine under every JSON-backed store (tasks, users, stock,
+# training, fleet data).
+#
+# A JsonCollection owns one data file and keeps its parsed content in memory:
+#   - the file is re-read only when its mtime/size/inode changes
+#   - list files are indexed by primary key (`key`, e.g. "id" or "part_no");
+#     with key=None the file is one document (e.g. training.json)
+#   - changes mark the collection dirty and are written with temp file +
+#     fsync + rename, so readers never see a half-written file
+#   - with `debounce` > 0 writes are delayed until no change has happened for
+#     that many seconds, but no longer than `max_delay` after the first
+#     unwritten change; pending writes are flushed at interpreter exit.
+#     stats()["coalesced"] counts the changes that did not need a write of their own
+#   - `load` / `save` are the serializer (storage_formats by default)
+#   - with a `topic`, every change (including reloads caused by another
+#     process) is published as a store_events.Change of primary keys
+import atexit
+import copy
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import store_events
+from storage_formats import load_file, save_file
+
+_open_collections = weakref.WeakSet()
+
+def file_signature(path) -> Optional[tuple]:
+    """(mtime_ns, size, inode) of a file, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def write_atomic(path, data: Any, save: Callable = save_file):
+    """save(tmp, data), fsync, then rename over `path`."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    save(tmp, data)
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class JsonCollection:
+    """
+    Cached, primary-key indexed view of one data file. all() / get() return
+    the cached objects themselves - callers must copy before mutating and go
+    through put() / update() / delete() / replace_all() / edit() to change them.
+    """
+    def __init__(self, path, key: Optional[str] = "id", default: Callable[[], Any] = list,
+                 load: Callable = load_file, save: Callable = save_file, debounce: float = 0.0,
+                 max_delay: float = 0.0, topic: str = None):
+        self.path = Path(path)
+        self.key = key
+        self.topic = topic
+        self._default = default
+        self._load = load
+        self._save = save
+        self.debounce = debounce
+        self.max_delay = max_delay  # 0 = a steady stream of edits may postpone the write indefinitely
+        self._lock = threading.RLock()
+        self._docs: Any = default()
+        self._by_key: Dict[Any, Dict[str, Any]] = {}
+        self._sig = False  # never equal to a real signature, so the first read loads
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._pending = 0         # changes made since the last write
+        self._first_pending = None  # time.monotonic() of the oldest of them
+        self.generation = 0  # bumped whenever the content changes (reload or write)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.coalesced = 0
+        _open_collections.add(self)
+
+    # ---- cache bookkeeping
+    def _signature(self):
+        return file_signature(self.path)
+
+    def _read(self) -> Any:
+        return self._load(self.path, self._default())
+
+    def _current(self) -> bool:
+        """True if memory matches (or is ahead of) the file."""
+        return bool(self._dirty or self._pending) or (self._sig is not False and self._sig == self._signature())
+
+    def _fresh(self):
+        if self._current():
+            self.hits += 1
+            return
+        self.misses += 1
+        sig = self._signature()
+        old, loaded = self._by_key, self.generation > 0
+        self._set(self._read(), sig)
+        if loaded:
+            self._emit_diff(old)
+
+    def _set(self, docs, sig):
+        self._docs = docs
+        self._reindex()
+        self._sig = sig
+        self.generation += 1
+
+    def _reindex(self):
+        if self.key is not None:
+            self._by_key = {d.get(self.key): d for d in self._docs}
+
+    def _emit(self, added=(), updated=(), removed=(), reset: bool = False):
+        if self.topic:
+            store_events.publish_change(self.topic, added, updated, removed, reset)
+
+    def _emit_diff(self, old_by_key: Dict[Any, Dict[str, Any]]):
+        if not self.topic:
+            return
+        if self.key is None:
+            self._emit(reset=True)
+            return
+        change = store_events.diff(old_by_key, self._by_key)
+        if change:
+            store_events.publish(self.topic, change)
+
+    def refresh(self) -> int:
+        """Reload if the file changed; returns the current generation."""
+        with self._lock:
+            self._fresh()
+            return self.generation
+
+    def invalidate(self):
+        with self._lock:
+            if not (self._dirty or self._pending):
+                self._sig = False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = len(self._docs) if isinstance(self._docs, list) else 1
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes,
+                    "coalesced": self.coalesced, "records": size}
+
+    # ---- writing
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def _changed(self):
+        """Record that memory is ahead of disk and write now or after the debounce delay."""
+        self._dirty = True
+        self.generation += 1
+        self._schedule()
+
+    def _schedule(self):
+        """Count one unwritten change and (re)arm the write-behind timer."""
+        self._pending += 1
+        if self.debounce <= 0:
+            self.flush()
+            return
+        now = time.monotonic()
+        if self._first_pending is None:
+            self._first_pending = now
+        delay = self.debounce
+        if self.max_delay > 0:
+            delay = min(delay, self._first_pending + self.max_delay - now)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if delay <= 0:
+            self.flush()
+            return
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write pending changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._first_pending = None
+            if not (self._dirty or self._pending):
+                return
+            self._write_pending()
+            self.writes += 1
+            self.coalesced += max(0, self._pending - 1)
+            self._pending = 0
+
+    def _write_pending(self):
+        if self._dirty:
+            self._write_file()
+            self._dirty = False
+        self._sig = self._signature()
+
+    def _write_file(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, self._docs, self._save)
+
+    # ---- reads
+    def all(self) -> Any:
+        with self._lock:
+            self._fresh()
+            return self._docs
+
+    def copy(self) -> Any:
+        """Deep copy of the content, safe for the caller to edit."""
+        with self._lock:
+            self._fresh()
+            return copy.deepcopy(self._docs)
+
+    def get(self, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._fresh()
+            return self._by_key.get(key)
+
+    def get_many(self, keys) -> List[Dict[str, Any]]:
+        """The documents with these keys, in the same order; unknown keys are skipped. One freshness check."""
+        with self._lock:
+            self._fresh()
+            found = (self._by_key.get(k) for k in keys)
+            return [d for d in found if d is not None]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:  # snapshot, so writers on other threads cannot disturb the loop
+            return iter(list(self.all()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.all())
+
+    # ---- record changes (key != None)
+    def put(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert `doc`, or replace the record with the same key."""
+        with self._lock:
+            self._fresh()
+            old = self._by_key.get(doc.get(self.key))
+            if old is None:
+                self._docs.append(doc)
+            else:
+                self._docs[self._position(old)] = doc
+            self._by_key[doc.get(self.key)] = doc
+            self._changed()
+            if old is None:
+                self._emit(added=[doc.get(self.key)])
+            else:
+                self._emit(updated=[doc.get(self.key)])
+            return doc
+
+    def update(self, key, fields: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._fresh()
+            doc = self._by_key.get(key)
+            if doc is None:
+                return False
+            doc.update(fields)
+            if self.key in fields and fields[self.key] != key:
+                self._reindex()
+                self._changed()
+                self._emit(added=[fields[self.key]], removed=[key])
+                return True
+            self._changed()
+            self._emit(updated=[key])
+            return True
+
+    def delete(self, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._fresh()
+            doc = self._by_key.pop(key, None)
+            if doc is None:
+                return None
+            del self._docs[self._position(doc)]
+            self._changed()
+            self._emit(removed=[key])
+            return doc
+
+    def _position(self, doc) -> int:
+        for i, d in enumerate(self._docs):
+            if d is doc:
+                return i
+        raise KeyError(doc.get(self.key))
+
+    # ---- whole-content changes
+    def replace_all(self, docs: Any):
+        with self._lock:
+            old = self._by_key
+            self._docs = docs
+            self._reindex()
+            self._changed()
+            self._emit_diff(old)
+
+    @contextmanager
+    def edit(self):
+        """
+        with coll.edit() as data:   # the cached content, mutate in place
+            data["sessions"].append(...)
+        Indexes are rebuilt and the change is written when the block exits;
+        on an exception the content is put back as it was before the block.
+        """
+        with self._lock:
+            self._fresh()
+            # unwritten earlier changes cannot be reloaded from disk: keep a copy to go back to
+            backup = copy.deepcopy(self._docs) if self.dirty or self._pending else None
+            try:
+                yield self._docs
+            except Exception:
+                if backup is None:
+                    self._sig = False  # the file is current: reload it
+                else:
+                    self._docs = backup
+                    self._reindex()
+                raise
+            self._reindex()
+            self._changed()
+            self._emit(reset=True)  # edited in place: nothing to diff against
+
+@atexit.register
+def flush_all():
+    """Write every collection that still has debounced changes pending."""
+    for coll in list(_open_collections):
+        try:
+            coll.flush()
+        except OSError:
+            pass
+
+def write_stats() -> Dict[str, int]:
+    """Writes and coalesced changes summed over every open collection."""
+    out = {"writes": 0, "coalesced": 0, "pending": 0}
+    for coll in list(_open_collections):
+        with coll._lock:
+            out["writes"] += coll.writes
+            out["coalesced"] += coll.coalesced
+            out["pending"] += coll._pending
+    return out
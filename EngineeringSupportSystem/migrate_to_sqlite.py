@@ -0,0 +1,85 @@
+# migrate_to_sqlite.py
+# One-shot import of the JSON data files into the SQLite database.
+#
+#   python migrate_to_sqlite.py [--db data/ess.sqlite3] [--force]
+#
+# sqlite_store runs the same import automatically the first time it creates
+# a database, so switching ESS_STORAGE_BACKEND=sqlite needs no manual step.
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from storage_formats import load_file
+
+DATA_DIR = Path(__file__).parent / "data"
+
+def _read(name, default):
+    return load_file(DATA_DIR / name, default)
+
+def import_json(conn: sqlite3.Connection) -> dict:
+    """
+    Copy users, tasks, stock, training and fleet data into `conn` in one
+    transaction, which also sets the "imported" marker. Returns row counts.
+    """
+    import sqlite_store as db
+    conn.executescript(db.SCHEMA)
+    # through the JSON task store, so uncompacted journal entries and sharded layouts come along
+    from data_store import open_task_store
+    tasks = open_task_store().all()
+    users = _read("users.json", [])
+    from inventory_store import STOCK_FILE, STOCK_LEDGER_FILE
+    from stock_ledger import StockLedger, StockView
+    ledger = StockLedger(STOCK_LEDGER_FILE)
+    stock = StockView(STOCK_FILE, ledger, checkpoint_every=0).all()  # checkpoint + ledger replay
+    training = _read("training.json", {"sessions": [], "assignments": []})
+    bases = _read("airbases.json", [])
+    aircraft = _read("aircraft.json", [])
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tasks (id, base_id, aircraft_tail, assigned_to, status, doc) VALUES (?,?,?,?,?,?)",
+            [db.task_row(t) for t in tasks])
+        conn.executemany("INSERT OR REPLACE INTO users (username, role, doc) VALUES (?,?,?)",
+                         [db.user_row(u) for u in users])
+        conn.executemany("INSERT OR REPLACE INTO stock (part_no, qty, min_qty, doc) VALUES (?,?,?,?)",
+                         [db.stock_row(it) for it in stock])
+        conn.executemany("INSERT OR REPLACE INTO stock_moves (seq, part_no, delta, reason, user, at, task_id) VALUES (?,?,?,?,?,?,?)",
+                         [(r["seq"], r["part_no"], r["delta"], r.get("reason"), r.get("user"), r["at"], r.get("task_id"))
+                          for r, _ in ledger.records()])
+        conn.executemany("INSERT OR REPLACE INTO training_sessions (id, doc) VALUES (?,?)",
+                         [(s["id"], json.dumps(s, ensure_ascii=False)) for s in training.get("sessions", [])])
+        conn.executemany("INSERT OR REPLACE INTO training_assignments (user, session_id, status) VALUES (?,?,?)",
+                         [(a["user"], a["session_id"], a.get("status", "scheduled")) for a in training.get("assignments", [])])
+        conn.executemany("INSERT OR REPLACE INTO bases (id, doc) VALUES (?,?)",
+                         [(b["id"], json.dumps(b, ensure_ascii=False)) for b in bases])
+        conn.executemany("INSERT OR REPLACE INTO aircraft (tail, base_id, doc) VALUES (?,?,?)",
+                         [(a["tail"], a.get("base_id"), json.dumps(a, ensure_ascii=False)) for a in aircraft])
+        conn.execute(f"PRAGMA user_version = {db.IMPORTED}")  # commits with the rows, or not at all
+    return {
+        "tasks": len(tasks), "users": len(users), "stock": len(stock),
+        "sessions": len(training.get("sessions", [])), "assignments": len(training.get("assignments", [])),
+        "bases": len(bases), "aircraft": len(aircraft),
+    }
+
+def main(argv=None):
+    import config
+    ap = argparse.ArgumentParser(description="Import the JSON data files into SQLite.")
+    ap.add_argument("--db", default=str(config.SQLITE_PATH), help="database file (default: %(default)s)")
+    ap.add_argument("--force", action="store_true", help="import even if the database already exists")
+    args = ap.parse_args(argv)
+
+    path = Path(args.db)
+    if path.exists() and not args.force:
+        print(f"{path} already exists; use --force to re-import (existing rows are replaced).")
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    counts = import_json(conn)
+    conn.close()
+    print(f"Imported into {path}: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
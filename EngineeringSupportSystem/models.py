@@ -19,4 +19,6 @@ class Task(TypedDict, total=False):
     assigned_to: Optional[str]
     status: str  # pending|in_progress|completed|approved|rejected|in_review
     base_id: str             # e.g., "OOMS"
-    aircraft_tail: str       # e.g., "A6-ABC"
\ No newline at end of file
+    aircraft_tail: str       # e.g., "A6-ABC"
+    created_at: str          # ISO-8601 UTC, set by add_task
+    updated_at: str          # ISO-8601 UTC, set by add_task / update_task
\ No newline at end of file
@@ -0,0 +1,47 @@
+# passwords.py
+# Salted PBKDF2-SHA256 password hashes, stored as
+#   pbkdf2_sha256$<iterations>$<salt, base64>$<hash, base64>
+# The cost is ESS_PASSWORD_ITERATIONS; benchmarks/bench_login.py shows the
+# sign-in time each setting costs. Hashes made with another cost still
+# verify and are re-hashed at the next successful login.
+import base64
+import hashlib
+import hmac
+import os
+
+import config
+
+SCHEME = "pbkdf2_sha256"
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+def hash_password(password: str, iterations: int = None) -> str:
+    iterations = iterations or config.PASSWORD_ITERATIONS
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{SCHEME}${iterations}${_b64(salt)}${_b64(digest)}"
+
+def is_hashed(stored: str) -> bool:
+    return isinstance(stored, str) and stored.startswith(SCHEME + "$")
+
+def verify_password(stored: str, password: str) -> bool:
+    """Check `password` against a stored hash, or against a legacy plaintext entry."""
+    if not is_hashed(stored):
+        return stored is not None and hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        expected = base64.b64decode(digest)
+        actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), base64.b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+def needs_rehash(stored: str) -> bool:
+    """Plaintext, or hashed with a different cost than the current setting."""
+    if not is_hashed(stored):
+        return True
+    try:
+        return int(stored.split("$")[1]) != config.PASSWORD_ITERATIONS
+    except (IndexError, ValueError):
+        return True
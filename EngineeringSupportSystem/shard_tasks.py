@@ -0,0 +1,44 @@
+# shard_tasks.py
+# Convert between the single-file and the per-airbase task layout.
+#
+#   python shard_tasks.py split    data/tasks.json  ->  data/tasks/<base>.json
+#   python shard_tasks.py merge    data/tasks/*.json  ->  data/tasks.json
+#
+# The source is left in place; set ESS_TASK_LAYOUT=sharded (or back to
+# single) once the conversion has been checked.
+import argparse
+import sys
+
+from data_store import TASKS_FILE, TASKS_DIR, _journal_for
+from task_repository import TaskRepository
+from task_shards import ShardedTaskStore
+
+def _single() -> TaskRepository:
+    return TaskRepository(TASKS_FILE, journal=_journal_for(TASKS_FILE))
+
+def _sharded() -> ShardedTaskStore:
+    return ShardedTaskStore(TASKS_DIR, journal_factory=_journal_for)
+
+def split() -> int:
+    tasks = [dict(t) for t in _single().all()]
+    store = _sharded()
+    store.replace_all(tasks)
+    shards = {t.get("base_id") for t in tasks}
+    print(f"Split {len(tasks)} task(s) from {TASKS_FILE} into {len(shards)} shard(s) under {TASKS_DIR}")
+    return len(tasks)
+
+def merge() -> int:
+    tasks = [dict(t) for t in _sharded().all()]
+    _single().replace_all(tasks)
+    print(f"Merged {len(tasks)} task(s) from {TASKS_DIR} into {TASKS_FILE}")
+    return len(tasks)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Split tasks.json per airbase, or merge the shards back.")
+    ap.add_argument("command", choices=("split", "merge"))
+    args = ap.parse_args(argv)
+    split() if args.command == "split" else merge()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,594 @@
+# sqlite_store.py
+# SQLite implementation of the public data_store / inventory_store /
+# training_store / base_store functions. Selected with ESS_STORAGE_BACKEND=sqlite.
+#
+# Each table keeps the full record as JSON in `doc` plus the columns we
+# filter on, so extra fields survive a round trip unchanged.
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+import store_events
+from task_archive import next_id_floor
+from passwords import hash_password
+from task_repository import TaskTransaction
+from timestamps import now_iso
+from task_search import matcher, parse_query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    base_id TEXT, aircraft_tail TEXT, assigned_to TEXT, status TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_tasks_context  ON tasks(base_id, aircraft_tail);
+CREATE INDEX IF NOT EXISTS ix_tasks_tail     ON tasks(aircraft_tail);
+CREATE INDEX IF NOT EXISTS ix_tasks_assigned ON tasks(assigned_to);
+CREATE INDEX IF NOT EXISTS ix_tasks_status   ON tasks(status);
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY, role TEXT, doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_users_role ON users(role);
+
+CREATE TABLE IF NOT EXISTS stock (
+    part_no TEXT PRIMARY KEY, qty INTEGER NOT NULL DEFAULT 0, min_qty INTEGER NOT NULL DEFAULT 0,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_stock_low ON stock(part_no) WHERE qty < min_qty;
+CREATE TABLE IF NOT EXISTS stock_moves (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT, part_no TEXT NOT NULL, delta INTEGER NOT NULL,
+    reason TEXT, user TEXT, at TEXT NOT NULL, task_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_stock_moves_part ON stock_moves(part_no, at);
+
+CREATE TABLE IF NOT EXISTS training_sessions (
+    id INTEGER PRIMARY KEY, doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS training_assignments (
+    user TEXT NOT NULL, session_id INTEGER NOT NULL, status TEXT NOT NULL,
+    PRIMARY KEY (user, session_id)
+);
+CREATE INDEX IF NOT EXISTS ix_assignments_session ON training_assignments(session_id);
+CREATE INDEX IF NOT EXISTS ix_assignments_user ON training_assignments(user);
+
+CREATE TABLE IF NOT EXISTS bases (
+    id TEXT PRIMARY KEY, doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aircraft (
+    tail TEXT PRIMARY KEY, base_id TEXT, doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_aircraft_base ON aircraft(base_id);
+"""
+
+# Word search for page_tasks(search=...): triggers copy title and details into
+# an FTS5 table, so every writer keeps it current. Without FTS5 in the sqlite
+# build the query is answered by scanning instead.
+TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS task_text USING fts5(title, details);
+CREATE TRIGGER IF NOT EXISTS task_text_ins AFTER INSERT ON tasks BEGIN
+    INSERT OR REPLACE INTO task_text (rowid, title, details)
+    VALUES (new.id, json_extract(new.doc, '$.title'), json_extract(new.doc, '$.details'));
+END;
+CREATE TRIGGER IF NOT EXISTS task_text_upd AFTER UPDATE OF doc ON tasks BEGIN
+    INSERT OR REPLACE INTO task_text (rowid, title, details)
+    VALUES (new.id, json_extract(new.doc, '$.title'), json_extract(new.doc, '$.details'));
+END;
+CREATE TRIGGER IF NOT EXISTS task_text_del AFTER DELETE ON tasks BEGIN
+    DELETE FROM task_text WHERE rowid = old.id;
+END;
+"""
+
+IMPORTED = 1  # PRAGMA user_version once the JSON data has been imported
+
+_lock = threading.RLock()
+_conn: Optional[sqlite3.Connection] = None
+_fts = False  # task_text exists
+
+def connect(path=None) -> sqlite3.Connection:
+    """The shared connection; a database the JSON files were never imported into is filled from them."""
+    global _conn, _fts
+    with _lock:
+        if _conn is None:
+            path = Path(path or config.SQLITE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            _fts = _init_text(conn)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < IMPORTED:
+                if conn.execute("SELECT EXISTS (SELECT 1 FROM users) OR EXISTS (SELECT 1 FROM tasks)").fetchone()[0]:
+                    # filled by a version that did not set the marker (its import was one transaction too)
+                    conn.execute(f"PRAGMA user_version = {IMPORTED}")
+                else:
+                    # new, or an import that failed and was rolled back
+                    from migrate_to_sqlite import import_json
+                    import_json(conn)
+            _conn = conn
+        return _conn
+
+def _init_text(conn: sqlite3.Connection) -> bool:
+    """Create the word index, filling it for a database that predates it. False without FTS5."""
+    try:
+        conn.executescript(TEXT_SCHEMA)
+    except sqlite3.OperationalError:
+        return False
+    indexed, total = conn.execute("SELECT (SELECT COUNT(*) FROM task_text), (SELECT COUNT(*) FROM tasks)").fetchone()
+    if indexed != total:
+        with conn:
+            conn.execute("DELETE FROM task_text")
+            conn.execute("INSERT INTO task_text (rowid, title, details) "
+                         "SELECT id, json_extract(doc, '$.title'), json_extract(doc, '$.details') FROM tasks")
+    return True
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+@contextmanager
+def _tx():
+    with _lock:
+        conn = connect()
+        with conn:
+            yield conn
+
+def _rows(sql: str, args=()) -> List[Dict[str, Any]]:
+    with _lock:
+        return [json.loads(r[0]) for r in connect().execute(sql, args)]
+
+def _dump(doc) -> str:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+# ---------------- tasks ----------------
+def task_row(t: Dict[str, Any]):
+    return (t["id"], t.get("base_id"), t.get("aircraft_tail"), t.get("assigned_to"), t.get("status"), _dump(t))
+
+_PUT_TASK = "INSERT OR REPLACE INTO tasks (id, base_id, aircraft_tail, assigned_to, status, doc) VALUES (?,?,?,?,?,?)"
+
+def load_tasks():
+    return _rows("SELECT doc FROM tasks ORDER BY id")
+
+def save_tasks(tasks):
+    with _tx() as c:
+        c.execute("DELETE FROM tasks")
+        c.executemany(_PUT_TASK, [task_row(t) for t in tasks])
+    store_events.publish_change("tasks", reset=True)
+
+def get_task(task_id: int) -> Optional[Dict[str, Any]]:
+    rows = _rows("SELECT doc FROM tasks WHERE id = ?", (task_id,))
+    return rows[0] if rows else None
+
+def next_task_id() -> int:
+    with _lock:
+        return max(connect().execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0], next_id_floor())
+
+def _commit_tasks(adds: List[Dict[str, Any]], updates: Dict[int, Dict[str, Any]]) -> int:
+    with _tx() as c:
+        next_id = max(c.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0], next_id_floor())
+        for i, task in enumerate(adds):
+            task["id"] = next_id + i
+        c.executemany(_PUT_TASK, [task_row(t) for t in adds])
+        updated = []
+        for task_id, fields in updates.items():
+            row = c.execute("SELECT doc FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                continue
+            t = json.loads(row[0])
+            t.update(fields)
+            c.execute(_PUT_TASK, task_row(t))
+            updated.append(task_id)
+    store_events.publish_change("tasks", added=[t["id"] for t in adds], updated=updated)
+    return len(adds) + len(updated)
+
+@contextmanager
+def task_transaction():
+    tx = TaskTransaction(get_task, _commit_tasks)
+    yield tx
+    tx.commit()
+
+def add_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    with task_transaction() as tx:
+        tx.add(task)
+    return task
+
+def update_task(task_id: int, updates: Dict[str, Any]) -> bool:
+    with task_transaction() as tx:
+        return tx.update(task_id, updates)
+
+def delete_tasks(task_ids) -> int:
+    ids = list(set(task_ids))
+    found = []
+    with _tx() as c:
+        for i in range(0, len(ids), 500):  # stay under SQLite's limit on bound variables
+            chunk = ids[i:i + 500]
+            found += [r[0] for r in c.execute(f"SELECT id FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk)]
+        c.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in found])
+    store_events.publish_change("tasks", removed=found)
+    return len(found)
+
+def _task_where(base_id=None, aircraft_tail=None, assigned_to=None, status=None):
+    where, args = [], []
+    for col, value in (("base_id", base_id), ("aircraft_tail", aircraft_tail),
+                       ("assigned_to", assigned_to), ("status", status)):
+        if not value:
+            continue
+        if isinstance(value, (set, frozenset, list, tuple)):
+            where.append(f"{col} IN ({','.join('?' * len(value))})"); args.extend(value)
+        else:
+            where.append(f"{col} = ?"); args.append(value)
+    return (" WHERE " + " AND ".join(where) if where else ""), args
+
+def query_tasks(base_id: str = None, aircraft_tail: str = None,
+                assigned_to: str = None, status=None) -> List[Dict[str, Any]]:
+    where, args = _task_where(base_id, aircraft_tail, assigned_to, status)
+    return _rows("SELECT doc FROM tasks" + where + " ORDER BY id", args)
+
+def count_tasks(base_id: str = None, aircraft_tail: str = None,
+                assigned_to: str = None, status=None) -> int:
+    where, args = _task_where(base_id, aircraft_tail, assigned_to, status)
+    with _lock:
+        return connect().execute("SELECT COUNT(*) FROM tasks" + where, args).fetchone()[0]
+
+def _fts_query(search: str) -> Optional[str]:
+    """task_search query -> FTS5 MATCH expression ("hyd-2*" becomes the phrase prefix "hyd 2"*)."""
+    groups = parse_query(search)
+    if not groups:
+        return None
+
+    def phrase(token, prefix):
+        return '"' + " ".join(re.findall(r"[^\W_]+", token)) + '"' + ("*" if prefix else "")
+    return " OR ".join("(" + " AND ".join(phrase(*term) for term in terms) + ")" for terms in groups)
+
+def page_tasks(base_id: str = None, aircraft_tail: str = None, assigned_to: str = None, status=None,
+               predicate: Callable[[Dict[str, Any]], bool] = None, after: int = None,
+               limit: int = 100, search: str = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    where, args = _task_where(base_id, aircraft_tail, assigned_to, status)
+    match = _fts_query(search) if search else None
+    if match is not None:
+        with _lock:
+            connect()
+            if _fts:
+                where += (" AND " if where else " WHERE ") + "id IN (SELECT rowid FROM task_text WHERE task_text MATCH ?)"
+                args.append(match)
+            else:
+                words, extra = matcher(search), predicate
+                predicate = lambda t: words(t) and (extra is None or extra(t))
+    where += (" AND " if where else " WHERE ") + "id > ?"
+    found, last = [], -1 if after is None else after
+    while len(found) < limit:
+        # the primary key seek makes every page cost the same; with a predicate keep reading batches
+        batch = _rows("SELECT doc FROM tasks" + where + " ORDER BY id LIMIT ?", args + [last, limit])
+        for t in batch:
+            last = t["id"]
+            if predicate is None or predicate(t):
+                found.append(t)
+                if len(found) >= limit:
+                    return found, last
+        if len(batch) < limit:
+            break
+    return found, None
+
+def get_tasks(ids) -> List[Dict[str, Any]]:
+    ids = list(ids)
+    found = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        for t in _rows(f"SELECT doc FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+            found[t["id"]] = t
+    return [found[tid] for tid in ids if tid in found]
+
+def iter_tasks(predicate: Callable[[Dict[str, Any]], bool] = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+    """Rows are fetched in batches from a dedicated cursor, so memory stays flat."""
+    if limit is not None and limit <= 0:
+        return
+    with _lock:
+        cur = connect().cursor()
+        cur.execute("SELECT doc FROM tasks ORDER BY id")
+    found = 0
+    try:
+        while True:
+            with _lock:
+                batch = cur.fetchmany(500)
+            if not batch:
+                return
+            for (doc,) in batch:
+                t = json.loads(doc)
+                if predicate is None or predicate(t):
+                    yield t
+                    found += 1
+                    if limit is not None and found >= limit:
+                        return
+    finally:
+        cur.close()
+
+def filter_tasks(base_id: str = None, aircraft_tail: str = None, limit: int = None):
+    where, args = _task_where(base_id, aircraft_tail)
+    return _rows("SELECT doc FROM tasks" + where + " ORDER BY id" + (" LIMIT ?" if limit is not None else ""),
+                 args + ([limit] if limit is not None else []))
+
+# ---------------- users ----------------
+def user_row(u: Dict[str, Any]):
+    return (u["username"], u.get("role"), _dump(u))
+
+def load_users():
+    return _rows("SELECT doc FROM users ORDER BY rowid")
+
+def save_users(users):
+    with _tx() as c:
+        c.execute("DELETE FROM users")
+        c.executemany("INSERT INTO users (username, role, doc) VALUES (?,?,?)", [user_row(u) for u in users])
+    store_events.publish_change("users", reset=True)
+
+def get_usernames_by_role(role: str) -> List[str]:
+    with _lock:
+        return [r[0] for r in connect().execute("SELECT username FROM users WHERE role = ? ORDER BY rowid", (role,))]
+
+def list_usernames() -> List[str]:
+    with _lock:
+        return [r[0] for r in connect().execute("SELECT username FROM users ORDER BY rowid")]
+
+def get_user(username: str) -> Optional[Dict[str, Any]]:
+    found = _rows("SELECT doc FROM users WHERE username = ?", (username,))
+    return found[0] if found else None
+
+def add_user(username: str, password: str, role: str) -> bool:
+    hashed = hash_password(password)  # slow on purpose: keep it outside the write lock
+    with _tx() as c:
+        cur = c.execute(
+            "INSERT OR IGNORE INTO users (username, role, doc) VALUES (?,?,?)",
+            user_row({"username": username, "password": hashed, "role": role}),
+        )
+    if cur.rowcount == 1:
+        store_events.publish_change("users", added=[username])
+    return cur.rowcount == 1
+
+def set_password(username: str, password: str) -> bool:
+    hashed = hash_password(password)
+    with _tx() as c:
+        row = c.execute("SELECT doc FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return False
+        u = json.loads(row[0])
+        u["password"] = hashed
+        c.execute("UPDATE users SET doc = ? WHERE username = ?", (_dump(u), username))
+    store_events.publish_change("users", updated=[username])
+    return True
+
+def delete_user(username: str) -> bool:
+    with _tx() as c:
+        deleted = c.execute("DELETE FROM users WHERE username = ?", (username,)).rowcount == 1
+    if deleted:
+        store_events.publish_change("users", removed=[username])
+    return deleted
+
+# ---------------- stock ----------------
+def stock_row(it: Dict[str, Any]):
+    return (it["part_no"], int(it.get("qty", 0)), int(it.get("min_qty", 0)), _dump(it))
+
+_PUT_STOCK = "INSERT OR REPLACE INTO stock (part_no, qty, min_qty, doc) VALUES (?,?,?,?)"
+
+def _is_low(it: Optional[Dict[str, Any]]) -> bool:
+    return it is not None and it.get("qty", 0) < it.get("min_qty", 0)
+
+def _publish_low(part_no: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+    if _is_low(before) != _is_low(after):
+        store_events.publish("low_stock", part_no, _is_low(after), after)
+
+def load_stock() -> List[Dict[str, Any]]:
+    return _rows("SELECT doc FROM stock ORDER BY rowid")
+
+def get_item(part_no: str) -> Optional[Dict[str, Any]]:
+    found = _rows("SELECT doc FROM stock WHERE part_no = ?", (part_no,))
+    return found[0] if found else None
+
+def get_items(part_nos) -> List[Dict[str, Any]]:
+    part_nos = list(part_nos)
+    found = {}
+    for i in range(0, len(part_nos), 500):
+        chunk = part_nos[i:i + 500]
+        for it in _rows(f"SELECT doc FROM stock WHERE part_no IN ({','.join('?' * len(chunk))})", chunk):
+            found[it["part_no"]] = it
+    return [found[p] for p in part_nos if p in found]
+
+def save_stock(items: List[Dict[str, Any]]):
+    with _tx() as c:
+        before = {it["part_no"]: it for it in (json.loads(r[0]) for r in c.execute("SELECT doc FROM stock WHERE qty < min_qty"))}
+        c.execute("DELETE FROM stock")
+        c.executemany(_PUT_STOCK, [stock_row(it) for it in items])
+    store_events.publish_change("stock", reset=True)
+    after = {it["part_no"]: it for it in items}
+    for part_no in set(before) | {p for p, it in after.items() if _is_low(it)}:
+        _publish_low(part_no, before.get(part_no), after.get(part_no))
+
+_PUT_MOVE = "INSERT INTO stock_moves (part_no, delta, reason, user, at, task_id) VALUES (?,?,?,?,?,?)"
+
+def upsert_item(part_no: str, name: str, qty: int, min_qty: int, user: str = None) -> None:
+    with _tx() as c:
+        row = c.execute("SELECT doc FROM stock WHERE part_no = ?", (part_no,)).fetchone()
+        it = json.loads(row[0]) if row else {"part_no": part_no}
+        before = dict(it) if row else None
+        if row and int(it.get("qty", 0)) != qty:
+            c.execute(_PUT_MOVE, (part_no, qty - int(it.get("qty", 0)), "count", user, now_iso(), None))
+        it.update({"name": name, "qty": qty, "min_qty": min_qty})
+        if row:
+            c.execute("UPDATE stock SET qty = ?, min_qty = ?, doc = ? WHERE part_no = ?", (qty, min_qty, _dump(it), part_no))
+        else:
+            c.execute(_PUT_STOCK, stock_row(it))
+    store_events.publish_change("stock", added=[] if row else [part_no], updated=[part_no] if row else [])
+    _publish_low(part_no, before, it)
+
+def adjust_qty(part_no: str, delta: int, reason: str = "adjust", user: str = None, task_id: int = None) -> bool:
+    with _tx() as c:
+        row = c.execute("SELECT doc FROM stock WHERE part_no = ?", (part_no,)).fetchone()
+        if row is None:
+            return False
+        it = json.loads(row[0])
+        before = dict(it)
+        qty = int(it.get("qty", 0))
+        it["qty"] = max(0, qty + int(delta))
+        c.execute("UPDATE stock SET qty = ?, doc = ? WHERE part_no = ?", (it["qty"], _dump(it), part_no))
+        c.execute(_PUT_MOVE, (part_no, it["qty"] - qty, reason, user, now_iso(), task_id))
+    store_events.publish_change("stock", updated=[part_no])
+    _publish_low(part_no, before, it)
+    return True
+
+def delete_item(part_no: str) -> bool:
+    with _tx() as c:
+        row = c.execute("SELECT doc FROM stock WHERE part_no = ?", (part_no,)).fetchone()
+        if row is None:
+            return False
+        c.execute("DELETE FROM stock WHERE part_no = ?", (part_no,))
+    store_events.publish_change("stock", removed=[part_no])
+    _publish_low(part_no, json.loads(row[0]), None)
+    return True
+
+def low_stock() -> List[Dict[str, Any]]:
+    return _rows("SELECT doc FROM stock WHERE qty < min_qty ORDER BY rowid")
+
+def low_stock_count() -> int:
+    with _lock:
+        return connect().execute("SELECT COUNT(*) FROM stock WHERE qty < min_qty").fetchone()[0]
+
+def stock_history(part_no: str = None, since: str = None) -> List[Dict[str, Any]]:
+    where, args = [], []
+    if part_no is not None:
+        where.append("part_no = ?"); args.append(part_no)
+    if since is not None:
+        where.append("at >= ?"); args.append(since)
+    sql = "SELECT seq, part_no, delta, reason, user, at, task_id FROM stock_moves"
+    sql += (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY seq"
+    cols = ("seq", "part_no", "delta", "reason", "user", "at", "task_id")
+    with _lock:
+        rows = [dict(zip(cols, r)) for r in connect().execute(sql, args)]
+    for rec in rows:
+        if rec["task_id"] is None:
+            del rec["task_id"]
+    return rows
+
+def consumption(since: str = None) -> Dict[str, int]:
+    sql = "SELECT part_no, -SUM(delta) FROM stock_moves WHERE delta < 0" + (" AND at >= ?" if since else "")
+    with _lock:
+        return dict(connect().execute(sql + " GROUP BY part_no", [since] if since else []).fetchall())
+
+# ---------------- training ----------------
+def load_training() -> Dict[str, Any]:
+    with _lock:
+        conn = connect()
+        return {
+            "sessions": [json.loads(r[0]) for r in conn.execute("SELECT doc FROM training_sessions ORDER BY id")],
+            "assignments": [
+                {"user": u, "session_id": sid, "status": st}
+                for u, sid, st in conn.execute("SELECT user, session_id, status FROM training_assignments ORDER BY rowid")
+            ],
+        }
+
+def save_training(data: Dict[str, Any]):
+    with _tx() as c:
+        c.execute("DELETE FROM training_sessions")
+        c.execute("DELETE FROM training_assignments")
+        c.executemany("INSERT INTO training_sessions (id, doc) VALUES (?,?)",
+                      [(s["id"], _dump(s)) for s in data.get("sessions", [])])
+        c.executemany("INSERT OR REPLACE INTO training_assignments (user, session_id, status) VALUES (?,?,?)",
+                      [(a["user"], a["session_id"], a.get("status", "scheduled")) for a in data.get("assignments", [])])
+    store_events.publish_change("training", reset=True)
+
+def next_session_id(data: Dict[str, Any] = None) -> int:
+    if data is not None:
+        return (max((s.get("id", 0) for s in data.get("sessions", [])), default=0) + 1)
+    with _lock:
+        return connect().execute("SELECT COALESCE(MAX(id), 0) + 1 FROM training_sessions").fetchone()[0]
+
+def add_session(title: str, date_iso: str) -> Dict[str, Any]:
+    with _tx() as c:
+        sid = c.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM training_sessions").fetchone()[0]
+        session = {"id": sid, "title": title, "date": date_iso}
+        c.execute("INSERT INTO training_sessions (id, doc) VALUES (?,?)", (sid, _dump(session)))
+    store_events.publish_change("training", added=[sid])
+    return session
+
+def assign_user(user: str, session_id: int) -> bool:
+    with _tx() as c:
+        if c.execute("SELECT 1 FROM training_sessions WHERE id = ?", (session_id,)).fetchone() is None:
+            return False
+        added = c.execute("INSERT OR IGNORE INTO training_assignments (user, session_id, status) VALUES (?,?,'scheduled')",
+                          (user, session_id)).rowcount
+    if added:
+        store_events.publish_change("training", added=[(user, session_id)])
+    return True
+
+def set_assignment_status(user: str, session_id: int, status: str) -> bool:
+    return set_assignment_statuses([(user, session_id)], status) == 1
+
+def session_count() -> int:
+    with _lock:
+        return connect().execute("SELECT COUNT(*) FROM training_sessions").fetchone()[0]
+
+def get_session(session_id: int) -> Optional[Dict[str, Any]]:
+    found = _rows("SELECT doc FROM training_sessions WHERE id = ?", (session_id,))
+    return found[0] if found else None
+
+def _assignments(where: str, args) -> List[Dict[str, Any]]:
+    with _lock:
+        return [{"user": u, "session_id": sid, "status": st} for u, sid, st in connect().execute(
+            "SELECT user, session_id, status FROM training_assignments WHERE " + where + " ORDER BY rowid", args)]
+
+def assignments_for_user(user: str) -> List[Dict[str, Any]]:
+    return _assignments("user = ?", (user,))
+
+def assignments_for_session(session_id: int) -> List[Dict[str, Any]]:
+    return _assignments("session_id = ?", (session_id,))
+
+def assign_users(users: Iterable[str], session_id: int) -> int:
+    with _tx() as c:
+        if c.execute("SELECT 1 FROM training_sessions WHERE id = ?", (session_id,)).fetchone() is None:
+            return 0
+        known = {u for (u,) in c.execute("SELECT user FROM training_assignments WHERE session_id = ?", (session_id,))}
+        added = [(u, session_id) for u in dict.fromkeys(users) if u not in known]
+        c.executemany("INSERT INTO training_assignments (user, session_id, status) VALUES (?,?,'scheduled')", added)
+    if added:
+        store_events.publish_change("training", added=added)
+    return len(added)
+
+def set_assignment_statuses(pairs: Iterable[Tuple[str, int]], status: str) -> int:
+    with _tx() as c:
+        updated = [(u, sid) for u, sid in pairs
+                   if c.execute("UPDATE training_assignments SET status = ? WHERE user = ? AND session_id = ?",
+                                (status, u, sid)).rowcount]
+    if updated:
+        store_events.publish_change("training", updated=updated)
+    return len(updated)
+
+# ---------------- fleet reference data ----------------
+def load_bases() -> List[Dict[str, Any]]:
+    return _rows("SELECT doc FROM bases ORDER BY rowid")
+
+def load_aircraft() -> List[Dict[str, Any]]:
+    return _rows("SELECT doc FROM aircraft ORDER BY rowid")
+
+def list_base_ids() -> List[str]:
+    with _lock:
+        return [r[0] for r in connect().execute("SELECT id FROM bases ORDER BY rowid")]
+
+def base_name(base_id: str) -> str:
+    rows = _rows("SELECT doc FROM bases WHERE id = ?", (base_id,))
+    return rows[0].get("name", base_id) if rows else base_id
+
+def aircraft_by_base(base_id: str) -> List[Dict[str, Any]]:
+    return _rows("SELECT doc FROM aircraft WHERE base_id = ? ORDER BY rowid", (base_id,))
+
+def tails_by_base(base_id: str) -> List[str]:
+    with _lock:
+        return [r[0] for r in connect().execute("SELECT tail FROM aircraft WHERE base_id = ? ORDER BY rowid", (base_id,))]
+
+def find_aircraft(tail: str) -> Optional[Dict[str, Any]]:
+    rows = _rows("SELECT doc FROM aircraft WHERE tail = ?", (tail,))
+    return rows[0] if rows else None
@@ -0,0 +1,249 @@
+# stock_ledger.py
+# Append-only log of stock movements (stock.ledger), one compact JSON object per line:
+#   {"seq": 12, "part_no": "HYD-204", "delta": -2, "reason": "manual",
+#    "user": "tech1", "at": "2026-03-02T08:15:00+00:00", "task_id": 41}
+#
+# stock.json is a checkpoint of the quantities:
+#   {"ledger_seq": 12, "ledger_offset": 1834, "items": [...]}
+# Loading it replays the ledger records after ledger_seq (starting the scan at
+# ledger_offset), so a quantity change costs one small append, and the
+# checkpoint is rewritten only every ESS_STOCK_CHECKPOINT_EVERY moves. With
+# write-behind (ESS_WRITE_DEBOUNCE_MS) moves are held in memory and a burst of
+# them is appended with a single write and fsync.
+#
+# The old plain-list stock.json is still read. Its quantities are taken as
+# current, so ledger records that already exist are not replayed on top of
+# them; the first move rewrites it as a checkpoint before appending.
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from json_collection import JsonCollection, file_signature, write_atomic
+from timestamps import now_iso
+
+class StockLedger:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def signature(self):
+        return file_signature(self.path)
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Durably append records; returns the ledger size after them."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                             for rec in records))
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def records(self, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """(record, offset just after it) from byte `offset` on."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0  # ledger was replaced: rescan, records are filtered by seq
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn last line from a crash mid-append
+                offset += len(line)
+                try:
+                    yield json.loads(line), offset
+                except json.JSONDecodeError:
+                    continue
+
+    def tail(self) -> Tuple[int, int]:
+        """(last seq, size) of the ledger."""
+        seq, end = 0, 0
+        for rec, end in self.records():
+            seq = max(seq, rec.get("seq", 0))
+        return seq, end
+
+    def history(self, part_no: str = None, since: str = None) -> List[Dict[str, Any]]:
+        return [rec for rec, _ in self.records()
+                if (part_no is None or rec.get("part_no") == part_no)
+                and (since is None or rec.get("at", "") >= since)]
+
+def is_low(item: Dict[str, Any]) -> bool:
+    return item.get("qty", 0) < item.get("min_qty", 0)
+
+class StockView(JsonCollection):
+    """
+    Current stock (materialized from checkpoint + ledger), indexed by part_no.
+    move() changes a quantity through the ledger; the other JsonCollection
+    writes (put/update/delete/replace_all) rewrite the checkpoint.
+
+    The set of parts below min_qty is kept up to date on every change;
+    `on_low(part_no, below, item)` is called whenever a part enters or leaves it.
+    """
+    def __init__(self, path, ledger: StockLedger, checkpoint_every: int, debounce: float = 0.0,
+                 max_delay: float = 0.0, on_low: Callable = None, topic: str = None):
+        self.low: Dict[str, None] = {}  # ordered set of part_nos below min_qty
+        self._on_low = on_low
+        super().__init__(path, key="part_no", debounce=debounce, max_delay=max_delay, topic=topic)
+        self.ledger = ledger
+        self.checkpoint_every = checkpoint_every
+        self.seq = 0          # last ledger record reflected in memory
+        self._offset = 0      # ledger byte offset just after that record
+        self._since_checkpoint = 0
+        self._legacy = False  # stock.json is still a plain list
+        self._unlogged: List[Dict[str, Any]] = []  # moves not yet appended to the ledger
+
+    def _signature(self):
+        return (file_signature(self.path), self.ledger.signature())
+
+    # ---- low-stock set
+    def _reindex(self):
+        super()._reindex()
+        old = self.low
+        self.low = {it.get("part_no"): None for it in self._docs if is_low(it)}
+        if self.generation == 0:
+            return  # first load: nothing crossed anything
+        for part_no in [p for p in old if p not in self.low] + [p for p in self.low if p not in old]:
+            self._notify(part_no, part_no in self.low, self._by_key.get(part_no))
+
+    def _track(self, part_no: str):
+        it = self._by_key.get(part_no)
+        below = it is not None and is_low(it)
+        if below == (part_no in self.low):
+            return
+        if below:
+            self.low[part_no] = None
+        else:
+            del self.low[part_no]
+        self._notify(part_no, below, it)
+
+    def _notify(self, part_no, below, item):
+        if self._on_low is not None:
+            self._on_low(part_no, below, dict(item) if item is not None else None)
+
+    def low_items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._fresh()
+            return [self._by_key[p] for p in self.low]
+
+    def low_count(self) -> int:
+        with self._lock:
+            self._fresh()
+            return len(self.low)
+
+    def put(self, doc):
+        with self._lock:
+            super().put(doc)
+            self._track(doc.get("part_no"))
+            return doc
+
+    def update(self, key, fields) -> bool:
+        with self._lock:
+            changed = super().update(key, fields)
+            if changed:
+                self._track(key)
+            return changed
+
+    def delete(self, key):
+        with self._lock:
+            doc = super().delete(key)
+            if doc is not None:
+                self._track(key)
+            return doc
+
+    def upsert(self, part_no: str, fields: Dict[str, Any], reason: str = "count", user: str = None) -> None:
+        """
+        Add the part, or set its fields. A changed "qty" goes through move() with
+        the other changed fields, so it is one change and one write.
+        """
+        with self._lock:  # read-modify-write: no move may slip in between
+            it = self.get(part_no)
+            if it is None:
+                self.put({"part_no": part_no, **fields})
+                return
+            changed = {k: v for k, v in fields.items() if k != "qty" and it.get(k) != v}
+            delta = int(fields.get("qty", it.get("qty", 0))) - int(it.get("qty", 0))
+            if delta:
+                self.move(part_no, delta, reason, user, fields=changed)
+            elif changed:
+                self.update(part_no, changed)
+
+    def _read(self) -> List[Dict[str, Any]]:
+        doc = self._load(self.path, [])
+        self._legacy = isinstance(doc, list)
+        if self._legacy:
+            self.seq, self._offset = self.ledger.tail()
+            self._since_checkpoint = 0
+            return doc
+        items = doc.get("items", [])
+        self.seq, self._offset = doc.get("ledger_seq", 0), doc.get("ledger_offset", 0)
+        by_part = {it.get("part_no"): it for it in items}
+        replayed = 0
+        for rec, end in self.ledger.records(self._offset):
+            if rec.get("seq", 0) <= self.seq:
+                continue
+            it = by_part.get(rec.get("part_no"))
+            if it is not None:
+                it["qty"] = max(0, int(it.get("qty", 0)) + int(rec.get("delta", 0)))
+            self.seq, self._offset = rec["seq"], end
+            replayed += 1
+        self._since_checkpoint = replayed
+        return items
+
+    def history(self, part_no: str = None, since: str = None) -> List[Dict[str, Any]]:
+        """Ledger records, including moves still waiting for a write-behind flush."""
+        with self._lock:
+            pending = [dict(rec) for rec in self._unlogged
+                       if (part_no is None or rec.get("part_no") == part_no)
+                       and (since is None or rec.get("at", "") >= since)]
+            return self.ledger.history(part_no, since) + pending
+
+    def _write_pending(self):
+        if self._unlogged:
+            self._offset = self.ledger.append(self._unlogged)
+            self._unlogged = []
+        super()._write_pending()
+
+    def _write_file(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, {"ledger_seq": self.seq, "ledger_offset": self._offset, "items": self._docs},
+                     self._save)
+        self._since_checkpoint = 0
+        self._legacy = False
+
+    def move(self, part_no: str, delta: int, reason: str, user: str = None,
+             task_id: int = None, fields: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Change a quantity by `delta` (never below 0). Returns the ledger record, None if unknown.
+        `fields` (e.g. name, min_qty) are set on the item in the same change and write.
+        """
+        with self._lock:
+            self._fresh()
+            it = self._by_key.get(part_no)
+            if it is None:
+                return None
+            if self._legacy:
+                self._dirty = True
+                self.flush()
+            qty = int(it.get("qty", 0))
+            new_qty = max(0, qty + int(delta))
+            rec = {"seq": self.seq + 1, "part_no": part_no, "delta": new_qty - qty,
+                   "reason": reason, "user": user, "at": now_iso()}
+            if task_id is not None:
+                rec["task_id"] = task_id
+            self._unlogged.append(rec)
+            self.seq = rec["seq"]
+            it["qty"] = new_qty
+            if fields:
+                it.update(fields)
+                self._dirty = True  # the ledger only carries quantities: the checkpoint has the rest
+            self._track(part_no)
+            self.generation += 1
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self.checkpoint_every:
+                self._dirty = True
+            self._schedule()  # appends to the ledger now, or with the next write-behind flush
+            self._emit(updated=[part_no])
+            return rec
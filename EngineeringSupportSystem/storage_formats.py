@@ -0,0 +1,119 @@
+# storage_formats.py
+# On-disk encodings for the JSON data files. Loaders detect the format from
+# the first bytes of the file, so files of different formats can coexist and
+# the setting (ESS_STORAGE_FORMAT) only decides how files are written.
+#
+#   pretty   - indented JSON (the historical format)
+#   compact  - JSON without whitespace
+#   jsonl    - header line, then one record per line; can be streamed
+#   binary   - "ESSB" header, then length-prefixed compact-JSON records;
+#              can be streamed and skipped through without parsing
+#
+# jsonl and binary only apply to lists of records; other documents (e.g.
+# training.json) are written as compact JSON in those modes.
+import json
+import struct
+from pathlib import Path
+from typing import Any, Iterator
+
+import config
+
+FORMATS = ("pretty", "compact", "jsonl", "binary")
+
+JSONL_HEADER = b'{"ess_format":"jsonl","version":1}\n'
+BINARY_MAGIC = b"ESSB\x01"
+_LEN = struct.Struct("<I")
+
+def _compact(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def detect_format(head: bytes) -> str:
+    if head.startswith(BINARY_MAGIC):
+        return "binary"
+    if head.startswith(JSONL_HEADER):
+        return "jsonl"
+    return "json"
+
+def _sniff(path) -> str:
+    with open(path, "rb") as f:
+        return detect_format(f.read(len(JSONL_HEADER)))
+
+# ---------------- encode ----------------
+def dumps(data: Any, fmt: str = None) -> bytes:
+    fmt = fmt or config.STORAGE_FORMAT
+    if fmt == "pretty":
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown storage format {fmt!r}; expected one of {FORMATS}")
+    if fmt == "compact" or not isinstance(data, list):
+        return _compact(data)
+    if fmt == "jsonl":
+        return JSONL_HEADER + b"".join(_compact(r) + b"\n" for r in data)
+    parts = [BINARY_MAGIC, _LEN.pack(len(data))]
+    for r in data:
+        blob = _compact(r)
+        parts.append(_LEN.pack(len(blob)))
+        parts.append(blob)
+    return b"".join(parts)
+
+def save_file(path, data: Any, fmt: str = None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(dumps(data, fmt))
+
+# ---------------- decode ----------------
+def loads(raw: bytes) -> Any:
+    """Decode a whole file of any supported format; raises ValueError if it is corrupt."""
+    fmt = detect_format(raw[:len(JSONL_HEADER)])
+    if fmt == "json":
+        return json.loads(raw)
+    # splice the records into one JSON array: a single C-level parse is much
+    # faster than one json.loads() call per record
+    return json.loads(b"[" + b",".join(_record_blobs(raw, fmt)) + b"]")
+
+def _record_blobs(raw: bytes, fmt: str) -> Iterator[bytes]:
+    if fmt == "jsonl":
+        for line in raw[len(JSONL_HEADER):].splitlines():
+            if line.strip():
+                yield line
+        return
+    (count,) = _LEN.unpack_from(raw, len(BINARY_MAGIC))
+    pos = len(BINARY_MAGIC) + _LEN.size
+    for _ in range(count):
+        (n,) = _LEN.unpack_from(raw, pos)
+        pos += _LEN.size
+        yield raw[pos:pos + n]
+        pos += n
+
+def load_file(path, default):
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return default
+    except (ValueError, struct.error):
+        return default
+
+def iter_records(path) -> Iterator[Any]:
+    """
+    Yield the records of a list file one at a time. jsonl and binary files
+    are streamed with constant memory; plain JSON has to be parsed whole.
+    """
+    fmt = _sniff(path)
+    if fmt == "json":
+        with open(path, "rb") as f:
+            yield from json.loads(f.read())
+        return
+    with open(path, "rb") as f:
+        if fmt == "jsonl":
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        f.read(len(BINARY_MAGIC))
+        (count,) = _LEN.unpack(f.read(_LEN.size))
+        for _ in range(count):
+            (n,) = _LEN.unpack(f.read(_LEN.size))
+            yield json.loads(f.read(n))
@@ -0,0 +1,117 @@
+# store_events.py
+# In-process publish/subscribe for store changes.
+#
+#   unsubscribe = subscribe("low_stock", self._on_low_stock)
+#   publish("low_stock", part_no, True, item)
+#
+# Bound methods are held weakly, so a panel that is thrown away stops
+# receiving events without having to unsubscribe.
+#
+# Topics:
+#   "low_stock"  (part_no, below: bool, item)  a part crossed below min_qty
+#                                              (below=True) or recovered (False)
+#   "tasks", "stock", "users", "training"  (change: Change)
+#                                              records a write added/updated/removed;
+#                                              training sessions are keyed by id,
+#                                              assignments by (user, session_id)
+#
+# ui/store_bridge.py re-delivers the record topics on the Qt GUI thread,
+# merged per event-loop tick.
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List
+
+RECORD_TOPICS = ("tasks", "stock", "users", "training")
+
+class Change:
+    """
+    Primary keys touched by one or more writes. `reset` means the change
+    cannot be described per record (e.g. training.json was replaced) and
+    listeners should reload.
+    """
+    def __init__(self, added: Iterable = (), updated: Iterable = (), removed: Iterable = (), reset: bool = False):
+        self.added = set(added)
+        self.updated = set(updated) - self.added
+        self.removed = set(removed)
+        self.reset = reset
+
+    def __bool__(self):
+        return bool(self.reset or self.added or self.updated or self.removed)
+
+    def __repr__(self):
+        return f"Change(added={self.added}, updated={self.updated}, removed={self.removed}, reset={self.reset})"
+
+    def merge(self, later: "Change") -> "Change":
+        """Fold a later change into this one, so the result describes both in order."""
+        for k in later.added:
+            if k in self.removed:
+                self.removed.discard(k)
+                self.updated.add(k)
+            else:
+                self.added.add(k)
+        for k in later.updated:
+            if k not in self.added:
+                self.updated.add(k)
+        for k in later.removed:
+            self.updated.discard(k)
+            if k in self.added:
+                self.added.discard(k)
+            else:
+                self.removed.add(k)
+        self.reset = self.reset or later.reset
+        return self
+
+_lock = threading.Lock()
+_subscribers: Dict[str, List] = {}
+
+def _ref(callback: Callable):
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+def subscribe(topic: str, callback: Callable) -> Callable[[], None]:
+    """Call `callback(*args)` for every publish(topic, *args). Returns an unsubscribe function."""
+    ref = _ref(callback)
+    with _lock:
+        _subscribers.setdefault(topic, []).append(ref)
+
+    def unsubscribe():
+        with _lock:
+            refs = _subscribers.get(topic, [])
+            if ref in refs:
+                refs.remove(ref)
+    return unsubscribe
+
+def publish(topic: str, *args):
+    with _lock:
+        refs = list(_subscribers.get(topic, ()))
+    dead = []
+    for ref in refs:
+        callback = ref()
+        if callback is None:
+            dead.append(ref)
+            continue
+        try:
+            callback(*args)
+        except RuntimeError as e:
+            if "has been deleted" not in str(e):
+                raise
+            # the Qt object behind a still-referenced wrapper is gone
+            dead.append(ref)
+    if dead:
+        with _lock:
+            _subscribers[topic] = [r for r in _subscribers.get(topic, []) if r not in dead]
+
+def publish_change(topic: str, added: Iterable = (), updated: Iterable = (), removed: Iterable = (),
+                   reset: bool = False):
+    change = Change(added, updated, removed, reset)
+    if change:
+        publish(topic, change)
+
+def diff(old: Dict, new: Dict) -> Change:
+    """Change between two {key: record} mappings."""
+    return Change(
+        added=[k for k in new if k not in old],
+        updated=[k for k, v in new.items() if k in old and old[k] != v],
+        removed=[k for k in old if k not in new],
+    )
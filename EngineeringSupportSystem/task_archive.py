@@ -0,0 +1,188 @@
+# task_archive.py
+# Cold storage for finished work orders.
+#
+# Approved / rejected tasks whose last change is older than
+# ESS_ARCHIVE_MIN_AGE_DAYS are moved out of the live task store into
+# compressed, append-only JSON-lines segments, one per month of last change:
+#
+#   data/archive/tasks-2025-09.jsonl.gz     (or .jsonl.xz with ESS_ARCHIVE_COMPRESSION=lzma)
+#   data/archive/manifest.json              {"max_id": 812, "count": 640}
+#
+# Every run appends a new compressed member to the segment, so existing data
+# is never rewritten. Segments are written before the tasks leave the live
+# store; if a run is interrupted, a task can be in both, and readers keep
+# the archived copy only once.
+#
+# A finished task without updated_at/created_at (history from before
+# timestamps were recorded, or saved through save_tasks) is not archived
+# right away: the run stamps it with updated_at, so it ages from then.
+#
+#   python task_archive.py [--min-age-days N]
+import argparse
+import gzip
+import json
+import lzma
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import config
+from json_collection import file_signature
+
+ARCHIVE_DIR = config.DATA_DIR / "archive"
+MANIFEST_FILE = ARCHIVE_DIR / "manifest.json"
+TERMINAL_STATES = {"approved", "rejected"}
+
+_OPENERS = {".gz": gzip.open, ".xz": lzma.open}
+_manifest_cache = {"sig": False, "data": {}}
+
+def _suffix() -> str:
+    return ".xz" if config.ARCHIVE_COMPRESSION == "lzma" else ".gz"
+
+def partition_of(task: Dict[str, Any]) -> str:
+    return (task.get("updated_at") or task.get("created_at"))[:7]
+
+def _last_change(task: Dict[str, Any]) -> Optional[datetime]:
+    stamp = task.get("updated_at") or task.get("created_at")
+    try:
+        changed = datetime.fromisoformat(stamp) if stamp else None
+    except ValueError:
+        return None
+    if changed is not None and changed.tzinfo is None:
+        changed = changed.replace(tzinfo=timezone.utc)
+    return changed
+
+# ---------------- manifest ----------------
+def load_manifest() -> Dict[str, Any]:
+    sig = file_signature(MANIFEST_FILE)
+    if sig != _manifest_cache["sig"]:
+        try:
+            with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        _manifest_cache.update(sig=sig, data=data)
+    return _manifest_cache["data"]
+
+def _save_manifest(data: Dict[str, Any]):
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, MANIFEST_FILE)
+
+def next_id_floor() -> int:
+    """Lowest id a new task may take, so ids of archived tasks are never reused."""
+    return load_manifest().get("max_id", 0) + 1
+
+# ---------------- writing ----------------
+def _append_segment(partition: str, tasks: List[Dict[str, Any]]):
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    path = ARCHIVE_DIR / f"tasks-{partition}.jsonl{_suffix()}"
+    data = "".join(json.dumps(t, ensure_ascii=False, separators=(",", ":")) + "\n" for t in tasks)
+    with open(path, "ab") as raw:
+        with _OPENERS[path.suffix](raw, "wt", encoding="utf-8") as z:
+            z.write(data)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+def archive_tasks(min_age_days: int = None, now: datetime = None) -> int:
+    """Move old approved/rejected tasks into the archive. Returns how many moved."""
+    import data_store
+    min_age_days = config.ARCHIVE_MIN_AGE_DAYS if min_age_days is None else min_age_days
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=min_age_days)
+
+    moving: Dict[str, List[Dict[str, Any]]] = {}
+    undated = []
+    for t in data_store.query_tasks(status=TERMINAL_STATES):
+        changed = _last_change(t)
+        if changed is None:
+            undated.append(t["id"])
+        elif changed <= cutoff:
+            moving.setdefault(partition_of(t), []).append(t)
+    if undated:
+        with data_store.task_transaction() as tx:
+            for tid in undated:
+                tx.update(tid, {})  # sets updated_at
+    if not moving:
+        return 0
+
+    for partition, tasks in sorted(moving.items()):
+        _append_segment(partition, tasks)
+    ids = [t["id"] for tasks in moving.values() for t in tasks]
+    manifest = dict(load_manifest())
+    manifest["max_id"] = max([manifest.get("max_id", 0)] + ids)
+    manifest["count"] = manifest.get("count", 0) + len(ids)
+    _save_manifest(manifest)
+
+    data_store.delete_tasks(ids)
+    return len(ids)
+
+# ---------------- reading ----------------
+def segments(since: str = None, until: str = None) -> List[Path]:
+    """Segment files, optionally limited to months "YYYY-MM" in [since, until]."""
+    found = []
+    for path in sorted(ARCHIVE_DIR.glob("tasks-*.jsonl.*")):
+        if path.suffix not in _OPENERS:
+            continue
+        partition = path.name[len("tasks-"):].split(".")[0]
+        if (since and partition < since) or (until and partition > until):
+            continue
+        found.append(path)
+    return found
+
+def iter_archived(predicate: Callable[[Dict[str, Any]], bool] = None,
+                  since: str = None, until: str = None) -> Iterator[Dict[str, Any]]:
+    """Stream archived tasks one at a time; only the matching segments are opened."""
+    seen = set()
+    for path in segments(since, until):
+        with _OPENERS[path.suffix](path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    t = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if t.get("id") in seen:
+                    continue
+                seen.add(t.get("id"))
+                if predicate is None or predicate(t):
+                    yield t
+
+def query_archive(base_id: str = None, aircraft_tail: str = None, assigned_to: str = None,
+                  status=None, since: str = None, until: str = None) -> List[Dict[str, Any]]:
+    if isinstance(status, str):
+        status = {status}
+    where = {"base_id": base_id, "aircraft_tail": aircraft_tail, "assigned_to": assigned_to}
+    where = {k: v for k, v in where.items() if v}
+    return list(iter_archived(
+        lambda t: all(t.get(k) == v for k, v in where.items()) and (not status or t.get("status") in status),
+        since, until,
+    ))
+
+def get_archived_task(task_id: int) -> Optional[Dict[str, Any]]:
+    return next(iter_archived(lambda t: t.get("id") == task_id), None)
+
+def task_history(base_id: str = None, aircraft_tail: str = None, assigned_to: str = None,
+                 status=None, since: str = None, until: str = None) -> List[Dict[str, Any]]:
+    """Live and archived tasks together, in id order - for reports."""
+    import data_store
+    live = data_store.query_tasks(base_id=base_id, aircraft_tail=aircraft_tail, assigned_to=assigned_to, status=status)
+    live_ids = {t["id"] for t in live}
+    cold = [t for t in query_archive(base_id, aircraft_tail, assigned_to, status, since, until) if t["id"] not in live_ids]
+    return sorted(live + cold, key=lambda t: t.get("id", 0))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Move old approved/rejected tasks into the compressed archive.")
+    ap.add_argument("--min-age-days", type=int, default=config.ARCHIVE_MIN_AGE_DAYS,
+                    help="only archive tasks unchanged for this many days (default: %(default)s)")
+    args = ap.parse_args(argv)
+    moved = archive_tasks(args.min_age_days)
+    print(f"Archived {moved} task(s) into {ARCHIVE_DIR}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# task_journal.py
+# Append-only change log kept next to tasks.json (tasks.journal).
+#
+# Records, one compact JSON object per line:
+#   {"op": "put", "task": {...}}             add or replace a whole task
+#   {"op": "set", "id": 7, "fields": {...}}  update some fields of a task
+#   {"op": "del", "id": 7}                   remove a task
+#
+# Replaying a log on top of a state that already contains it gives the same
+# state again, which is what makes compaction crash-safe:
+#   1. tasks.journal is renamed to tasks.journal.old (sealed)
+#   2. the in-memory state is written to a temp file, fsynced, and renamed over tasks.json
+#   3. tasks.journal.old is deleted
+# A crash at any point leaves snapshot + sealed + journal replaying to the right state.
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from json_collection import file_signature
+
+def apply_record(tasks: List[Dict[str, Any]], by_id: Dict[int, Dict[str, Any]], rec: Dict[str, Any]):
+    op = rec.get("op")
+    if op == "put":
+        task = rec["task"]
+        old = by_id.get(task.get("id"))
+        if old is None:
+            tasks.append(task)
+        else:
+            old.clear()
+            old.update(task)
+            task = old
+        by_id[task.get("id")] = task
+    elif op == "set":
+        t = by_id.get(rec.get("id"))
+        if t is not None:
+            t.update(rec.get("fields", {}))
+    elif op == "del":
+        t = by_id.pop(rec.get("id"), None)
+        if t is not None:
+            for i, x in enumerate(tasks):
+                if x is t:
+                    del tasks[i]
+                    break
+
+def replay_task(task: Optional[Dict[str, Any]], records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Apply one task's records to it (None = not present); returns the result."""
+    for rec in records:
+        op = rec.get("op")
+        if op == "put":
+            task = dict(rec["task"])
+        elif op == "set" and task is not None:
+            task.update(rec.get("fields", {}))
+        elif op == "del":
+            task = None
+    return task
+
+class TaskJournal:
+    def __init__(self, snapshot, compact_bytes: int):
+        self.snapshot = Path(snapshot)
+        self.path = self.snapshot.with_suffix(".journal")
+        self.sealed = self.snapshot.with_suffix(".journal.old")
+        self.compact_bytes = compact_bytes
+        self.size = 0
+
+    def signature(self) -> tuple:
+        return (file_signature(self.path), file_signature(self.sealed))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Every record of the sealed and the live journal, oldest first."""
+        self.size = 0
+        for p in (self.sealed, self.path):
+            try:
+                with open(p, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if p == self.path:
+                            self.size += len(line.encode("utf-8"))
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # torn last line from a crash mid-append
+            except FileNotFoundError:
+                pass
+
+    def replay(self, tasks: List[Dict[str, Any]]):
+        by_id = {t.get("id"): t for t in tasks}
+        for rec in self.records():
+            apply_record(tasks, by_id, rec)
+
+    def records_by_id(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Journal records grouped per task id, for overlaying a streamed snapshot."""
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        for rec in self.records():
+            tid = rec["task"].get("id") if rec.get("op") == "put" else rec.get("id")
+            grouped.setdefault(tid, []).append(rec)
+        return grouped
+
+    def append(self, records: Iterable[Dict[str, Any]]):
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        if not data:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(data.encode("utf-8"))
+
+    def needs_compaction(self) -> bool:
+        return self.size >= self.compact_bytes
+
+    def seal(self):
+        """Move the live journal aside; new appends start a fresh file."""
+        if not self.path.exists():
+            return
+        if self.sealed.exists():
+            # left over from an interrupted compaction: keep both in order
+            with open(self.sealed, "a", encoding="utf-8") as dst, open(self.path, "r", encoding="utf-8") as src:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.sealed)
+        self.size = 0
+
+    def write_snapshot(self, tasks: List[Dict[str, Any]], save):
+        """Atomically replace tasks.json with `tasks`, then drop the sealed log."""
+        tmp = self.snapshot.with_suffix(".json.tmp")
+        save(tmp, tasks)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot)
+        try:
+            os.remove(self.sealed)
+        except FileNotFoundError:
+            pass
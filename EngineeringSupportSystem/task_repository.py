@@ -0,0 +1,400 @@
+# task_repository.py
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from json_collection import JsonCollection, file_signature  # noqa: F401  (re-exported)
+from storage_formats import load_file, save_file
+from task_journal import replay_task
+from task_search import TokenIndex, task_text
+from timestamps import now_iso
+
+# Hash indexes kept on the cached tasks: field tuple -> {values: {task_id: None}}
+INDEXES = (("base_id", "aircraft_tail"), ("base_id",), ("aircraft_tail",), ("assigned_to",), ("status",))
+
+def _normalize(where: Dict[str, Any]) -> Dict[str, set]:
+    return {f: (set(v) if isinstance(v, (set, frozenset, list, tuple)) else {v}) for f, v in where.items()}
+
+def _matches(t: Dict[str, Any], where: Dict[str, set]) -> bool:
+    return all(t.get(f) in accepted for f, accepted in where.items())
+
+class TaskRepository(JsonCollection):
+    """
+    JsonCollection of tasks keyed by "id", with secondary indexes for query()
+    and a word index over title and details for page(search=...).
+    The list returned by all() is the cache itself - callers must not mutate it.
+
+    With a TaskJournal attached, changes are appended to the journal instead
+    of rewriting the file, and the journal is compacted on a background thread.
+    """
+    def __init__(self, path, load: Callable = load_file, save: Callable = save_file,
+                 journal=None, stream: Callable = None, debounce: float = 0.0, max_delay: float = 0.0,
+                 topic: str = "tasks"):
+        super().__init__(path, key="id", load=load, save=save, debounce=debounce, max_delay=max_delay,
+                         topic=topic)
+        self._stream = stream or (lambda path: iter(self._load(path, [])))
+        self._journal = journal
+        self._compacting = False
+        self._index: Dict[tuple, Dict[tuple, Dict[int, None]]] = {f: {} for f in INDEXES}
+        self._max_id = 0
+        self._ids: List[int] = []  # all task ids, ascending (for page())
+        self._text = TokenIndex()
+
+    # ---- cache bookkeeping
+    def _signature(self):
+        sig = file_signature(self.path)
+        if self._journal:
+            sig = (sig, self._journal.signature())
+        return sig
+
+    def _read(self):
+        tasks = super()._read()
+        if self._journal:
+            self._journal.replay(tasks)
+        return tasks
+
+    def _reindex(self):
+        super()._reindex()
+        self._index = {f: {} for f in INDEXES}
+        self._text = TokenIndex()
+        for t in self._docs:
+            self._index_add(t)
+        self._max_id = max((t.get("id", 0) for t in self._docs), default=0)
+        self._ids = sorted(self._by_key)
+
+    def _id_add(self, task_id: int):
+        i = bisect.bisect_left(self._ids, task_id)
+        if i == len(self._ids) or self._ids[i] != task_id:
+            self._ids.insert(i, task_id)
+
+    def _id_remove(self, task_id: int):
+        i = bisect.bisect_left(self._ids, task_id)
+        if i < len(self._ids) and self._ids[i] == task_id:
+            del self._ids[i]
+
+    def _index_add(self, t, text: bool = True):
+        for fields, buckets in self._index.items():
+            buckets.setdefault(tuple(t.get(f) for f in fields), {})[t.get("id")] = None
+        if text:
+            self._text.add(t.get("id"), task_text(t))
+
+    def _index_remove(self, t, text: bool = True):
+        for fields, buckets in self._index.items():
+            key = tuple(t.get(f) for f in fields)
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.pop(t.get("id"), None)
+                if not bucket:
+                    del buckets[key]
+        if text:
+            self._text.remove(t.get("id"))
+
+    def _write(self, records):
+        """Persist a change: append `records` to the journal, or write the whole file."""
+        if self._journal:
+            self._journal.append(records)
+            self._sig = self._signature()
+            self.generation += 1
+            self._maybe_compact()
+        else:
+            self._changed()
+
+    def _maybe_compact(self):
+        if self._compacting or not self._journal.needs_compaction():
+            return
+        self._compacting = True
+        self._journal.seal()
+        self._sig = self._signature()
+        snapshot = [dict(t) for t in self._docs]
+        threading.Thread(target=self._compact, args=(snapshot,), daemon=True).start()
+
+    def _compact(self, snapshot):
+        try:
+            self._journal.write_snapshot(snapshot, self._save)
+        finally:
+            with self._lock:
+                self._compacting = False
+                # only our own files changed if the journal is still as we left it
+                if self._sig and self._sig[1][0] == self._journal.signature()[0]:
+                    self._sig = self._signature()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes,
+                    "coalesced": self.coalesced, "tasks": len(self._docs)}
+
+    # ---- reads
+    def iter(self, predicate: Callable = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield tasks matching `predicate`, stopping after `limit`. When the cache
+        is already loaded and current it is used; otherwise the file is streamed
+        record by record and the cache is left cold, so memory stays bounded by
+        the journal size rather than the history size.
+        """
+        with self._lock:
+            source = list(self._docs) if self._current() else None
+        if source is None:
+            source = self._stream_from_disk()
+        if limit is not None and limit <= 0:
+            return
+        found = 0
+        for t in source:
+            if predicate is None or predicate(t):
+                yield t
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+    def _stream_from_disk(self) -> Iterator[Dict[str, Any]]:
+        pending = self._journal.records_by_id() if self._journal else {}
+        try:
+            records = self._stream(self.path)
+            for t in records:
+                ops = pending.pop(t.get("id"), None)
+                if ops:
+                    t = replay_task(t, ops)
+                    if t is None:
+                        continue
+                yield t
+        except FileNotFoundError:
+            pass
+        for ops in pending.values():  # tasks that so far exist only in the journal
+            t = replay_task(None, ops)
+            if t is not None:
+                yield t
+
+    def query(self, **where) -> List[Dict[str, Any]]:
+        """
+        Tasks whose fields match every criterion, in id order. A criterion is a
+        single value or a set/list/tuple of accepted values. Cost follows the
+        smallest matching index bucket, not the number of tasks.
+        """
+        where = _normalize(where)
+        with self._lock:
+            self._fresh()
+            candidates = self._candidates(where)
+            if candidates is None:
+                candidates = self._by_key.keys()
+            hits = [self._by_key[i] for i in candidates]
+            hits = [t for t in hits if _matches(t, where)]
+        hits.sort(key=lambda t: t.get("id", 0))
+        return hits
+
+    def page(self, where: Dict[str, Any] = None, predicate: Callable = None, after: int = None,
+             limit: int = 100, search: str = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Up to `limit` tasks matching `where` (as for query()), the word query
+        `search` (task_search syntax) and `predicate` with an id greater than
+        `after`, in id order. Returns (tasks, cursor):
+        pass cursor as `after` to continue; it is None once nothing is left.
+        Walks the id-ordered list from the cursor, or sorts the smallest index
+        bucket when that is cheaper, so the cost of a page does not grow with
+        the number of tasks.
+        """
+        where = _normalize(where or {})
+        with self._lock:
+            self._fresh()
+            candidates = self._candidates(where)
+            hits = self._text.search(search) if search else None
+            if hits is not None and (candidates is None or len(hits) < len(candidates)):
+                candidates = hits
+            if candidates is not None and len(candidates) ** 2 <= limit * len(self._ids):
+                ids, start = sorted(i for i in candidates if after is None or i > after), 0
+            else:
+                ids = self._ids
+                start = bisect.bisect_right(ids, after) if after is not None else 0
+            found = []
+            for pos in range(start, len(ids)):
+                tid = ids[pos]
+                t = self._by_key[tid]
+                if (_matches(t, where) and (hits is None or tid in hits)
+                        and (predicate is None or predicate(t))):
+                    found.append(t)
+                    if len(found) >= limit:
+                        return found, tid
+            return found, None
+
+    def _candidates(self, where: Dict[str, set]) -> Optional[Iterable[int]]:
+        """Ids from the smallest index bucket covering `where`; None if no index applies."""
+        candidates = None
+        for fields in INDEXES:
+            if not all(f in where for f in fields):
+                continue
+            ids = self._lookup(fields, where)
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        return candidates
+
+    def _lookup(self, fields: tuple, where: Dict[str, set]) -> Iterable[int]:
+        buckets = self._index[fields]
+        if len(fields) == 1:
+            keys = [(v,) for v in where[fields[0]]]
+        else:
+            keys = [(a, b) for a in where[fields[0]] for b in where[fields[1]]]
+        found = [buckets.get(k, {}) for k in keys]
+        if len(found) == 1:
+            return found[0]
+        ids = {}
+        for bucket in found:
+            ids.update(bucket)
+        return ids
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._fresh()
+            return self._max_id + 1
+
+    # ---- writes
+    def replace_all(self, tasks: List[Dict[str, Any]]):
+        with self._lock:
+            records = []
+            if self._journal:
+                self._fresh()
+                # journal only what differs from the current state
+                keep = {t.get("id") for t in tasks}
+                records = [{"op": "del", "id": tid} for tid in self._by_key if tid not in keep]
+                records += [{"op": "put", "task": t} for t in tasks if self._by_key.get(t.get("id")) != t]
+            old = self._by_key
+            self._docs = tasks
+            self._reindex()
+            self._write(records)
+            self._emit_diff(old)
+
+    def apply(self, adds: List[Dict[str, Any]], updates: Dict[int, Dict[str, Any]], id_floor: int = 1) -> int:
+        """
+        Add tasks and update fields of existing ones with a single write.
+        Added tasks with id None get consecutive ids, starting no lower than
+        `id_floor`. Returns how many tasks were added or updated.
+        """
+        with self._lock:
+            self._fresh()
+            next_id = max(self._max_id + 1, id_floor)
+            records, updated = [], []
+            size, before = len(self._docs), {}  # to undo a failed call
+            try:
+                for task in adds:
+                    if task.get("id") is None:
+                        task["id"] = next_id
+                        next_id += 1
+                    stored = dict(task)
+                    self._docs.append(stored)
+                    self._by_key[stored["id"]] = stored
+                    self._index_add(stored)
+                    self._id_add(stored["id"])
+                    self._max_id = max(self._max_id, stored["id"])
+                    records.append({"op": "put", "task": stored})
+                for task_id, fields in updates.items():
+                    t = self._by_key.get(task_id)
+                    if t is None:
+                        continue
+                    before.setdefault(task_id, dict(t))
+                    text = "title" in fields or "details" in fields
+                    self._index_remove(t, text)
+                    t.update(fields)
+                    self._index_add(t, text)
+                    records.append({"op": "set", "id": task_id, "fields": fields})
+                    updated.append(task_id)
+                if records:
+                    self._write(records)
+            except Exception:
+                self._undo(size, before)
+                raise
+            if records:
+                self._emit(added=[t["id"] for t in adds], updated=updated)
+            return len(records)
+
+    def _undo(self, size: int, before: Dict[int, Dict[str, Any]]):
+        """
+        Put memory back as it was before a failed apply(). Earlier changes still
+        waiting for write-behind stay in memory and pending; with none, the
+        cache is dropped so the next read trusts the file.
+        """
+        del self._docs[size:]
+        for task_id, old in before.items():
+            t = self._by_key[task_id]
+            t.clear()
+            t.update(old)
+        self._reindex()
+        if not (self.dirty or self._pending):
+            self._sig = False
+
+    def add(self, task: Dict[str, Any], task_id: int = None) -> Dict[str, Any]:
+        """Store a new task under `task_id`, or under the next free id."""
+        task["id"] = task_id
+        self.apply([task], {})
+        return task
+
+    def put(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Store `task` under its id, replacing any task with that id."""
+        with self._lock:
+            self._fresh()
+            old = self._by_key.get(task["id"])
+            if old is None:
+                self._docs.append(task)
+            else:
+                self._index_remove(old)
+                self._docs[self._position(old)] = task
+            self._by_key[task["id"]] = task
+            self._id_add(task["id"])
+            self._index_add(task)
+            self._max_id = max(self._max_id, task["id"])
+            self._write([{"op": "put", "task": task}])
+            if old is None:
+                self._emit(added=[task["id"]])
+            else:
+                self._emit(updated=[task["id"]])
+            return task
+
+    def remove(self, task_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._fresh()
+            t = self._by_key.pop(task_id, None)
+            if t is None:
+                return None
+            self._id_remove(task_id)
+            self._index_remove(t)
+            del self._docs[self._position(t)]
+            self._write([{"op": "del", "id": task_id}])
+            self._emit(removed=[task_id])
+            return t
+
+    delete = remove
+
+    def update(self, task_id: int, updates: Dict[str, Any]) -> bool:
+        return self.apply([], {task_id: updates}) == 1
+
+class TaskTransaction:
+    """
+    Buffers task adds and updates; commit() hands them to the store in one
+    call, so a batch costs one write. Nothing is stored if the batch is
+    dropped. New tasks get their "id" at commit time.
+    """
+    def __init__(self, get: Callable, commit: Callable):
+        self._get = get
+        self._commit = commit
+        self._adds: List[Dict[str, Any]] = []
+        self._updates: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        task["id"] = None
+        task.setdefault("created_at", now_iso())
+        task["updated_at"] = task["created_at"]
+        self._adds.append(task)
+        return task
+
+    def update(self, task_id: int, updates: Dict[str, Any]) -> bool:
+        if task_id not in self._updates and self._get(task_id) is None:
+            return False
+        self._updates.setdefault(task_id, {}).update(updates, updated_at=now_iso())
+        return True
+
+    def __len__(self):
+        return len(self._adds) + len(self._updates)
+
+    def commit(self) -> int:
+        adds, updates = self._adds, self._updates
+        self.rollback()
+        return self._commit(adds, updates) if adds or updates else 0
+
+    def rollback(self):
+        self._adds, self._updates = [], {}
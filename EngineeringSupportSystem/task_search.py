@@ -0,0 +1,125 @@
+# task_search.py
+# Word search over task titles and details.
+#
+# Text is split into lower-case tokens; a part number or ATA reference such as
+# "HYD-204" or "29-10-00" is kept as one token and its pieces ("hyd", "204")
+# are indexed as well. Query syntax:
+#
+#   pump leak           both words (AND)
+#   pump OR valve       either word; "|" works too
+#   hyd*                any word starting with "hyd"
+#   hyd-204 OR 29-10*   AND binds tighter than OR
+#
+# TokenIndex is the inverted index TaskRepository keeps next to its field
+# indexes; matcher() answers the same query for a single task.
+import bisect
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+_WORD = re.compile(r"[^\W_]+(?:[-./][^\W_]+)*")
+_PIECE = re.compile(r"[-./]")
+
+Query = List[List[Tuple[str, bool]]]  # OR of AND-groups of (token, prefix)
+
+def task_text(t: Dict[str, Any]) -> str:
+    return f"{t.get('title') or ''}\n{t.get('details') or ''}"
+
+def tokenize(text: str) -> Iterator[str]:
+    for word in _WORD.findall(text.lower()):
+        yield word
+        if _PIECE.search(word):
+            yield from _PIECE.split(word)
+
+def parse_query(text: str) -> Query:
+    """'pump hyd* OR valve' -> [[("pump", False), ("hyd", True)], [("valve", False)]]"""
+    groups, terms = [], []
+    for word in (text or "").split():
+        if word in ("OR", "|"):
+            groups.append(terms)
+            terms = []
+            continue
+        if word == "AND":
+            continue
+        tokens = _WORD.findall(word.lower())
+        for i, token in enumerate(tokens):
+            terms.append((token, word.endswith("*") and i == len(tokens) - 1))
+    groups.append(terms)
+    return [g for g in groups if g]
+
+def matcher(query: str) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Predicate answering `query` for one task (no index needed); None for an empty query."""
+    groups = parse_query(query)
+    if not groups:
+        return None
+
+    def has(tokens: Set[str], token: str, prefix: bool) -> bool:
+        return token in tokens or (prefix and any(t.startswith(token) for t in tokens))
+
+    def match(t: Dict[str, Any]) -> bool:
+        tokens = set(tokenize(task_text(t)))
+        return any(all(has(tokens, token, prefix) for token, prefix in terms) for terms in groups)
+    return match
+
+class TokenIndex:
+    """token -> ids of the documents containing it, kept up to date with add() / remove()."""
+    def __init__(self):
+        self._postings: Dict[str, Set[Any]] = {}
+        self._tokens: Dict[Any, Tuple[str, ...]] = {}  # doc id -> its tokens, for remove()
+        self._vocab: Optional[List[str]] = None         # sorted tokens for prefix lookups, built on first use
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, doc_id, text: str):
+        """Index `text` under `doc_id`, replacing what was indexed for it before."""
+        self.remove(doc_id)
+        tokens = tuple(set(tokenize(text)))
+        if not tokens:
+            return
+        self._tokens[doc_id] = tokens
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                if self._vocab is not None:
+                    bisect.insort(self._vocab, token)
+            ids.add(doc_id)
+
+    def remove(self, doc_id):
+        for token in self._tokens.pop(doc_id, ()):
+            ids = self._postings[token]
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[token]
+                if self._vocab is not None:
+                    del self._vocab[bisect.bisect_left(self._vocab, token)]
+
+    def lookup(self, token: str, prefix: bool = False) -> Set[Any]:
+        """Ids containing `token` (or a word starting with it). Do not mutate the result."""
+        if not prefix:
+            return self._postings.get(token, set())
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        found: Set[Any] = set()
+        for i in range(bisect.bisect_left(self._vocab, token), len(self._vocab)):
+            if not self._vocab[i].startswith(token):
+                break
+            found |= self._postings[self._vocab[i]]
+        return found
+
+    def search(self, query: str) -> Optional[Set[Any]]:
+        """Ids matching `query`; None when the query has no words (matches everything)."""
+        groups = parse_query(query)
+        if not groups:
+            return None
+        hits: Set[Any] = set()
+        for terms in groups:
+            # rarest word first, so the intersection shrinks as early as possible
+            sets = sorted((self.lookup(token, prefix) for token, prefix in terms), key=len)
+            found = set(sets[0])
+            for ids in sets[1:]:
+                if not found:
+                    break
+                found &= ids
+            hits |= found
+        return hits
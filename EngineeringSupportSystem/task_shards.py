@@ -0,0 +1,263 @@
+# task_shards.py
+# Optional task layout with one file per airbase (ESS_TASK_LAYOUT=sharded):
+#
+#   data/tasks/OOMS.json      tasks of one base
+#   data/tasks/_none.json     tasks without a base
+#   data/tasks/_ids.json      {"next_id": 42}  - global id allocator
+#
+# Reads and writes scoped to a base only ever open that base's shard; so do
+# lookups by id, through an id -> shard map held in memory. The map is built
+# on first use by streaming the shard files (their caches stay cold), kept up
+# to date on add / move / remove, and rebuilt when another process has
+# allocated ids or moved a task since.
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from json_collection import file_signature, write_atomic
+from storage_formats import load_file, save_file
+from task_repository import TaskRepository
+
+NO_BASE = "_none"
+IDS_FILE = "_ids.json"
+
+def shard_name(base_id: Optional[str]) -> str:
+    if not base_id:
+        return NO_BASE
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(base_id))
+
+class ShardedTaskStore:
+    """Same interface as TaskRepository, backed by one TaskRepository per base."""
+    def __init__(self, root, load: Callable = load_file, save: Callable = save_file,
+                 journal_factory: Callable = lambda path: None, stream: Callable = None, debounce: float = 0.0,
+                 max_delay: float = 0.0):
+        self.root = Path(root)
+        self._load = load
+        self._save = save
+        self._stream = stream
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._journal_factory = journal_factory
+        self._lock = threading.RLock()
+        self._repos: Dict[str, TaskRepository] = {}
+        self._where: Optional[Dict[int, str]] = None  # task id -> shard name; None = not built yet
+        self._where_sig = None                        # _ids.json signature the map is in step with
+
+    # ---- shards
+    def _repo(self, name: str) -> TaskRepository:
+        repo = self._repos.get(name)
+        if repo is None:
+            path = self.root / f"{name}.json"
+            repo = self._repos[name] = TaskRepository(path, self._load, self._save,
+                                                     journal=self._journal_factory(path), stream=self._stream,
+                                                     debounce=self._debounce, max_delay=self._max_delay)
+        return repo
+
+    def _all_repos(self) -> List[TaskRepository]:
+        names = set()
+        for p in self.root.glob("*"):
+            for suffix in (".json", ".journal", ".journal.old"):  # a journaled shard may have no snapshot yet
+                if p.name.endswith(suffix) and p.name != IDS_FILE:
+                    names.add(p.name[:-len(suffix)])
+        return [self._repo(n) for n in sorted(names | set(self._repos))]
+
+    def _repos_for(self, base_ids) -> List[TaskRepository]:
+        if not isinstance(base_ids, (set, frozenset, list, tuple)):
+            base_ids = [base_ids]
+        return [self._repo(n) for n in sorted({shard_name(b) for b in base_ids})]
+
+    def _locate(self, task_id: int) -> Optional[TaskRepository]:
+        name = self._id_map().get(task_id)
+        if name is None:
+            if file_signature(self.root / IDS_FILE) == self._where_sig:
+                return None
+            name = self._rebuild_map().get(task_id)  # another process has added tasks since
+        elif self._repo(name).get(task_id) is None:
+            name = self._rebuild_map().get(task_id)  # moved or removed by another process
+        return self._repo(name) if name is not None else None
+
+    # ---- id -> shard map
+    def _id_map(self) -> Dict[int, str]:
+        return self._where if self._where is not None else self._rebuild_map()
+
+    def _rebuild_map(self) -> Dict[int, str]:
+        self._where_sig = file_signature(self.root / IDS_FILE)
+        self._where = {t["id"]: repo.path.stem for repo in self._all_repos() for t in repo.iter()}
+        return self._where
+
+    # ---- id allocator
+    def _write_ids(self, next_id: int):
+        path = self.root / IDS_FILE
+        in_step = file_signature(path) == self._where_sig
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, {"next_id": next_id}, self._save)
+        if in_step:  # our own allocation: the map already knows about it
+            self._where_sig = file_signature(path)
+
+    # ---- TaskRepository interface
+    def invalidate(self):
+        with self._lock:
+            for repo in self._repos.values():
+                repo.invalidate()
+
+    def flush(self):
+        with self._lock:
+            for repo in self._repos.values():
+                repo.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = {"hits": 0, "misses": 0, "writes": 0, "coalesced": 0, "tasks": 0, "shards": len(self._repos)}
+            for repo in self._repos.values():
+                for k, v in repo.stats().items():
+                    out[k] += v
+            return out
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            tasks = [t for repo in self._all_repos() for t in repo.all()]
+        tasks.sort(key=lambda t: t.get("id", 0))
+        return tasks
+
+    def iter(self, predicate: Callable = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """TaskRepository.iter, shard by shard."""
+        if limit is not None and limit <= 0:
+            return
+        with self._lock:
+            repos = self._all_repos()
+        for repo in repos:
+            for t in repo.iter(predicate, limit):
+                yield t
+                if limit is not None:
+                    limit -= 1
+                    if limit == 0:
+                        return
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            repo = self._locate(task_id)
+            return repo.get(task_id) if repo else None
+
+    def get_many(self, task_ids) -> List[Dict[str, Any]]:
+        """The tasks with these ids, in the same order; only the shards holding them are read."""
+        task_ids = list(task_ids)
+        with self._lock:
+            found = self._get_mapped(task_ids, self._id_map())
+            if len(found) < len(task_ids) and (file_signature(self.root / IDS_FILE) != self._where_sig
+                                               or any(tid in self._where for tid in task_ids if tid not in found)):
+                found = self._get_mapped(task_ids, self._rebuild_map())  # the map is behind another process
+        return [found[tid] for tid in task_ids if tid in found]
+
+    def _get_mapped(self, task_ids: List[int], where: Dict[int, str]) -> Dict[int, Dict[str, Any]]:
+        by_shard: Dict[str, List[int]] = {}
+        for tid in task_ids:
+            if tid in where:
+                by_shard.setdefault(where[tid], []).append(tid)
+        return {t["id"]: t for name, ids in by_shard.items() for t in self._repo(name).get_many(ids)}
+
+    def query(self, **where) -> List[Dict[str, Any]]:
+        with self._lock:
+            repos = self._repos_for(where["base_id"]) if "base_id" in where else self._all_repos()
+            tasks = [t for repo in repos for t in repo.query(**where)]
+        if len(repos) > 1:
+            tasks.sort(key=lambda t: t.get("id", 0))
+        return tasks
+
+    def page(self, where: Dict[str, Any] = None, predicate: Callable = None, after: int = None,
+             limit: int = 100, search: str = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """TaskRepository.page over the shards that can hold matches, merged in id order."""
+        where = where or {}
+        with self._lock:
+            repos = self._repos_for(where["base_id"]) if "base_id" in where else self._all_repos()
+            tasks, more = [], False
+            for repo in repos:
+                found, cursor = repo.page(where, predicate, after, limit, search)
+                tasks.extend(found)
+                more = more or cursor is not None
+        if len(repos) > 1:
+            tasks.sort(key=lambda t: t.get("id", 0))
+        if len(tasks) > limit:
+            tasks, more = tasks[:limit], True
+        return tasks, (tasks[-1]["id"] if more and tasks else None)
+
+    def next_id(self) -> int:
+        with self._lock:
+            state = self._load(self.root / IDS_FILE, None)
+            if state:
+                return state["next_id"]
+            return max(self._id_map(), default=0) + 1
+
+    def apply(self, adds: List[Dict[str, Any]], updates: Dict[int, Dict[str, Any]], id_floor: int = 1) -> int:
+        """TaskRepository.apply across shards: one write per touched shard plus one id reservation."""
+        with self._lock:
+            next_free = self.next_id() if adds else None
+            fresh = [t for t in adds if t.get("id") is None]
+            if fresh:
+                first = max(next_free, id_floor)
+                for i, task in enumerate(fresh):
+                    task["id"] = first + i
+
+            shard_adds: Dict[str, List[Dict[str, Any]]] = {}
+            shard_updates: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            for task in adds:
+                shard_adds.setdefault(shard_name(task.get("base_id")), []).append(task)
+            changed = len(adds)
+            for task_id, fields in updates.items():
+                repo = self._locate(task_id)
+                if repo is None:
+                    continue
+                changed += 1
+                target = shard_name(fields.get("base_id", repo.get(task_id).get("base_id")))
+                if target == repo.path.stem:
+                    shard_updates.setdefault(target, {})[task_id] = fields
+                else:
+                    # base changed: move the task to its new shard
+                    moved = dict(repo.remove(task_id))
+                    moved.update(fields)
+                    shard_adds.setdefault(target, []).append(moved)
+            for name in set(shard_adds) | set(shard_updates):
+                self._repo(name).apply(shard_adds.get(name, []), shard_updates.get(name, {}))
+            if shard_adds:
+                where = self._id_map()
+                for name, tasks in shard_adds.items():
+                    for t in tasks:
+                        where[t["id"]] = name
+                top = max(t["id"] for tasks in shard_adds.values() for t in tasks)
+                if adds and top >= next_free:  # moves keep their ids: nothing to reserve
+                    self._write_ids(top + 1)
+            return changed
+
+    def add(self, task: Dict[str, Any], task_id: int = None) -> Dict[str, Any]:
+        task["id"] = task_id
+        self.apply([task], {})
+        return task
+
+    def update(self, task_id: int, updates: Dict[str, Any]) -> bool:
+        return self.apply([], {task_id: updates}) == 1
+
+    def remove(self, task_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            repo = self._locate(task_id)
+            if repo is None:
+                return None
+            self._where.pop(task_id, None)
+            return repo.remove(task_id)
+
+    def replace_all(self, tasks: List[Dict[str, Any]]):
+        with self._lock:
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for t in tasks:
+                groups.setdefault(shard_name(t.get("base_id")), []).append(t)
+            for repo in self._all_repos():
+                groups.setdefault(repo.path.stem, [])
+            for name, group in groups.items():
+                repo = self._repo(name)
+                if repo.all() != group:
+                    repo.replace_all(group)
+            self._where = {t["id"]: name for name, group in groups.items() for t in group}
+            self._where_sig = file_signature(self.root / IDS_FILE)
+            next_id = max((t.get("id", 0) for t in tasks), default=0) + 1
+            state = self._load(self.root / IDS_FILE, None)
+            if not state or state["next_id"] < next_id:
+                self._write_ids(next_id)
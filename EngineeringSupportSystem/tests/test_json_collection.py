@@ -0,0 +1,61 @@
+# tests/test_json_collection.py
+# Write-behind in JsonCollection: a failed edit() must not lose changes that
+# were still waiting for the debounce timer.
+#
+#   python -m pytest -q tests
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from json_collection import JsonCollection  # noqa: E402
+from task_repository import TaskRepository  # noqa: E402
+
+DEBOUNCE = 60.0  # as with ESS_WRITE_DEBOUNCE_MS > 0: nothing is written until flush()
+
+def test_failed_edit_keeps_earlier_pending_changes(tmp_path):
+    path = tmp_path / "training.json"
+    coll = JsonCollection(path, key=None, default=lambda: {"sessions": []}, debounce=DEBOUNCE)
+    with coll.edit() as data:
+        data["sessions"].append({"id": 1, "title": "HF awareness"})
+    assert coll.dirty and not path.exists()  # queued, not written
+
+    with pytest.raises(ValueError):
+        with coll.edit() as data:
+            data["sessions"].append({"id": 2, "title": "half done"})
+            raise ValueError("bad input")
+
+    assert coll.all() == {"sessions": [{"id": 1, "title": "HF awareness"}]}
+    coll.flush()
+    reopened = JsonCollection(path, key=None, default=lambda: {"sessions": []})
+    assert reopened.all() == {"sessions": [{"id": 1, "title": "HF awareness"}]}
+
+def test_failed_edit_without_pending_changes_reloads_the_file(tmp_path):
+    path = tmp_path / "stock.json"
+    coll = JsonCollection(path, key="part_no", debounce=DEBOUNCE)
+    coll.put({"part_no": "P-1", "qty": 1})
+    coll.flush()
+
+    with pytest.raises(ValueError):
+        with coll.edit() as docs:
+            docs.append({"part_no": "P-2", "qty": 2})
+            raise ValueError("bad input")
+    assert [d["part_no"] for d in coll.all()] == ["P-1"]
+    assert coll.get("P-2") is None
+
+def test_failed_apply_keeps_earlier_pending_tasks(tmp_path):
+    path = tmp_path / "tasks.json"
+    repo = TaskRepository(path, debounce=DEBOUNCE)
+    repo.add({"title": "pump", "base_id": "OOMS", "status": "pending"})
+    assert repo.dirty
+
+    with pytest.raises(TypeError):  # an unhashable base_id cannot be indexed
+        repo.apply([{"title": "valve", "base_id": "OERK"}], {1: {"status": "in_progress", "base_id": ["OOMS"]}})
+
+    assert [(t["id"], t["status"], t["base_id"]) for t in repo.all()] == [(1, "pending", "OOMS")]
+    assert repo.query(status="in_progress") == []
+    assert [t["id"] for t in repo.query(base_id="OOMS")] == [1]
+    repo.flush()
+    assert [t["title"] for t in TaskRepository(path).all()] == ["pump"]
@@ -0,0 +1,182 @@
+# tests/test_task_store.py
+# Task store behaviour on a temporary data dir: journal replay and
+# compaction, transactions, shard moves, page cursors and the id floor.
+#
+#   python -m pytest -q tests
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import data_store  # noqa: E402
+from task_journal import TaskJournal  # noqa: E402
+from task_repository import TaskRepository, TaskTransaction  # noqa: E402
+from task_shards import IDS_FILE, ShardedTaskStore  # noqa: E402
+
+def _task(title, base_id="OOMS", tail="A6-ABC", **fields):
+    return dict(title=title, base_id=base_id, aircraft_tail=tail, status="pending", **fields)
+
+def _journaled(path, compact_bytes=1 << 20):
+    return TaskRepository(path, journal=TaskJournal(path, compact_bytes))
+
+def _save_json(path, data):
+    Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+def _wait_compacted(repo, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while repo._compacting and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not repo._compacting
+
+# ---- journal
+def test_journal_replays_changes_without_a_snapshot(tmp_path):
+    path = tmp_path / "tasks.json"
+    repo = _journaled(path)
+    a = repo.add(_task("pump"))
+    b = repo.add(_task("valve"))
+    repo.update(a["id"], {"status": "completed"})
+    repo.remove(b["id"])
+
+    assert not path.exists()
+    assert path.with_suffix(".journal").exists()
+    reopened = _journaled(path)
+    assert [(t["id"], t["status"]) for t in reopened.all()] == [(a["id"], "completed")]
+
+def test_journal_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "tasks.json"
+    repo = _journaled(path)
+    repo.add(_task("pump"))
+    with open(path.with_suffix(".journal"), "a", encoding="utf-8") as f:
+        f.write('{"op": "set", "id": 1, "fie')  # crash mid-append
+
+    assert [t["title"] for t in _journaled(path).all()] == ["pump"]
+
+def test_compaction_writes_the_snapshot_and_drops_the_sealed_log(tmp_path):
+    path = tmp_path / "tasks.json"
+    repo = _journaled(path, compact_bytes=1)  # every write compacts
+    for i in range(5):
+        repo.add(_task(f"task {i}"))
+    repo.update(3, {"assigned_to": "engineer1"})
+    _wait_compacted(repo)
+
+    # the snapshot holds what was sealed; writes made during the compaction stay in the live journal
+    assert not TaskJournal(path, 1).sealed.exists()
+    assert json.loads(path.read_text(encoding="utf-8"))
+    reopened = _journaled(path)
+    assert len(reopened.all()) == 5
+    assert reopened.get(3)["assigned_to"] == "engineer1"
+
+def test_interrupted_compaction_replays_sealed_and_live_journal(tmp_path):
+    path = tmp_path / "tasks.json"
+    repo = _journaled(path)
+    repo.add(_task("pump"))
+    repo.add(_task("valve"))
+    repo._journal.seal()  # crash after step 1: no snapshot was written
+    repo.update(1, {"status": "in_progress"})
+    repo._journal.seal()  # a second seal appends to the leftover sealed log
+    repo.update(2, {"status": "completed"})
+
+    reopened = _journaled(path)
+    assert [t["status"] for t in reopened.all()] == ["in_progress", "completed"]
+    # replaying on top of a snapshot that already holds the changes is harmless
+    reopened._journal.write_snapshot(reopened.copy(), _save_json)
+    path.with_suffix(".journal").write_text(
+        '{"op":"set","id":2,"fields":{"status":"completed"}}\n', encoding="utf-8")
+    assert [t["status"] for t in _journaled(path).all()] == ["in_progress", "completed"]
+
+# ---- transactions
+def test_transaction_commits_as_one_change(tmp_path):
+    repo = TaskRepository(tmp_path / "tasks.json")
+    first = repo.add(_task("pump"))
+    writes = repo.stats()["writes"]
+    tx = TaskTransaction(repo.get, repo.apply)
+    tx.add(_task("valve"))
+    tx.update(first["id"], {"status": "completed"})
+    assert repo.get(2) is None  # nothing stored before commit
+
+    assert tx.commit() == 2
+    assert repo.stats()["writes"] == writes + 1
+    assert repo.get(2)["title"] == "valve"
+    assert repo.get(first["id"])["status"] == "completed"
+
+def test_transaction_rollback_stores_nothing(tmp_path):
+    repo = TaskRepository(tmp_path / "tasks.json")
+    repo.add(_task("pump"))
+    tx = TaskTransaction(repo.get, repo.apply)
+    tx.add(_task("valve"))
+    tx.update(1, {"status": "completed"})
+    assert not tx.update(99, {"status": "completed"})  # unknown ids are refused
+    tx.rollback()
+
+    assert len(tx) == 0
+    assert tx.commit() == 0
+    assert [(t["id"], t["status"]) for t in TaskRepository(tmp_path / "tasks.json").all()] == [(1, "pending")]
+
+def test_task_transaction_drops_the_batch_on_error(tmp_path, monkeypatch):
+    repo = _journaled(tmp_path / "tasks.json")
+    repo.add(_task("pump"))
+    monkeypatch.setattr(data_store, "_tasks", repo)
+    monkeypatch.setattr(data_store, "next_id_floor", lambda: 1)
+
+    with pytest.raises(RuntimeError):
+        with data_store.task_transaction() as tx:
+            tx.add(_task("valve"))
+            tx.update(1, {"status": "completed"})
+            raise RuntimeError("validation failed")
+
+    reopened = _journaled(tmp_path / "tasks.json")
+    assert [(t["id"], t["status"]) for t in reopened.all()] == [(1, "pending")]
+
+# ---- ids, pages and shards
+def test_new_ids_start_at_the_archive_floor(tmp_path):
+    repo = TaskRepository(tmp_path / "tasks.json")
+    repo.add(_task("pump"))
+    repo.apply([_task("valve"), _task("seal")], {}, id_floor=100)
+    repo.apply([_task("filter")], {}, id_floor=50)
+
+    assert [t["id"] for t in repo.all()] == [1, 100, 101, 102]
+
+def test_page_cursor_walks_every_match_once(tmp_path):
+    repo = TaskRepository(tmp_path / "tasks.json")
+    repo.apply([_task(f"task {i}", tail="A6-ABC" if i % 3 else "HZ-GHI") for i in range(50)], {})
+    wanted = [t["id"] for t in repo.all() if t["aircraft_tail"] == "A6-ABC"]
+
+    seen, cursor = [], None
+    while True:
+        found, cursor = repo.page({"aircraft_tail": "A6-ABC"}, after=cursor, limit=7)
+        seen.extend(t["id"] for t in found)
+        if cursor is None:
+            break
+    assert seen == wanted
+
+def test_shard_move_follows_the_base(tmp_path):
+    root = tmp_path / "tasks"
+    store = ShardedTaskStore(root)
+    store.apply([_task("pump", "OOMS"), _task("valve", "OERK"), _task("seal", None)], {})
+    assert sorted(p.name for p in root.glob("*.json")) == ["OERK.json", "OOMS.json", IDS_FILE, "_none.json"]
+
+    store.update(1, {"base_id": "OERK"})
+    assert [t["id"] for t in store.query(base_id="OERK")] == [1, 2]
+    assert store.query(base_id="OOMS") == []
+
+    reopened = ShardedTaskStore(root)
+    assert reopened.get(1)["base_id"] == "OERK"
+    # the id map is built by streaming the shards: only the one holding the task is cached
+    assert [name for name, repo in reopened._repos.items() if repo._current()] == ["OERK"]
+    assert json.loads((root / IDS_FILE).read_text()) == {"next_id": 4}
+    assert reopened.next_id() == 4
+
+def test_shard_lookups_see_tasks_added_by_another_store(tmp_path):
+    root = tmp_path / "tasks"
+    mine, other = ShardedTaskStore(root), ShardedTaskStore(root)
+    mine.add(_task("pump", "OOMS"))
+    assert mine.get(2) is None  # builds the map
+
+    added = other.add(_task("valve", "OERK"))
+    other.update(1, {"base_id": "OERK"})
+    assert mine.get(added["id"])["title"] == "valve"
+    assert mine.get(1)["base_id"] == "OERK"
@@ -0,0 +1,6 @@
+# timestamps.py
+from datetime import datetime, timezone
+
+def now_iso() -> str:
+    """UTC timestamp stored in created_at / updated_at and on ledger records."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -1,22 +1,83 @@
 # training_store.py
-import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional, Tuple
+import config
+from json_collection import JsonCollection
 
 DATA_DIR = Path(__file__).parent / "data"
 TRAINING_FILE = DATA_DIR / "training.json"
 
-def _load_json(path, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return default
+class _TrainingData(JsonCollection):
+    """
+    training.json with indexes: sessions by id, assignments by (user, session_id),
+    by user and by session. Writes update the indexes in place and cost one
+    file write per call, however many assignments they touch.
+    """
+    def __init__(self, path, debounce: float = 0.0, max_delay: float = 0.0):
+        self.session_by_id: Dict[int, Dict[str, Any]] = {}
+        self.assignment: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.by_user: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.by_session: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        super().__init__(path, key=None, default=lambda: {"sessions": [], "assignments": []},
+                         debounce=debounce, max_delay=max_delay, topic="training")
+
+    def _reindex(self):
+        self._docs.setdefault("sessions", [])
+        self._docs.setdefault("assignments", [])
+        self.session_by_id = {s.get("id"): s for s in self._docs["sessions"]}
+        self.assignment, self.by_user, self.by_session = {}, {}, {}
+        for a in self._docs["assignments"]:
+            self._index_assignment(a)
+
+    def _index_assignment(self, a):
+        self.assignment[(a["user"], a["session_id"])] = a
+        self.by_user.setdefault(a["user"], {})[a["session_id"]] = a
+        self.by_session.setdefault(a["session_id"], {})[a["user"]] = a
 
-def _save_json(path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    def add_session(self, title: str, date_iso: str) -> Dict[str, Any]:
+        with self._lock:
+            self._fresh()
+            session = {"id": max(self.session_by_id, default=0) + 1, "title": title, "date": date_iso}
+            self._docs["sessions"].append(session)
+            self.session_by_id[session["id"]] = session
+            self._changed()
+            self._emit(added=[session["id"]])
+            return session
+
+    def enroll(self, users: Iterable[str], session_id: int) -> int:
+        with self._lock:
+            self._fresh()
+            if session_id not in self.session_by_id:
+                return 0
+            added = []
+            for user in dict.fromkeys(users):
+                if (user, session_id) in self.assignment:
+                    continue
+                a = {"user": user, "session_id": session_id, "status": "scheduled"}
+                self._docs["assignments"].append(a)
+                self._index_assignment(a)
+                added.append((user, session_id))
+            if added:
+                self._changed()
+                self._emit(added=added)
+            return len(added)
+
+    def set_status(self, pairs: Iterable[Tuple[str, int]], status: str) -> int:
+        with self._lock:
+            self._fresh()
+            updated = []
+            for key in pairs:
+                a = self.assignment.get(tuple(key))
+                if a is not None:
+                    a["status"] = status
+                    updated.append(tuple(key))
+            if updated:
+                self._changed()
+                self._emit(updated=updated)
+            return len(updated)
+
+_training = _TrainingData(TRAINING_FILE, debounce=config.WRITE_DEBOUNCE_MS / 1000,
+                          max_delay=config.WRITE_MAX_DELAY_MS / 1000)
 
 def load_training() -> Dict[str, Any]:
     """
@@ -25,34 +86,61 @@ def load_training() -> Dict[str, Any]:
       "assignments": [{"user":"engineer1","session_id":1,"status":"scheduled|completed"}]
     }
     """
-    return _load_json(TRAINING_FILE, {"sessions": [], "assignments": []})
+    return _training.copy()
 
 def save_training(data: Dict[str, Any]):
-    _save_json(TRAINING_FILE, data)
+    _training.replace_all(data)
 
 def next_session_id(data: Dict[str, Any]) -> int:
     return (max((s.get("id", 0) for s in data.get("sessions", [])), default=0) + 1)
 
+# the index reads hold the collection lock: the UI calls these from worker threads
+
+def get_session(session_id: int) -> Optional[Dict[str, Any]]:
+    with _training._lock:
+        _training.refresh()
+        s = _training.session_by_id.get(session_id)
+        return dict(s) if s is not None else None
+
+def assignments_for_user(user: str) -> List[Dict[str, Any]]:
+    with _training._lock:
+        _training.refresh()
+        return [dict(a) for a in _training.by_user.get(user, {}).values()]
+
+def assignments_for_session(session_id: int) -> List[Dict[str, Any]]:
+    with _training._lock:
+        _training.refresh()
+        return [dict(a) for a in _training.by_session.get(session_id, {}).values()]
+
+def session_count() -> int:
+    with _training._lock:
+        _training.refresh()
+        return len(_training.session_by_id)
+
 def add_session(title: str, date_iso: str) -> Dict[str, Any]:
-    data = load_training()
-    sid = next_session_id(data)
-    data["sessions"].append({"id": sid, "title": title, "date": date_iso})
-    save_training(data)
-    return {"id": sid, "title": title, "date": date_iso}
+    return dict(_training.add_session(title, date_iso))
 
 def assign_user(user: str, session_id: int) -> bool:
-    data = load_training()
-    if not any(s["id"] == session_id for s in data["sessions"]):
+    if get_session(session_id) is None:
         return False
-    if any(a["user"] == user and a["session_id"] == session_id for a in data["assignments"]):
-        return True
-    data["assignments"].append({"user": user, "session_id": session_id, "status": "scheduled"})
-    save_training(data); return True
+    _training.enroll([user], session_id)
+    return True
+
+def assign_users(users: Iterable[str], session_id: int) -> int:
+    """Enroll many users with one write. Returns how many were newly enrolled (0 if the session does not exist)."""
+    return _training.enroll(users, session_id)
 
 def set_assignment_status(user: str, session_id: int, status: str) -> bool:
-    data = load_training()
-    for a in data["assignments"]:
-        if a["user"] == user and a["session_id"] == session_id:
-            a["status"] = status
-            save_training(data); return True
-    return False
+    return _training.set_status([(user, session_id)], status) == 1
+
+def set_assignment_statuses(pairs: Iterable[Tuple[str, int]], status: str) -> int:
+    """Set `status` on every (user, session_id) assignment with one write. Returns how many exist."""
+    return _training.set_status(pairs, status)
+
+# ---- SQLite backend (ESS_STORAGE_BACKEND=sqlite) ----
+if config.STORAGE_BACKEND == "sqlite":
+    from sqlite_store import (  # noqa: F811
+        load_training, save_training, next_session_id, add_session,
+        assign_user, set_assignment_status, get_session, assignments_for_user,
+        assignments_for_session, assign_users, set_assignment_statuses, session_count,
+    )
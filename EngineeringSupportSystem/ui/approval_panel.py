@@ -1,6 +1,10 @@
 # ui/approval_panel.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton, QHBoxLayout, QMessageBox
-from data_store import load_tasks, save_tasks
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QMessageBox
+from PyQt5.QtCore import Qt
+from data_store import get_tasks, query_tasks, update_task
+from ui.async_store import StoreRequests
+from ui.store_bridge import ListPatcher, bridge, sync_list
+from ui.widgets.busy_indicator import BusyIndicator
 
 APPROVABLE_STATES = {"completed", "in_review"}
 
@@ -9,6 +13,7 @@ class ApprovalPanel(QWidget):
         super().__init__()
         self.list = QListWidget()
         self.info = QLabel("Completed / In-Review Tasks")
+        self.busy = BusyIndicator()
         self.btn_refresh = QPushButton("Refresh")
         self.btn_approve = QPushButton("Approve")
         self.btn_reject = QPushButton("Reject")
@@ -24,29 +29,57 @@ class ApprovalPanel(QWidget):
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.info)
+        layout.addWidget(self.busy)
         layout.addWidget(self.list)
         layout.addLayout(bar)
 
+        self._rows = {}  # task id -> QListWidgetItem
+        self._stale = False  # tasks changed while the panel was hidden
+        self._io = StoreRequests(self)
+        self._io.busyChanged.connect(self.busy.setBusy)
+        self._patcher = ListPatcher(self._io, self.list, self._rows, get_tasks,
+                                    lambda t: t.get("status") in APPROVABLE_STATES, self._render)
         self.refresh()
+        bridge().changed.connect(self._on_store_changed)
+
+    @staticmethod
+    def _render(item: QListWidgetItem, t: dict):
+        item.setText(f"#{t['id']} | {t['title']} | {t['status']} | {t.get('assigned_to') or 'Unassigned'}")
 
     def refresh(self):
-        self.list.clear()
-        for t in load_tasks():
-            if t.get("status") in APPROVABLE_STATES:
-                self.list.addItem(f"#{t['id']} | {t['title']} | {t['status']} | {t.get('assigned_to') or 'Unassigned'}")
+        self._patcher.cancel()  # the reload brings those rows too
+        self._io.load("list", query_tasks, status=APPROVABLE_STATES, done=self._fill)
+
+    def _fill(self, tasks):
+        sync_list(self.list, self._rows, tasks, self._render)
+
+    def activate(self):
+        """Shown again (see PanelPool): catch up on changes made while hidden."""
+        if self._stale:
+            self._stale = False
+            self.refresh()  # keyed diff: only the rows that changed are touched
+
+    def _on_store_changed(self, topic, change):
+        if topic != "tasks":
+            return
+        if not self.isVisible():
+            self._stale = True
+            return
+        if change.reset or self._io.pending("list"):
+            self.refresh()
+            return
+        self._patcher.apply(change)
 
     def _set_status(self, status: str):
         item = self.list.currentItem()
         if not item:
             QMessageBox.warning(self, "Select", "Select a task.")
             return
-        tid = int(item.text().split("|")[0].strip().lstrip("#"))
-        tasks = load_tasks()
-        for t in tasks:
-            if t["id"] == tid:
-                t["status"] = status
-                save_tasks(tasks)
-                QMessageBox.information(self, "Updated", f"Task #{tid} → {status}")
-                self.refresh()
-                return
+        tid = item.data(Qt.UserRole)
+        self._io.save(update_task, tid, {"status": status}, done=lambda ok: self._saved(tid, status, ok))
+
+    def _saved(self, tid: int, status: str, ok: bool):
+        if ok:
+            QMessageBox.information(self, "Updated", f"Task #{tid} → {status}")
+            return
         QMessageBox.warning(self, "Not Found", "Task not found.")
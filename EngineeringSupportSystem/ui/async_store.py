@@ -0,0 +1,147 @@
+# ui/async_store.py
+# Runs store calls on worker threads so the GUI thread never waits on disk.
+#
+#   self._io = StoreRequests(self)
+#   self._io.busyChanged.connect(self.busy.setBusy)
+#   self._io.load("list", query_tasks, base_id=b, done=self._fill)
+#   self._io.save(update_task, tid, {"status": "approved"}, done=self._saved)
+#
+# load() requests are keyed by a channel: starting a new one cancels the
+# previous request on that channel (it is skipped if it has not started, and
+# its result is dropped if it has), so a panel only ever sees the answer to
+# its latest question. save() requests are never cancelled and run one at a
+# time in submission order on a single shared writer thread.
+#
+# done(result) / failed(exc) are called on the GUI thread.
+import sys
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from json_collection import flush_all
+
+_writer = None
+
+def _write_pool() -> QThreadPool:
+    global _writer
+    if _writer is None:
+        _writer = QThreadPool()
+        _writer.setMaxThreadCount(1)
+    return _writer
+
+def wait_for_writes(msecs: int = -1) -> bool:
+    """Block until queued save() requests have run (used at shutdown)."""
+    return _writer.waitForDone(msecs) if _writer is not None else True
+
+def flush_stores():
+    """Run queued saves, then write every store change still held back by write-behind."""
+    wait_for_writes()
+    flush_all()
+
+class _Signals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+class _Job(QRunnable):
+    def __init__(self, ticket: int, signals: _Signals, fn: Callable, args, kwargs):
+        super().__init__()
+        self.ticket = ticket
+        self.signals = signals
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.cancelled = threading.Event()
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                self.signals.failed.emit(self.ticket, e)
+                return
+            self.signals.finished.emit(self.ticket, result)
+        except RuntimeError:
+            pass  # the requesting widget was deleted while we worked
+
+class _Pending:
+    __slots__ = ("channel", "job", "done", "failed")
+
+    def __init__(self, channel, job, done, failed):
+        self.channel, self.job, self.done, self.failed = channel, job, done, failed
+
+class StoreRequests(QObject):
+    """Per-panel request queue; create with the panel as parent."""
+    busyChanged = pyqtSignal(bool)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._pending: Dict[int, _Pending] = {}
+        self._latest: Dict[str, int] = {}   # channel -> ticket
+        self._next = 0
+        self.busy = False
+
+    def _update_busy(self):
+        if self.busy != bool(self._pending):
+            self.busy = not self.busy
+            self.busyChanged.emit(self.busy)
+
+    def pending(self, channel: str) -> bool:
+        return channel in self._latest
+
+    def load(self, channel: str, fn: Callable, *args, done: Callable = None,
+             failed: Callable = None, **kwargs) -> int:
+        """Run fn(*args, **kwargs) on the shared pool, replacing any request on `channel`."""
+        self._drop(channel)
+        ticket = self._submit(channel, fn, args, kwargs, done, failed, QThreadPool.globalInstance())
+        self._latest[channel] = ticket
+        return ticket
+
+    def save(self, fn: Callable, *args, done: Callable = None, failed: Callable = None, **kwargs) -> int:
+        """Run fn(*args, **kwargs) on the writer thread, after every earlier save."""
+        return self._submit(None, fn, args, kwargs, done, failed, _write_pool())
+
+    def cancel(self, channel: Optional[str] = None):
+        """Cancel the load on `channel`, or every load when channel is None."""
+        for ch in (list(self._latest) if channel is None else [channel]):
+            self._drop(ch)
+        self._update_busy()
+
+    def _drop(self, channel: str):
+        p = self._pending.pop(self._latest.pop(channel, None), None)
+        if p is not None:
+            p.job.cancelled.set()
+
+    def _submit(self, channel, fn, args, kwargs, done, failed, pool: QThreadPool) -> int:
+        self._next += 1
+        job = _Job(self._next, self._signals, fn, args, kwargs)
+        self._pending[self._next] = _Pending(channel, job, done, failed)
+        self._update_busy()
+        pool.start(job)
+        return self._next
+
+    def _take(self, ticket: int) -> Optional[_Pending]:
+        p = self._pending.pop(ticket, None)
+        if p is None:
+            return None  # cancelled: a newer request owns the channel
+        if p.channel is not None and self._latest.get(p.channel) == ticket:
+            del self._latest[p.channel]
+        self._update_busy()
+        return p
+
+    def _on_finished(self, ticket: int, result: Any):
+        p = self._take(ticket)
+        if p is not None and p.done is not None:
+            p.done(result)
+
+    def _on_failed(self, ticket: int, exc: Exception):
+        p = self._take(ticket)
+        if p is None:
+            return
+        if p.failed is None:
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+            return
+        p.failed(exc)
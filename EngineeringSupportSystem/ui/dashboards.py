@@ -1,23 +1,22 @@
 # ui/dashboards.py
+import importlib
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QMessageBox, QToolBar, QAction,
     QHBoxLayout, QPushButton, QScrollArea, QSizePolicy
 )
-from PyQt5.QtGui import QIcon, QPixmap, QPalette, QBrush
+from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt
 
 # App modules
+import config
 from roles import ROLE_ACTIONS, ROLE_PERMS
 from ui.labels import ROLE_DISPLAY, ACTION_LABELS
 from ui.widgets.task_list_panel import TaskListPanel
-from ui.task_editor import TaskEditorDialog
-from ui.manage_users import ManageUsersDialog
-from ui.approval_panel import ApprovalPanel
-from ui.inventory_panel import InventoryPanel
-from ui.training_panel import TrainingPanel
-from ui.assign_task import AssignTaskDialog
 from ui.summary_cards import SummaryCards
+from ui.widgets.panel_pool import PanelPool
 from ui.theme import icon_path, ASSETS
+from ui.async_store import flush_stores
+from ui.wallpaper import Wallpaper
 from base_store import load_bases, aircraft_by_base, base_name
 
 # Map actions to toolbar icon filenames (created by generate_assets.py)
@@ -40,6 +39,36 @@ ICON_MAP = {
     "logout": "logout.png",
 }
 
+# Action key -> (handler method, "module:Class" the action opens, permission needed).
+# The module is imported the first time the action runs, so a dashboard only
+# loads the panels and dialogs behind the actions its role actually uses.
+ACTION_REGISTRY = {
+    "view_all_tasks":           ("_show_task_view", None, None),
+    "view_my_tasks":            ("_show_task_view", None, None),
+    "repair_requests":          ("_show_task_view", None, None),
+    "assign_task":              ("_show_assignable", None, "can_assign"),
+    "create_task":              ("_open_task_editor", "ui.task_editor:TaskEditorDialog", "can_create_task"),
+    "manage_users":             ("_open_user_admin", "ui.manage_users:ManageUsersDialog", "can_manage_users"),
+    "approve_reject":           ("_open_approvals", "ui.approval_panel:ApprovalPanel", None),
+    "approve_reject_completed": ("_open_approvals", "ui.approval_panel:ApprovalPanel", None),
+    "qc_approve":               ("_open_approvals", "ui.approval_panel:ApprovalPanel", None),
+    "stock_levels":             ("_open_inventory", "ui.inventory_panel:InventoryPanel", None),
+    "reorder_parts":            ("_open_inventory", "ui.inventory_panel:InventoryPanel", None),
+    "training_schedule":        ("_open_training", "ui.training_panel:TrainingPanel", None),
+    "cert_tracking":            ("_open_training", "ui.training_panel:TrainingPanel", None),
+}
+
+DENIED = {
+    "can_assign": "You cannot assign work orders.",
+    "can_create_task": "You cannot create work orders.",
+    "can_manage_users": "You cannot manage users.",
+}
+
+def load_target(spec: str):
+    """Import "module:Class" and return the class."""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
 # ---------- Inline Airbase → Aircraft selector ----------
 class BaseAircraftSelector(QWidget):
     """
@@ -199,7 +228,11 @@ class DashboardWindow(QMainWindow):
             "can_mark_complete": bool(self._perms.get("can_mark_complete", True)),
         })
         self.panel.set_assign_dialog_opener(self._open_assign_dialog)
-        self._layout.addWidget(self.panel)
+
+        # --- Body: the task panel, or a kept Approval/Inventory/Training panel
+        self.body = PanelPool(keep=config.PANEL_POOL_SIZE)
+        self.body.add_pinned(self.panel)
+        self._layout.addWidget(self.body)
 
     # -------------------------
     # Background wallpaper (role-based)
@@ -208,19 +241,12 @@ class DashboardWindow(QMainWindow):
         wp_role = ASSETS / "wallpapers" / f"{self.role}.jpg"
         wp_default = ASSETS / "aircraft.jpg"
         path = wp_role if wp_role.exists() else wp_default
-        self._bg_pix = QPixmap(str(path)) if path.exists() else None
-        self._apply_bg()
-
-    def _apply_bg(self):
-        if getattr(self, "_bg_pix", None):
-            scaled = self._bg_pix.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            pal = self.palette()
-            pal.setBrush(self.backgroundRole(), QBrush(scaled))
-            self.setPalette(pal)
+        # the decoded image is shared by every dashboard of this role; rescaling follows resizes
+        self._bg = Wallpaper(self, path)
 
-    def resizeEvent(self, e):
-        super().resizeEvent(e)
-        self._apply_bg()
+    def closeEvent(self, e):
+        flush_stores()
+        super().closeEvent(e)
 
     # -------------------------
     # Toolbar
@@ -257,70 +283,57 @@ class DashboardWindow(QMainWindow):
         if not self._perms.get("can_assign"):
             QMessageBox.warning(self, "Not Allowed", "You cannot assign work orders.")
             return
-        dlg = AssignTaskDialog(task_id=task_id, current_assignee=current_assignee, parent=self)
-        if dlg.exec_():
-            self.panel.show_tasks(self.panel._last_mode, self.panel._last_user, self.panel._last_role, self.context)
+        # the task list and cards pick up the change through the store bridge
+        load_target("ui.assign_task:AssignTaskDialog")(task_id=task_id, current_assignee=current_assignee, parent=self).exec_()
 
     # -------------------------
     # Action handler
     # -------------------------
     def handle_action(self, action_key: str):
-        # Task views
-        if action_key in ("view_my_tasks", "repair_requests", "view_all_tasks"):
-            self.panel.show_tasks(mode=action_key, current_user=self.username, role=self.role, context=self.context)
+        entry = ACTION_REGISTRY.get(action_key)
+        if entry is None:
+            QMessageBox.information(self, "Action", f"Action '{action_key}' clicked.")
             return
-
-        # Create Work Order
-        if action_key == "create_task":
-            if not self._perms.get("can_create_task"):
-                QMessageBox.warning(self, "Not Allowed", "You cannot create work orders.")
-                return
-            dlg = TaskEditorDialog(self, context=self.context)
-            if dlg.exec_():
-                self.panel.show_tasks(self.panel._last_mode, self.panel._last_user, self.panel._last_role, self.context)
+        handler, target, perm = entry
+        if perm and not self._perms.get(perm):
+            QMessageBox.warning(self, "Not Allowed", DENIED[perm])
             return
+        getattr(self, handler)(action_key, load_target(target) if target else None)
 
-        # Assign
-        if action_key == "assign_task":
-            if not self._perms.get("can_assign"):
-                QMessageBox.warning(self, "Not Allowed", "You cannot assign work orders.")
-                return
-            mode = "view_all_tasks" if self.role in ("admin", "manager", "planner", "scheduler", "flightops", "helpdesk") else "view_my_tasks"
-            self.panel.show_tasks(mode=mode, current_user=self.username, role=self.role, context=self.context)
-            return
+    # Task views
+    def _show_task_view(self, action_key, _):
+        self.body.show_panel(TaskListPanel)
+        self.panel.show_tasks(mode=action_key, current_user=self.username, role=self.role, context=self.context)
 
-        # Manage Users
-        if action_key == "manage_users":
-            if not self._perms.get("can_manage_users"):
-                QMessageBox.warning(self, "Not Allowed", "You cannot manage users.")
-                return
-            ManageUsersDialog(self).exec_()
-            return
+    # Assign: show the tasks this role may assign
+    def _show_assignable(self, action_key, _):
+        mode = "view_all_tasks" if self.role in ("admin", "manager", "planner", "scheduler", "flightops", "helpdesk") else "view_my_tasks"
+        self.body.show_panel(TaskListPanel)
+        self.panel.show_tasks(mode=mode, current_user=self.username, role=self.role, context=self.context)
 
-        # Approvals
-        if action_key in ("approve_reject", "approve_reject_completed", "qc_approve"):
-            self._swap_body(ApprovalPanel())
-            return
+    # Create Work Order
+    def _open_task_editor(self, action_key, dialog_cls):
+        dialog_cls(self, context=self.context).exec_()
 
-        # Inventory
-        if action_key in ("stock_levels", "reorder_parts"):
-            self._swap_body(InventoryPanel())
-            return
+    # Manage Users
+    def _open_user_admin(self, action_key, dialog_cls):
+        dialog_cls(self).exec_()
 
-        # Training
-        if action_key in ("training_schedule", "cert_tracking"):
-            self._swap_body(TrainingPanel(current_user=self.username, role=self.role))
-            return
+    # Approvals
+    def _open_approvals(self, action_key, panel_cls):
+        self._show_body(panel_cls)
+
+    # Inventory
+    def _open_inventory(self, action_key, panel_cls):
+        self._show_body(panel_cls, current_user=self.username)
 
-        QMessageBox.information(self, "Action", f"Action '{action_key}' clicked.")
+    # Training
+    def _open_training(self, action_key, panel_cls):
+        self._show_body(panel_cls, current_user=self.username, role=self.role)
 
     # -------------------------
-    # Body swap helper (used for Approval/Inventory/Training panels)
+    # Body helper (used for Approval/Inventory/Training panels)
     # -------------------------
-    def _swap_body(self, widget: QWidget):
-        # Remove current body (the last widget in layout)
-        if self._layout.count() > 4:  # title, chip, cards, selector, body
-            old = self._layout.itemAt(self._layout.count() - 1).widget()
-            if old is not None:
-                old.setParent(None)
-        self._layout.addWidget(widget)
+    def _show_body(self, panel_cls, **kwargs) -> QWidget:
+        # one kept instance per panel type; built on first use
+        return self.body.show_panel(panel_cls, lambda: panel_cls(**kwargs))
@@ -1,10 +1,15 @@
 # ui/inventory_panel.py
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QLineEdit, QPushButton, QMessageBox
-from inventory_store import load_stock, save_stock, upsert_item, adjust_qty, delete_item, low_stock
+from PyQt5.QtCore import Qt
+from inventory_store import load_stock, get_items, upsert_item, adjust_qty, delete_item, low_stock
+from ui.async_store import StoreRequests
+from ui.store_bridge import ListPatcher, bridge, sync_list
+from ui.widgets.busy_indicator import BusyIndicator
 
 class InventoryPanel(QWidget):
-    def __init__(self):
+    def __init__(self, current_user: str = None):
         super().__init__()
+        self.current_user = current_user
         self.list = QListWidget()
         self.low_label = QLabel("")
         self.part_no = QLineEdit(); self.part_no.setPlaceholderText("Part No.")
@@ -36,52 +41,99 @@ class InventoryPanel(QWidget):
 
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Inventory"))
+        self.busy = BusyIndicator()
+        layout.addWidget(self.busy)
         layout.addWidget(self.list)
         layout.addLayout(top)
         layout.addLayout(bar)
         layout.addWidget(self.low_label)
 
+        self._rows = {}  # part_no -> QListWidgetItem
+        self._stale = False  # stock changed while the panel was hidden
+        self._low = set()    # part_nos below min_qty, kept current from bridge().lowStock
+        self._io = StoreRequests(self)
+        self._io.busyChanged.connect(self.busy.setBusy)
+        self._patcher = ListPatcher(self._io, self.list, self._rows, get_items, lambda it: True,
+                                    lambda item, it: item.setText(self._row_text(it)), key="part_no",
+                                    ordered=False)
         self.refresh()
+        bridge().changed.connect(self._on_store_changed)
+        bridge().lowStock.connect(self._on_low_stock)
+
+    @staticmethod
+    def _row_text(it) -> str:
+        flag = "⚠️" if it.get("qty", 0) < it.get("min_qty", 0) else ""
+        return f"{it['part_no']} | {it['name']} | qty={it['qty']} | min={it['min_qty']} {flag}"
 
     def refresh(self):
-        self.list.clear()
-        for it in load_stock():
-            flag = "⚠️" if it.get("qty", 0) < it.get("min_qty", 0) else ""
-            self.list.addItem(f"{it['part_no']} | {it['name']} | qty={it['qty']} | min={it['min_qty']} {flag}")
-        lows = low_stock()
-        self.low_label.setText(f"Low stock: {len(lows)} item(s)")
+        self._patcher.cancel()  # the reload brings those rows too
+        self._io.load("list", load_stock, done=self._fill)
+        self._update_low_label()
+
+    def _fill(self, items):
+        sync_list(self.list, self._rows, items, lambda item, it: item.setText(self._row_text(it)), key="part_no")
+
+    def activate(self):
+        """Shown again (see PanelPool): catch up on changes made while hidden."""
+        if self._stale:
+            self._stale = False
+            self.refresh()
+
+    def _update_low_label(self):
+        self._io.load("low", lambda: {it["part_no"] for it in low_stock()}, done=self._show_low)
+
+    def _show_low(self, parts):
+        self._low = parts
+        self.low_label.setText(f"Low stock: {len(parts)} item(s)")
+
+    def _on_low_stock(self, part_no, below, item):
+        if self._io.pending("low"):
+            self._update_low_label()  # the load in flight may have read the store before this
+            return
+        self._show_low(self._low | {part_no} if below else self._low - {part_no})
+
+    def _on_store_changed(self, topic, change):
+        if topic != "stock":
+            return
+        if not self.isVisible():
+            self._stale = True
+            return
+        if change.reset or self._io.pending("list"):
+            self.refresh()
+            return
+        self._patcher.apply(change)
 
     def _add_update(self):
         try:
-            upsert_item(
-                self.part_no.text().strip(),
-                self.name.text().strip(),
-                int(self.qty.text() or 0),
-                int(self.min_qty.text() or 0),
-            )
-            QMessageBox.information(self, "Saved", "Item saved.")
-            self.refresh()
+            qty, min_qty = int(self.qty.text() or 0), int(self.min_qty.text() or 0)
         except ValueError:
             QMessageBox.warning(self, "Error", "Qty and Min Qty must be numbers.")
+            return
+        self._io.save(upsert_item, self.part_no.text().strip(), self.name.text().strip(), qty, min_qty,
+                      user=self.current_user,
+                      done=lambda _: QMessageBox.information(self, "Saved", "Item saved."))
 
     def _selected_part(self):
         item = self.list.currentItem()
         if not item: return None
-        return item.text().split("|")[0].strip()
+        return item.data(Qt.UserRole)
 
     def _delete(self):
         p = self._selected_part()
         if not p: QMessageBox.warning(self, "Select", "Select an item."); return
-        if delete_item(p):
+        self._io.save(delete_item, p, done=lambda ok: self._deleted(p, ok))
+
+    def _deleted(self, p: str, ok: bool):
+        if ok:
             QMessageBox.information(self, "Deleted", f"{p} removed.")
-            self.refresh()
         else:
             QMessageBox.warning(self, "Error", "Could not delete.")
 
     def _adjust(self, d: int):
         p = self._selected_part()
         if not p: QMessageBox.warning(self, "Select", "Select an item."); return
-        if adjust_qty(p, d):
-            self.refresh()
-        else:
+        self._io.save(adjust_qty, p, d, reason="manual", user=self.current_user, done=self._adjusted)
+
+    def _adjusted(self, ok: bool):
+        if not ok:
             QMessageBox.warning(self, "Error", "Item not found.")
@@ -1,41 +1,30 @@
 # ui/login_window.py (drop-in replacement)
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox, QFrame
-from PyQt5.QtGui import QFont, QPixmap, QPalette, QBrush
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect
 from pathlib import Path
 from auth import authenticate
-from ui.dashboards import DashboardWindow
+from ui.async_store import flush_stores
 from ui.context_selector import ContextSelector
 from ui.theme import ASSETS
+from ui.wallpaper import Wallpaper
 
 class LoginWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Aircraft Maintenance System - Login")
         self.resize(900, 600)
-        self._pixmap = None
         self._init_bg()
         self._init_ui()
 
     # Wallpaper that scales (no CSS background-size errors)
     def _init_bg(self):
-        img = ASSETS / "aircraft.jpg"
-        if img.exists():
-            self._pixmap = QPixmap(str(img))
-            self.setAutoFillBackground(True)
-            self._apply_bg()
+        self._bg = Wallpaper(self, ASSETS / "aircraft.jpg")  # follows resizes by itself
 
-    def _apply_bg(self):
-        if self._pixmap:
-            scaled = self._pixmap.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            pal = self.palette()
-            pal.setBrush(self.backgroundRole(), QBrush(scaled))
-            self.setPalette(pal)
-
-    def resizeEvent(self, e):
-        super().resizeEvent(e)
-        self._apply_bg()
+    def closeEvent(self, e):
+        flush_stores()  # e.g. the password rehash done at login
+        super().closeEvent(e)
 
     def _init_ui(self):
         # Center glass card
@@ -94,6 +83,7 @@ class LoginWindow(QWidget):
         if not dlg.exec_():
             return
         ctx = dlg.selected_context()
+        from ui.dashboards import DashboardWindow  # loaded at first sign-in, not at startup
         self.dashboard = DashboardWindow(username=u, role=role, context=ctx)
         self.dashboard.show()
         self.close()
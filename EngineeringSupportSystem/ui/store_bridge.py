@@ -0,0 +1,149 @@
+# ui/store_bridge.py
+# Delivers store_events to widgets on the GUI thread.
+#
+# Record changes ("tasks", "stock", "users", "training") are merged per topic
+# until control returns to the Qt event loop, then emitted once as
+# changed(topic, Change). A dialog that writes three tasks therefore causes
+# one update in each panel.
+import threading
+from typing import Any, Callable, Dict
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem
+
+import store_events
+from store_events import Change, RECORD_TOPICS
+
+class StoreBridge(QObject):
+    changed = pyqtSignal(str, object)          # topic, Change
+    lowStock = pyqtSignal(str, bool, object)   # part_no, below, item
+    _poke = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Change] = {}
+        self._poke.connect(self._flush, Qt.QueuedConnection)
+        for topic in RECORD_TOPICS:
+            store_events.subscribe(topic, lambda change, t=topic: self._queue(t, change))
+        store_events.subscribe("low_stock", lambda *args: self.lowStock.emit(*args))
+
+    def _queue(self, topic: str, change: Change):
+        # may run on any thread; the flush is queued to the thread the bridge lives in
+        with self._lock:
+            first = not self._pending
+            mine = Change(change.added, change.updated, change.removed, change.reset)
+            if topic in self._pending:
+                self._pending[topic].merge(mine)
+            else:
+                self._pending[topic] = mine
+        if first:
+            self._poke.emit()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for topic, change in pending.items():
+            if change:
+                self.changed.emit(topic, change)
+
+_bridge = None
+
+def bridge() -> StoreBridge:
+    """The application-wide bridge; create it from the GUI thread."""
+    global _bridge
+    if _bridge is None:
+        _bridge = StoreBridge()
+    return _bridge
+
+def _insert_row(widget: QListWidget, key, role: int) -> int:
+    for i in range(widget.count()):
+        if widget.item(i).data(role) > key:
+            return i
+    return widget.count()
+
+def sync_list(widget: QListWidget, rows: Dict[Any, QListWidgetItem], records, render: Callable,
+              key: str = "id", role: int = Qt.UserRole):
+    """
+    Make the list show `records`, which must be in the list's order (e.g. by
+    id), touching only the rows that differ: missing rows are inserted, extra
+    rows taken out and the rest re-rendered in place, so the selection and
+    scroll position are kept.
+    """
+    wanted = {rec[key] for rec in records}
+    for k in [k for k in rows if k not in wanted]:
+        widget.takeItem(widget.row(rows.pop(k)))
+    for i, rec in enumerate(records):
+        item = rows.get(rec[key])
+        if item is None:
+            item = rows[rec[key]] = QListWidgetItem()
+            item.setData(role, rec[key])
+            widget.insertItem(i, item)
+        render(item, rec)  # setting an unchanged value does not repaint
+
+def patch_list(widget: QListWidget, rows: Dict[Any, QListWidgetItem], change: Change,
+               records: Dict[Any, Any], accepts: Callable, render: Callable, ordered: bool = True,
+               role: int = Qt.UserRole):
+    """
+    Apply `change` to a list whose items are keyed by record key (rows: key -> item,
+    key also stored in item data `role`). `records` holds the current record for
+    each added / updated key (a key missing from it was deleted since),
+    accepts(record) says whether it belongs in this list, render(item, record)
+    fills the item. New rows go in key order, or at the end if not `ordered`.
+    """
+    for key in change.removed:
+        item = rows.pop(key, None)
+        if item is not None:
+            widget.takeItem(widget.row(item))
+    for key in change.added | change.updated:
+        rec = records.get(key)
+        item = rows.get(key)
+        if rec is None or not accepts(rec):
+            if item is not None:
+                del rows[key]
+                widget.takeItem(widget.row(item))
+            continue
+        if item is None:
+            item = rows[key] = QListWidgetItem()
+            item.setData(role, key)
+            widget.insertItem(_insert_row(widget, key, role) if ordered else widget.count(), item)
+        render(item, rec)
+
+class ListPatcher:
+    """
+    patch_list() with the records read on a StoreRequests worker:
+
+        self._patcher = ListPatcher(self._io, self.list, self._rows, get_tasks, accepts, self._render)
+        self._patcher.apply(change)    # from the changed(topic, change) slot
+
+    fetch_many(keys) returns the records with those keys (e.g. data_store.get_tasks).
+    Changes that arrive while a read is out are merged into it and read again
+    together, so the list is patched once per burst with the latest records.
+    """
+    def __init__(self, io, widget: QListWidget, rows: Dict[Any, QListWidgetItem], fetch_many: Callable,
+                 accepts: Callable, render: Callable, key: str = "id", ordered: bool = True,
+                 channel: str = "patch"):
+        self._io = io
+        self._widget, self._rows = widget, rows
+        self._fetch_many, self._accepts, self._render = fetch_many, accepts, render
+        self._key, self._ordered, self._channel = key, ordered, channel
+        self._change = None  # what the read on `channel` is for
+
+    def apply(self, change: Change):
+        if self._change is not None and self._io.pending(self._channel):
+            self._change.merge(change)
+        else:
+            self._change = Change(change.added, change.updated, change.removed, change.reset)
+        merged = self._change
+        self._io.load(self._channel, self._fetch_many, sorted(merged.added | merged.updated),
+                      done=lambda records: self._patch(merged, records))
+
+    def cancel(self):
+        """Drop the read in flight, e.g. because the whole list is being reloaded."""
+        self._io.cancel(self._channel)
+        self._change = None
+
+    def _patch(self, change: Change, records):
+        self._change = None
+        patch_list(self._widget, self._rows, change, {rec[self._key]: rec for rec in records},
+                   self._accepts, self._render, self._ordered)
@@ -1,9 +1,19 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QFrame
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-from data_store import filter_tasks
+from data_store import count_tasks
 from inventory_store import low_stock
-from training_store import load_training
+from training_store import session_count
+from ui.async_store import StoreRequests
+from ui.store_bridge import bridge
+
+def _task_counts(base, tail):
+    pending_count = count_tasks(base_id=base, aircraft_tail=tail, status=("pending", "in_progress"))
+    completed_today = count_tasks(base_id=base, aircraft_tail=tail, status="completed")  # simple version
+    return pending_count, completed_today
+
+def _low_parts():
+    return {it["part_no"] for it in low_stock()}
 
 class SummaryCards(QWidget):
     def __init__(self, context: dict, username: str, role: str):
@@ -24,7 +34,19 @@ class SummaryCards(QWidget):
         for card in (self.pending, self.completed, self.lowstock, self.training):
             self.layout.addWidget(card)
 
+        self._low = set()  # part_nos below min_qty, kept current from bridge().lowStock
+        self._io = StoreRequests(self)
         self.refresh()
+        bridge().changed.connect(self._on_store_changed)
+        bridge().lowStock.connect(self._on_low_stock)
+
+    def _on_store_changed(self, topic, change):
+        # only the card whose data changed is recomputed
+        if topic == "tasks":
+            self._refresh_tasks()
+        elif topic == "training" and (change.reset or any(
+                not isinstance(k, tuple) for k in change.added | change.removed)):
+            self._refresh_training()  # sessions came or went; assignment changes leave the count alone
 
     def _make_card(self, title: str, value: str) -> QFrame:
         card = QFrame()
@@ -48,18 +70,33 @@ class SummaryCards(QWidget):
         return card
 
     def refresh(self):
-        base = self.context.get("base_id")
-        tail = self.context.get("tail")
+        self._refresh_tasks()
+        self._refresh_stock()
+        self._refresh_training()
 
-        tasks = filter_tasks(base_id=base, aircraft_tail=tail)
-        pending_count = sum(1 for t in tasks if t.get("status") in ("pending", "in_progress"))
-        completed_today = sum(1 for t in tasks if t.get("status") == "completed")  # simple version
+    def _refresh_tasks(self):
+        # a context switch replaces the request for the old base/aircraft
+        self._io.load("tasks", _task_counts, self.context.get("base_id"), self.context.get("tail"),
+                      done=self._show_task_counts)
 
+    def _show_task_counts(self, counts):
+        pending_count, completed_today = counts
         self.pending.value_label.setText(str(pending_count))
         self.completed.value_label.setText(str(completed_today))
 
-        lows = low_stock()
-        self.lowstock.value_label.setText(str(len(lows)))
+    def _refresh_stock(self):
+        self._io.load("stock", _low_parts, done=self._show_low)
+
+    def _show_low(self, parts):
+        self._low = parts
+        self.lowstock.value_label.setText(str(len(parts)))
+
+    def _on_low_stock(self, part_no, below, item):
+        # stock changes that cross no min_qty leave the card alone
+        if self._io.pending("stock"):
+            self._refresh_stock()  # the load in flight may have read the store before this
+            return
+        self._show_low(self._low | {part_no} if below else self._low - {part_no})
 
-        training = load_training()
-        self.training.value_label.setText(str(len(training.get("sessions", []))))
+    def _refresh_training(self):
+        self._io.load("training", session_count, done=lambda n: self.training.value_label.setText(str(n)))
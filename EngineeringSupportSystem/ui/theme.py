@@ -17,12 +17,12 @@ QPushButton {
 }
 QPushButton:hover { background: #2b7bff; }
 QPushButton:pressed { background: #165bd8; }
-QLineEdit, QTextEdit, QComboBox, QListWidget {
+QLineEdit, QTextEdit, QComboBox, QListWidget, QListView {
     background: #0f1720; color: #dce3ea; border: 1px solid #243040;
     border-radius: 10px; padding: 8px;
 }
-QListWidget::item { padding: 8px; }
-QListWidget::item:selected { background: #1b2636; border-radius: 8px; }
+QListWidget::item, QListView::item { padding: 8px; }
+QListWidget::item:selected, QListView::item:selected { background: #1b2636; border-radius: 8px; }
 QToolBar {
     background: #0f1621; spacing: 6px; padding: 6px;
     border-bottom: 1px solid #233044;
@@ -1,7 +1,10 @@
 # ui/training_panel.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QLineEdit, QPushButton, QMessageBox, QComboBox
-from training_store import load_training, add_session, assign_user, set_assignment_status
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QLineEdit, QPushButton, QMessageBox, QAbstractItemView
+from training_store import load_training, add_session, assign_users, set_assignment_statuses
 from data_store import list_usernames
+from ui.async_store import StoreRequests
+from ui.store_bridge import bridge, sync_list
+from ui.widgets.busy_indicator import BusyIndicator
 
 class TrainingPanel(QWidget):
     def __init__(self, current_user: str = "", role: str = ""):
@@ -12,6 +15,7 @@ class TrainingPanel(QWidget):
         # Sessions
         self.sessions = QListWidget()
         self.assignments = QListWidget()
+        self.assignments.setSelectionMode(QAbstractItemView.ExtendedSelection)
 
         # Create session controls (for trainingcoordinator/admin/manager)
         self.title = QLineEdit(); self.title.setPlaceholderText("Session Title")
@@ -19,23 +23,27 @@ class TrainingPanel(QWidget):
         create_btn = QPushButton("Create Session")
         create_btn.clicked.connect(self._create_session)
 
-        # Assign user to session
-        self.user_combo = QComboBox(); self.user_combo.addItems(list_usernames())
-        self.assign_btn = QPushButton("Assign User to Selected Session")
+        # Assign users to session (Ctrl/Shift-click to pick several)
+        self.users = QListWidget()
+        self.users.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.users.setMaximumHeight(120)
+        self.assign_btn = QPushButton("Assign Selected Users to Selected Session")
         self.assign_btn.clicked.connect(self._assign_user)
 
         # Mark complete
-        self.mark_complete = QPushButton("Mark Selected Assignment Completed")
+        self.mark_complete = QPushButton("Mark Selected Assignments Completed")
         self.mark_complete.clicked.connect(self._complete_assignment)
 
         top = QHBoxLayout()
         top.addWidget(self.title); top.addWidget(self.date); top.addWidget(create_btn)
 
         assign_bar = QHBoxLayout()
-        assign_bar.addWidget(self.user_combo); assign_bar.addWidget(self.assign_btn)
+        assign_bar.addWidget(self.users); assign_bar.addWidget(self.assign_btn)
 
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Training Sessions"))
+        self.busy = BusyIndicator()
+        layout.addWidget(self.busy)
         layout.addWidget(self.sessions)
         layout.addLayout(top)
         layout.addWidget(QLabel("Assignments"))
@@ -43,16 +51,55 @@ class TrainingPanel(QWidget):
         layout.addLayout(assign_bar)
         layout.addWidget(self.mark_complete)
 
+        self._session_rows = {}     # session id -> QListWidgetItem
+        self._assignment_rows = {}  # (user, session id) -> QListWidgetItem
+        self._stale = set()         # topics that changed while the panel was hidden
+        self._io = StoreRequests(self)
+        self._io.busyChanged.connect(self.busy.setBusy)
         self.refresh()
+        self._load_users()
+        bridge().changed.connect(self._on_store_changed)
+
+    def activate(self):
+        """Shown again (see PanelPool): reload only what changed while hidden."""
+        stale, self._stale = self._stale, set()
+        if "training" in stale:
+            self.refresh()
+        if "users" in stale:
+            self._load_users()
+
+    def _on_store_changed(self, topic, change):
+        if topic == "users" and not (change.added or change.removed or change.reset):
+            return
+        if topic not in ("training", "users"):
+            return
+        if not self.isVisible():
+            self._stale.add(topic)
+        elif topic == "training":
+            self.refresh()
+        else:
+            self._load_users()
+
+    def _load_users(self):
+        self._io.load("users", list_usernames, done=self._fill_users)
+
+    def _fill_users(self, names):
+        selected = {i.text() for i in self.users.selectedItems()}
+        self.users.clear()
+        self.users.addItems(names)
+        for i in range(self.users.count()):
+            self.users.item(i).setSelected(self.users.item(i).text() in selected)
 
     def refresh(self):
-        data = load_training()
-        self.sessions.clear()
-        for s in data["sessions"]:
-            self.sessions.addItem(f"{s['id']} | {s['title']} | {s['date']}")
-        self.assignments.clear()
-        for a in data["assignments"]:
-            self.assignments.addItem(f"{a['user']} | session={a['session_id']} | {a['status']}")
+        self._io.load("training", load_training, done=self._fill)
+
+    def _fill(self, data):
+        # keyed diffs, so selections survive a reload
+        sync_list(self.sessions, self._session_rows, data["sessions"],
+                  lambda item, s: item.setText(f"{s['id']} | {s['title']} | {s['date']}"))
+        assignments = [dict(a, key=(a["user"], a["session_id"])) for a in data["assignments"]]
+        sync_list(self.assignments, self._assignment_rows, assignments,
+                  lambda item, a: item.setText(f"{a['user']} | session={a['session_id']} | {a['status']}"), key="key")
 
     def _selected_session_id(self):
         item = self.sessions.currentItem()
@@ -63,33 +110,37 @@ class TrainingPanel(QWidget):
             return None
 
     def _create_session(self):
-        sid = add_session(self.title.text().strip(), self.date.text().strip())
-        QMessageBox.information(self, "Created", f"Session #{sid['id']} created.")
+        self._io.save(add_session, self.title.text().strip(), self.date.text().strip(), done=self._created)
         self.title.clear(); self.date.clear()
-        self.refresh()
+
+    def _created(self, session):
+        QMessageBox.information(self, "Created", f"Session #{session['id']} created.")
 
     def _assign_user(self):
         sid = self._selected_session_id()
         if not sid:
             QMessageBox.warning(self, "Select", "Select a session in the top list.")
             return
-        user = self.user_combo.currentText()
-        if assign_user(user, sid):
-            QMessageBox.information(self, "Assigned", f"{user} assigned to session #{sid}.")
-            self.refresh()
-        else:
-            QMessageBox.warning(self, "Error", "Session not found.")
+        users = [i.text() for i in self.users.selectedItems()]
+        if not users:
+            QMessageBox.warning(self, "Select", "Select one or more users.")
+            return
+        self._io.save(assign_users, users, sid, done=lambda added: QMessageBox.information(
+            self, "Assigned", f"{added} new assignment(s) to session #{sid}."))
 
     def _complete_assignment(self):
-        item = self.assignments.currentItem()
-        if not item:
-            QMessageBox.warning(self, "Select", "Select an assignment.")
+        items = self.assignments.selectedItems()
+        if not items:
+            QMessageBox.warning(self, "Select", "Select one or more assignments.")
             return
-        parts = [x.strip() for x in item.text().split("|")]
-        user = parts[0]
-        sid = int(parts[1].split("=")[1])
-        if set_assignment_status(user, sid, "completed"):
-            QMessageBox.information(self, "Updated", "Marked completed.")
-            self.refresh()
+        pairs = []
+        for item in items:
+            parts = [x.strip() for x in item.text().split("|")]
+            pairs.append((parts[0], int(parts[1].split("=")[1])))
+        self._io.save(set_assignment_statuses, pairs, "completed", done=lambda n: self._completed(len(pairs), n))
+
+    def _completed(self, requested: int, updated: int):
+        if updated:
+            QMessageBox.information(self, "Updated", f"Marked {requested} assignment(s) completed.")
         else:
             QMessageBox.warning(self, "Error", "Could not update.")
@@ -0,0 +1,101 @@
+# ui/wallpaper.py
+# Window wallpaper that follows the window size without stalling a resize drag.
+#
+#   self._bg = Wallpaper(self, ASSETS / "aircraft.jpg")
+#
+# While the window is being resized the image is scaled with the fast
+# transform; once no resize has arrived for SETTLE_MS it is rescaled once
+# with smooth filtering. Smooth results go into QPixmapCache per size bucket
+# (the size rounded up to BUCKET px, so nearby sizes share one entry), and
+# each image file is decoded once and shared by every window showing it.
+from pathlib import Path
+from typing import Dict, Optional
+
+from PyQt5.QtCore import QEvent, QObject, QSize, Qt, QTimer
+from PyQt5.QtGui import QBrush, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QWidget
+
+SETTLE_MS = 150
+BUCKET = 64
+CACHE_KB = 48 * 1024  # a 1920x1088 bucket is ~8 MB; the Qt default (10 MB) would hold one
+
+_sources: Dict[str, QPixmap] = {}
+
+def source_pixmap(path) -> Optional[QPixmap]:
+    """The decoded image at `path`, loaded on first use; None if missing or unreadable."""
+    key = str(path)
+    pix = _sources.get(key)
+    if pix is None:
+        if not Path(path).exists():
+            return None
+        pix = QPixmap(key)
+        if pix.isNull():
+            return None
+        _sources[key] = pix
+    return pix
+
+def _bucket(size: QSize) -> QSize:
+    return QSize(-(-size.width() // BUCKET) * BUCKET, -(-size.height() // BUCKET) * BUCKET)
+
+class Wallpaper(QObject):
+    """Fills `widget`'s background with the image at `path`, scaled to cover it."""
+    def __init__(self, widget: QWidget, path):
+        super().__init__(widget)
+        self._widget = widget
+        self._path = str(path)
+        self._source = source_pixmap(path)
+        self._shown = None  # cache key of the smooth pixmap in the palette, if that is what is shown
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SETTLE_MS)
+        self._timer.timeout.connect(self._smooth)
+        if self._source is None:
+            return
+        if QPixmapCache.cacheLimit() < CACHE_KB:
+            QPixmapCache.setCacheLimit(CACHE_KB)
+        widget.setAutoFillBackground(True)
+        widget.installEventFilter(self)
+        self._smooth()
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self._widget and event.type() == QEvent.Resize:
+            self._resized()
+        return False
+
+    def _key(self, size: QSize) -> str:
+        return f"wallpaper:{self._path}:{size.width()}x{size.height()}"
+
+    def _resized(self):
+        size = _bucket(self._widget.size())
+        if size.isEmpty():
+            return
+        key = self._key(size)
+        if key == self._shown:
+            return
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            self._timer.stop()
+            self._show(cached, key)
+            return
+        # mid-drag: cheap scale now, the smooth one once the size settles
+        self._show(self._source.scaled(self._widget.size(), Qt.KeepAspectRatioByExpanding, Qt.FastTransformation))
+        self._timer.start()
+
+    def _smooth(self):
+        size = _bucket(self._widget.size())
+        if size.isEmpty():
+            return
+        key = self._key(size)
+        pix = QPixmapCache.find(key)
+        if pix is None:
+            pix = self._source.scaled(size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, pix)
+        self._show(pix, key)
+
+    def _show(self, pix: QPixmap, key: str = None):
+        if key is not None and key == self._shown:
+            return
+        self._shown = key
+        pal = self._widget.palette()
+        pal.setBrush(self._widget.backgroundRole(), QBrush(pix))
+        self._widget.setPalette(pal)
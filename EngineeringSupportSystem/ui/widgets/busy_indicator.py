@@ -0,0 +1,30 @@
+# ui/widgets/busy_indicator.py
+from PyQt5.QtWidgets import QProgressBar
+from PyQt5.QtCore import QTimer
+
+class BusyIndicator(QProgressBar):
+    """
+    Thin indeterminate bar for a panel that is waiting on the store. It only
+    appears if the wait lasts longer than `delay_ms`, so fast requests do not flicker.
+    """
+    def __init__(self, delay_ms: int = 150, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 0)
+        self.setTextVisible(False)
+        self.setFixedHeight(4)
+        self.setStyleSheet("""
+            QProgressBar { background: transparent; border: none; }
+            QProgressBar::chunk { background: #2aa3ff; }
+        """)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.show)
+        self.hide()
+
+    def setBusy(self, busy: bool):
+        if busy:
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.hide()
@@ -0,0 +1,68 @@
+# ui/widgets/panel_pool.py
+# Dashboard body that keeps its panels instead of rebuilding them per click.
+#
+#   self.body = PanelPool(keep=config.PANEL_POOL_SIZE)
+#   self.body.add_pinned(self.panel)                       # always kept
+#   self.body.show_panel(InventoryPanel, lambda: InventoryPanel(current_user=u))
+#
+# There is one instance per panel type (the key). Showing a kept panel again
+# calls its activate() if it has one, so it can catch up on changes made
+# while it was hidden instead of reloading. Besides the pinned panels and the
+# current one, at most `keep` idle panels are kept; the least recently shown
+# are deleted beyond that.
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+from PyQt5.QtWidgets import QStackedWidget, QWidget
+
+class PanelPool(QStackedWidget):
+    def __init__(self, keep: int = 2, parent=None):
+        super().__init__(parent)
+        self.keep = keep
+        self._panels: "OrderedDict[Any, QWidget]" = OrderedDict()  # key -> panel, least recently shown first
+        self._pinned = set()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def add_pinned(self, widget: QWidget, key: Any = None) -> QWidget:
+        """Add a panel that is never evicted; its key defaults to its type."""
+        key = type(widget) if key is None else key
+        self._pinned.add(key)
+        self._panels[key] = widget
+        self.addWidget(widget)
+        return widget
+
+    def panel(self, key: Any):
+        return self._panels.get(key)
+
+    def show_panel(self, key: Any, factory: Callable[[], QWidget] = None) -> QWidget:
+        """Show the panel for `key`, creating it with factory() the first time."""
+        widget = self._panels.get(key)
+        if widget is None:
+            widget = factory()
+            self._panels[key] = widget
+            self.addWidget(widget)
+            self.created += 1
+        else:
+            self.reused += 1
+        self._panels.move_to_end(key)
+        self.setCurrentWidget(widget)
+        activate = getattr(widget, "activate", None)
+        if activate is not None:
+            activate()
+        self._evict()
+        return widget
+
+    def _evict(self):
+        current = self.currentWidget()
+        idle = [k for k, w in self._panels.items() if k not in self._pinned and w is not current]
+        for key in idle[:max(0, len(idle) - self.keep)]:
+            widget = self._panels.pop(key)
+            self.removeWidget(widget)
+            widget.deleteLater()
+            self.evicted += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"kept": len(self._panels), "created": self.created, "reused": self.reused,
+                "evicted": self.evicted}
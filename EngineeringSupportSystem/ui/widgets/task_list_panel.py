@@ -1,38 +1,78 @@
 # ui/widgets/task_list_panel.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton, QMessageBox, QHBoxLayout, QListWidgetItem
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QIcon
-from PyQt5.QtCore import QSize
-from data_store import load_tasks, save_tasks, filter_tasks
-
-STATUS_COLORS = {
-    "pending":      "#9aa4b2",
-    "in_progress":  "#2aa3ff",
-    "completed":    "#17c964",
-    "in_review":    "#f5a524",
-    "approved":     "#22c55e",
-    "rejected":     "#ef4444",
-}
-
-def _dot(color_hex: str, size: int = 14) -> QIcon:
-    """Return a small colored dot icon."""
-    pm = QPixmap(size, size)
-    pm.fill(QColor(0, 0, 0, 0))
-    p = QPainter(pm)
-    p.setRenderHint(QPainter.Antialiasing, True)
-    c = QColor(color_hex)
-    p.setBrush(c)
-    p.setPen(c.darker(130))
-    p.drawEllipse(1, 1, size - 2, size - 2)
-    p.end()
-    return QIcon(pm)
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QListView, QPushButton, QMessageBox, QHBoxLayout
+from data_store import get_task, get_tasks, update_task, page_tasks
+from task_search import matcher
+from ui.async_store import StoreRequests
+from ui.store_bridge import bridge
+from ui.widgets.busy_indicator import BusyIndicator
+from ui.widgets.task_model import TaskListModel, StatusDotDelegate, ASSIGNEE_ROLE
+
+PAGE_SIZE = 200
+SEARCH_DELAY_MS = 200  # typing pause before the list follows the search box
+
+def _is_repair(t) -> bool:
+    return "repair" in t.get("title", "").lower()
+
+def _is_unassigned(t) -> bool:
+    return t.get("assigned_to") is None
+
+def _view_query(mode, current_user, role, base_id, tail):
+    """(header, page_tasks() criteria) for a task list view."""
+    if mode == "view_all_tasks" and role == "admin":
+        query = dict(base_id=base_id, aircraft_tail=tail)
+        header = f"All Work Orders @ {base_id} / {tail}"
+    elif mode == "repair_requests":
+        query = dict(base_id=base_id, aircraft_tail=tail, predicate=_is_repair)
+        header = f"Repair Requests @ {base_id} / {tail}"
+    else:
+        if current_user:
+            query = dict(base_id=base_id, aircraft_tail=tail, assigned_to=current_user)
+        else:
+            query = dict(base_id=base_id, aircraft_tail=tail, predicate=_is_unassigned)
+        header = f"My Work Orders ({current_user}) @ {base_id} / {tail}"
+    return header, query
+
+def _search_query(text: str) -> str:
+    """Search box text -> page_tasks(search=...); the word being typed matches as a prefix."""
+    words = text.split()
+    if words and text == text.rstrip() and not text.endswith("*") and words[-1] not in ("OR", "|", "AND"):
+        return text.strip() + "*"  # a trailing space ends the word
+    return text.strip()
+
+def _complete_task(task_id, current_user, base_id, tail):
+    """Mark a task completed; returns (title, message) of the warning to show, or None. Worker thread."""
+    t = get_task(task_id)
+    if t is None:
+        return "Not Found", "Task not found."
+    if t.get("base_id") != base_id or t.get("aircraft_tail") != tail:
+        return "Context", "Task is not in the selected base/aircraft."
+    if current_user and t.get("assigned_to") not in (current_user, None):
+        return "Not Allowed", "You cannot complete someone else’s task."
+    update_task(task_id, {"status": "completed"})  # the row updates through the change event
+    return None
 
 class TaskListPanel(QWidget):
     def __init__(self):
         super().__init__()
-        self.list = QListWidget()
-        self.list.setIconSize(QSize(14, 14))
+        # only the rows in view are fetched and painted, and the list itself
+        # arrives a page at a time as the user scrolls
+        self.model = TaskListModel(self._fetch_rows, more=self._load_more, parent=self)
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
+        self.list.setItemDelegate(StatusDotDelegate(self.list))
 
         self.info = QLabel("Select an action to load tasks.")
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search title / details:  pump leak,  hyd*,  valve OR seal")
+        self.search.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._search_changed)
+        self.search.textChanged.connect(self._search_timer.start)
+        self.busy = BusyIndicator()
         self.btn_refresh = QPushButton("Refresh")
         self.btn_mark = QPushButton("Mark Completed")
         self.btn_assign = QPushButton("Assign/Reassign")
@@ -48,6 +88,8 @@ class TaskListPanel(QWidget):
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.info)
+        layout.addWidget(self.search)
+        layout.addWidget(self.busy)
         layout.addWidget(self.list)
         layout.addLayout(bar)
 
@@ -60,7 +102,17 @@ class TaskListPanel(QWidget):
         # this is filled by Dashboard, to open Assign dialog
         self._assign_dialog_opener = None
 
+        self._shown = False  # show_tasks() has been called at least once
+        self._query = None   # page_tasks() criteria of the current view
+        self._match = None   # predicate for the current view's search, if any
+        self._io = StoreRequests(self)
+        self._io.busyChanged.connect(self.busy.setBusy)
+        self._rows = StoreRequests(self)  # row fetches while scrolling: short, and not worth the busy bar
+        bridge().changed.connect(self._on_store_changed)
+
     def set_context(self, ctx: dict):
+        if ctx != self._context:
+            self._io.cancel("list")  # rows for the old base/aircraft are no longer wanted
         self._context = ctx
 
     def set_permissions(self, perms: dict):
@@ -74,13 +126,12 @@ class TaskListPanel(QWidget):
         self._assign_dialog_opener = opener_callable
 
     def _assign_hook(self):
-        item = self.list.currentItem()
-        if not item:
+        index = self.list.currentIndex()
+        if not index.isValid():
             QMessageBox.warning(self, "Select", "Select a task.")
             return
-        # We stored the task id in Qt.UserRole
-        task_id = item.data(32)  # Qt.UserRole
-        assignee = item.data(33) # Qt.UserRole + 1
+        task_id = self.model.task_id(index.row())
+        assignee = index.data(ASSIGNEE_ROLE)
         if self._assign_dialog_opener:
             self._assign_dialog_opener(task_id, assignee)
 
@@ -88,39 +139,58 @@ class TaskListPanel(QWidget):
         self._last_mode, self._last_user, self._last_role = mode, current_user, role
         if context:
             self._context = context
-        base_id = self._context.get("base_id")
-        tail = self._context.get("tail")
-
-        all_tasks = filter_tasks(base_id=base_id, aircraft_tail=tail)
-        self.list.clear()
-
-        if mode == "view_all_tasks" and role == "admin":
-            shown = all_tasks
-            header = f"All Work Orders @ {base_id} / {tail}"
-        elif mode == "repair_requests":
-            shown = [t for t in all_tasks if "repair" in t.get("title", "").lower()]
-            header = f"Repair Requests @ {base_id} / {tail}"
-        else:
-            shown = [t for t in all_tasks if t.get("assigned_to") == current_user]
-            header = f"My Work Orders ({current_user}) @ {base_id} / {tail}"
-
+        self._shown = True
+        header, query = _view_query(mode, current_user, role, self._context.get("base_id"), self._context.get("tail"))
+        search = _search_query(self.search.text())
+        if search:
+            query["search"] = search
+            header += f"  —  “{self.search.text().strip()}”"
+        self._match = matcher(search) if search else None
+        # a refresh of the same view reloads as many rows as are loaded now, so nothing jumps
+        limit = max(PAGE_SIZE, self.model.rowCount()) if query == self._query else PAGE_SIZE
+        self._query = query
+        self._io.cancel("more")
+        self.model.fetch_cancelled()
+        self._io.load("list", page_tasks, **query, limit=limit, done=lambda page: self._fill(header, page))
+
+    def _search_changed(self):
+        if self._shown:
+            self.show_tasks(self._last_mode, self._last_user, self._last_role, self._context)
+
+    def _fill(self, header, page):
         self.info.setText(header)
-
-        for t in shown:
-            tid   = t.get("id")
-            title = t.get("title", "Untitled")
-            status = t.get("status", "pending")
-            assigned = t.get("assigned_to") or "Unassigned"
-            line = f"#{tid}  •  {title}  •  {assigned}"
-
-            item = QListWidgetItem(line)
-            # colored dot as a "chip"
-            item.setIcon(_dot(STATUS_COLORS.get(status, "#9aa4b2")))
-            # store metadata for later
-            item.setData(32, tid)         # task id
-            item.setData(33, assigned if assigned != "Unassigned" else None)
-            item.setToolTip(f"Status: {status.replace('_', ' ').title()}")
-            self.list.addItem(item)
+        self.model.set_page(*page)
+
+    def _fetch_rows(self, ids, done):
+        self._rows.load("rows", get_tasks, ids, done=done, failed=lambda exc: done(None))
+
+    def _load_more(self, cursor):
+        self._io.load("more", page_tasks, **self._query, after=cursor, limit=PAGE_SIZE,
+                      done=lambda page: self.model.append_page(*page))
+
+    def _accepts(self, t: dict) -> bool:
+        """Whether the current view's query matches `t`."""
+        query = dict(self._query or {})
+        predicate = query.pop("predicate", None)
+        query.pop("search", None)
+        return (all(not v or t.get(f) == v for f, v in query.items())
+                and (predicate is None or predicate(t))
+                and (self._match is None or self._match(t)))
+
+    def _on_store_changed(self, topic, change):
+        if topic != "tasks" or not self._shown:
+            return
+        if change.reset or self._io.pending("list"):
+            # a load in flight may have read the store before this change
+            self.show_tasks(self._last_mode, self._last_user, self._last_role, self._context)
+            return
+        more = self._io.pending("more")
+        if more:  # same for a next page: ask again after patching
+            self._io.cancel("more")
+            self.model.fetch_cancelled()
+        self.model.apply_change(change, self._accepts)
+        if more:
+            self.model.fetchMore()
 
     def mark_selected_complete(self, current_user=None):
         if not self._perms.get("can_mark_complete", True):
@@ -130,31 +200,18 @@ class TaskListPanel(QWidget):
         if current_user is None:
             current_user = self._last_user
 
-        row = self.list.currentRow()
-        if row < 0:
+        index = self.list.currentIndex()
+        if not index.isValid():
             QMessageBox.warning(self, "No Selection", "Select a task first.")
             return
-
-        item = self.list.item(row)
-        task_id = item.data(32)
+        task_id = self.model.task_id(index.row())
 
         # Only allow completion if the task is in current context
-        base_id = self._context.get("base_id")
-        tail = self._context.get("tail")
-
-        tasks = load_tasks()
-        for t in tasks:
-            if t.get("id") == task_id:
-                if t.get("base_id") != base_id or t.get("aircraft_tail") != tail:
-                    QMessageBox.warning(self, "Context", "Task is not in the selected base/aircraft.")
-                    return
-                if current_user and t.get("assigned_to") not in (current_user, None):
-                    QMessageBox.warning(self, "Not Allowed", "You cannot complete someone else’s task.")
-                    return
-                t["status"] = "completed"
-                save_tasks(tasks)
-                self.show_tasks(self._last_mode, self._last_user, self._last_role, self._context)
-                QMessageBox.information(self, "Done", f"Work Order #{task_id} marked completed.")
-                return
-
-        QMessageBox.warning(self, "Not Found", "Task not found.")
+        self._io.save(_complete_task, task_id, current_user, self._context.get("base_id"), self._context.get("tail"),
+                      done=lambda warning: self._completed(task_id, warning))
+
+    def _completed(self, task_id, warning):
+        if warning:
+            QMessageBox.warning(self, *warning)
+            return
+        QMessageBox.information(self, "Done", f"Work Order #{task_id} marked completed.")
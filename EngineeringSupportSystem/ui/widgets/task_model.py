@@ -0,0 +1,303 @@
+# ui/widgets/task_model.py
+# Task list model for QListView. The model holds only the ids of the tasks in
+# the list; rows are fetched from the store in pages when the view paints them
+# and kept in a small LRU cache, so a list of 100k work orders costs 100k ints.
+# Fetches run off the GUI thread (one at a time): a row not fetched yet paints
+# as a placeholder until its page arrives.
+#
+# The list itself can be loaded page by page too: set_page() shows the first
+# page of a cursor query (data_store.page_tasks) and the view's fetchMore()
+# asks for the next one through `more(cursor)` as the user scrolls down.
+import bisect
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRectF, QSize, Qt
+from PyQt5.QtGui import QColor, QPainter, QPalette
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+STATUS_COLORS = {
+    "pending":      "#9aa4b2",
+    "in_progress":  "#2aa3ff",
+    "completed":    "#17c964",
+    "in_review":    "#f5a524",
+    "approved":     "#22c55e",
+    "rejected":     "#ef4444",
+}
+
+TASK_ID_ROLE = Qt.UserRole
+ASSIGNEE_ROLE = Qt.UserRole + 1
+STATUS_ROLE = Qt.UserRole + 2
+
+class TaskListModel(QAbstractListModel):
+    PAGE = 64          # rows fetched per store call
+    CACHE_ROWS = 1024  # rows kept materialized
+
+    def __init__(self, fetch: Callable[[List[int], Callable], None], more: Callable[[int], None] = None,
+                 parent=None):
+        """
+        fetch(ids, done) starts loading the tasks with those ids (data_store.get_tasks on a
+        worker) and calls done(tasks) on the GUI thread - or done(None) if the load failed.
+        more(cursor) starts loading the page after `cursor` and hands it to append_page().
+        """
+        super().__init__(parent)
+        self._fetch = fetch
+        self._more = more
+        self._ids: List[int] = []  # ascending
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._cursor: Optional[int] = None  # resume token of the cursor query; None = all loaded
+        self._fetching = False
+        self._wanted: Dict[int, None] = {}  # ids for the next row fetch, in request order
+        self._inflight: Set[int] = set()    # ids of the row fetch out now
+        self._changed: Set[int] = set()     # ids touched by store changes, waiting for their fresh rows
+        self._accepts: Callable[[Dict[str, Any]], bool] = lambda t: True
+        self._gen = 0                       # bumped by set_ids(); answers to older fetches are dropped
+
+    # ---- paging
+    def set_page(self, tasks: List[Dict[str, Any]], cursor: Optional[int]):
+        """Show the first page of a cursor query (rows that stay are kept, as in set_ids)."""
+        self.set_ids([t["id"] for t in tasks])
+        self._cursor = cursor
+        for t in tasks:
+            self._remember(t)
+
+    def append_page(self, tasks: List[Dict[str, Any]], cursor: Optional[int]):
+        self._cursor, self._fetching = cursor, False
+        last = self._ids[-1] if self._ids else None
+        tasks = [t for t in tasks if last is None or t["id"] > last]
+        if not tasks:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._ids), len(self._ids) + len(tasks) - 1)
+        self._ids.extend(t["id"] for t in tasks)
+        self.endInsertRows()
+        for t in tasks:
+            self._remember(t)
+
+    def fetch_cancelled(self):
+        """The page requested by fetchMore() will not arrive; allow asking again."""
+        self._fetching = False
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return (not parent.isValid() and self._more is not None
+                and self._cursor is not None and not self._fetching)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self._more(self._cursor)
+
+    # ---- contents
+    def set_ids(self, ids: List[int]):
+        """
+        Show `ids` (ascending). Only the rows that differ are removed or
+        inserted, so selection and scroll position survive a refresh; rows
+        that stay are re-fetched when next painted. A mostly different list
+        is swapped in with a model reset.
+        """
+        ids = list(ids)
+        self._cursor, self._fetching = None, False
+        self._gen += 1
+        self._wanted.clear()
+        self._inflight.clear()
+        self._changed.clear()
+        new, old = set(ids), set(self._ids)
+        if not self._ids or len(new ^ old) > max(len(ids), len(self._ids)) // 2:
+            self.beginResetModel()
+            self._ids = ids
+            self._cache.clear()
+            self.endResetModel()
+            return
+        # removals, bottom-up in runs
+        row = len(self._ids) - 1
+        while row >= 0:
+            if self._ids[row] in new:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._ids[row] not in new:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self._ids[row + 1:end + 1]
+            self.endRemoveRows()
+        # what is left is in order within `ids`: insert the runs of new ids
+        row = 0
+        while row < len(ids):
+            if row < len(self._ids) and self._ids[row] == ids[row]:
+                row += 1
+                continue
+            end = row
+            while end < len(ids) and ids[end] not in old:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._ids[row:row] = ids[row:end]
+            self.endInsertRows()
+            row = end
+        self._cache.clear()
+        if self._ids:
+            self.dataChanged.emit(self.index(0), self.index(len(self._ids) - 1))
+
+    def task_id(self, row: int) -> Optional[int]:
+        return self._ids[row] if 0 <= row < len(self._ids) else None
+
+    def row_of(self, task_id: int) -> int:
+        i = bisect.bisect_left(self._ids, task_id)
+        return i if i < len(self._ids) and self._ids[i] == task_id else -1
+
+    def apply_change(self, change, accepts: Callable[[Dict[str, Any]], bool]):
+        """
+        Patch the rows for a store_events.Change; accepts(task) says whether a
+        task belongs in this list. Removed rows go at once; added and updated
+        tasks are fetched, and keep their old row until the fresh one arrives.
+        """
+        self._accepts = accepts
+        for tid in change.removed:
+            self._changed.discard(tid)
+            self._wanted.pop(tid, None)
+            self._remove(tid)
+        touched = change.added | change.updated
+        self._changed |= touched
+        self._request(sorted(touched))
+
+    def _patch(self, tid: int, t: Optional[Dict[str, Any]]):
+        """Bring row `tid` in line with its fresh task `t` (None: deleted)."""
+        self._cache.pop(tid, None)
+        if t is None or not self._accepts(t):
+            self._remove(tid)
+            return
+        row = self.row_of(tid)
+        if row < 0 and self._cursor is not None and tid > self._cursor:
+            return  # beyond the pages loaded so far: a later page brings it
+        self._remember(t)
+        if row >= 0:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+            return
+        row = bisect.bisect_left(self._ids, tid)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.insert(row, tid)
+        self.endInsertRows()
+
+    def _remove(self, tid: int):
+        self._cache.pop(tid, None)
+        row = self.row_of(tid)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._ids[row]
+            self.endRemoveRows()
+
+    # ---- row fetches
+    def _request(self, ids):
+        """Queue `ids` for fetching; starts a fetch unless one is out (its answer starts the next)."""
+        for tid in ids:
+            self._wanted[tid] = None
+        if self._inflight:
+            return
+        # rows scrolled past and dropped from the list meanwhile are not worth a read
+        ids = [tid for tid in self._wanted if tid in self._changed or self.row_of(tid) >= 0]
+        self._wanted.clear()
+        if not ids:
+            return
+        self._inflight = set(ids)
+        gen = self._gen
+        self._fetch(ids, lambda tasks: self._arrived(gen, ids, tasks))
+
+    def _arrived(self, gen: int, ids: List[int], tasks: Optional[List[Dict[str, Any]]]):
+        if gen != self._gen:
+            return  # the list was replaced since
+        self._inflight = set()
+        if tasks is None:
+            self._changed.difference_update(ids)
+            return
+        found = {t["id"]: t for t in tasks}
+        rows = []
+        for tid in ids:
+            if tid in self._wanted:
+                continue  # changed again while this fetch was out: the next one brings it
+            t = found.get(tid)
+            if tid in self._changed:
+                self._changed.discard(tid)
+                self._patch(tid, t)
+            elif t is not None:
+                self._remember(t)
+                row = self.row_of(tid)
+                if row >= 0:
+                    rows.append(row)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+        self._request(())
+
+    # ---- row cache
+    def _remember(self, t: Dict[str, Any]):
+        self._cache[t["id"]] = t
+        self._cache.move_to_end(t["id"])
+        while len(self._cache) > self.CACHE_ROWS:
+            self._cache.popitem(last=False)
+
+    def task(self, row: int) -> Optional[Dict[str, Any]]:
+        tid = self.task_id(row)
+        if tid is None:
+            return None
+        t = self._cache.get(tid)
+        if t is None:
+            if tid not in self._inflight and tid not in self._wanted:
+                # fetch the page around the row: the view asks for its neighbours next
+                start = max(0, row - self.PAGE // 4)
+                self._request(i for i in self._ids[start:start + self.PAGE]
+                              if i not in self._cache and i not in self._inflight)
+            return None
+        self._cache.move_to_end(tid)
+        return t
+
+    # ---- QAbstractListModel
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == TASK_ID_ROLE:
+            return self.task_id(index.row())
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole, ASSIGNEE_ROLE, STATUS_ROLE):
+            return None
+        t = self.task(index.row())
+        if t is None:
+            # not fetched yet: painted again when its page arrives
+            return f"#{self.task_id(index.row())}  •  …" if role == Qt.DisplayRole else None
+        status = t.get("status", "pending")
+        if role == Qt.DisplayRole:
+            return f"#{t.get('id')}  •  {t.get('title', 'Untitled')}  •  {t.get('assigned_to') or 'Unassigned'}"
+        if role == Qt.ToolTipRole:
+            return f"Status: {status.replace('_', ' ').title()}"
+        if role == ASSIGNEE_ROLE:
+            return t.get("assigned_to")
+        return status
+
+class StatusDotDelegate(QStyledItemDelegate):
+    """Paints a row as a coloured status dot followed by the text; all rows are the same height."""
+    DOT = 12
+    PAD = 8
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), option.fontMetrics.height() + 2 * self.PAD)
+
+    def paint(self, painter: QPainter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text, opt.text = opt.text, ""
+        style = opt.widget.style() if opt.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)  # background / selection
+
+        r = opt.rect
+        color = QColor(STATUS_COLORS.get(index.data(STATUS_ROLE), "#9aa4b2"))
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(color)
+        painter.setPen(color.darker(130))
+        painter.drawEllipse(QRectF(r.left() + self.PAD, r.center().y() - self.DOT / 2 + 1, self.DOT, self.DOT))
+
+        text_rect = r.adjusted(2 * self.PAD + self.DOT, 0, -self.PAD, 0)
+        selected = opt.state & QStyle.State_Selected
+        painter.setPen(opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         opt.fontMetrics.elidedText(text or "", Qt.ElideRight, text_rect.width()))
+        painter.restore()